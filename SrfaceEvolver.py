@@ -1,7 +1,15 @@
 import numpy as np
-from scipy.spatial import Delaunay
+from netz import Mesh
 from rand import Rand
-from scipy.interpolate import CubicSpline
+
+
+def _polynomial_expression(coefficients, parameter='p1'):
+    """Polynom in t = 2 p1 - 1 als Evolver-Ausdruck im Horner-Schema (Potenzkoeffizienten, niedrigste zuerst)."""
+    t = f"(2*{parameter} - 1)"
+    expression = repr(float(coefficients[-1]))
+    for c in coefficients[-2::-1]:
+        expression = f"{float(c)!r} + {t}*({expression})"
+    return expression
 
 
 class SurfaceEvolverInput:
@@ -30,6 +38,8 @@ class SurfaceEvolverInput:
         self.Z_init = self.initial_surface(self.R, self.Phi)
 
     def initial_surface(self, radii_grid, angle_grid):
+        from scipy.interpolate import CubicSpline
+
         x_coords = radii_grid * np.cos(angle_grid) + self.rand.center_x
         y_coords = radii_grid * np.sin(angle_grid) + self.rand.center_y
         z_values_init = np.full_like(radii_grid, np.nan)
@@ -61,7 +71,15 @@ class SurfaceEvolverInput:
 
         return z_values_init
 
-    def generate_surface_evolver_input(self):
+    def build_mesh(self):
+        """
+        Erzeugt das Dreiecksnetz der Startfläche als Arrays.
+
+        Rückgabe: vertices (N, 3), faces (M, 3) mit 0-basierten Indizes und
+        eine boolesche Maske der Randknoten, die fest bleiben.
+        """
+        from scipy.spatial import Delaunay
+
         if self.Z_init is None:
             self.calculate_initial_surface()
 
@@ -69,90 +87,155 @@ class SurfaceEvolverInput:
         Y = self.R * np.sin(self.Phi) + self.rand.center_y
         Z = self.Z_init
 
+        vertices = np.column_stack((X.ravel(), Y.ravel(), Z.ravel()))
+        triangulation = Delaunay(vertices[:, :2])  # Delaunay-Triangulation in der XY-Ebene
+
+        # Ein Vertex ist fest, wenn er auf dem maximalen Radius für seinen Winkel liegt
+        r_current = np.sqrt((vertices[:, 0] - self.rand.center_x)**2 + (vertices[:, 1] - self.rand.center_y)**2)
+        phi_current = np.arctan2(vertices[:, 1] - self.rand.center_y, vertices[:, 0] - self.rand.center_x)
+        fixed = np.isclose(r_current, self.rand.getRadius(phi_current))
+
+        return vertices, triangulation.simplices, fixed
+
+    def boundary_segments(self, degree=6, corner_angle=np.radians(30), max_span=np.pi / 2):
+        """
+        Zerlegt den Rand in glatte Abschnitte und passt jeden als Polynomkurve an.
+
+        Abschnitte enden an Ecken des Randes (Richtungsänderung über corner_angle)
+        und überspannen höchstens den Winkel max_span um das Zentrum. Parameter ist
+        die normierte Bogenlänge 0..1 innerhalb des Abschnitts, x, y und z sind
+        Polynome vom Grad degree darin (Tschebyschow-Ausgleich, gebauchte Kanten
+        aus tetraeder.py sind Parabeln und werden exakt getroffen).
+        Rückgabe: Liste von Dictionaries mit den Randpunktindizes 'indices' (beide
+        Enden eingeschlossen), den Parametern 'parameter', den Potenzkoeffizienten
+        'coefficients' (3, degree + 1) in t = 2 p - 1 und der größten Abweichung
+        'error' an den Randpunkten.
+        """
+        from kurven import turning_angles
+
+        phi = self.rand.phi_points_sorted
+        points = np.column_stack(self.rand.getPoint(phi))
+        num_points = len(phi)
+        gaps = np.diff(np.concatenate((phi, phi[:1] + 2 * np.pi)))
+
+        breaks = np.flatnonzero(turning_angles(points) > corner_angle)
+        if len(breaks) == 0:
+            breaks = np.array([0])
+        segments = []
+        for start, stop in zip(breaks, np.roll(breaks, -1)):
+            length = (stop - start) % num_points or num_points
+            # Zu weite Abschnitte gleichmäßig nach Winkel unterteilen
+            span = np.cumsum(gaps[(start + np.arange(length)) % num_points])
+            pieces = max(int(np.ceil(span[-1] / max_span)), 1)
+            cuts = np.searchsorted(span, span[-1] * np.arange(1, pieces) / pieces) + 1
+            for first, last in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [length]))):
+                indices = (start + np.arange(first, last + 1)) % num_points
+                arc = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points[indices], axis=0), axis=1))))
+                parameter = arc / arc[-1]
+                fit = [np.polynomial.Chebyshev.fit(parameter, points[indices, k], min(degree, len(indices) - 1),
+                                                   domain=(0.0, 1.0)) for k in range(3)]
+                error = max(np.max(np.abs(f(parameter) - points[indices, k])) for k, f in enumerate(fit))
+                coefficients = np.zeros((3, degree + 1))
+                for k, f in enumerate(fit):
+                    power = f.convert(kind=np.polynomial.Polynomial, domain=(0.0, 1.0)).coef
+                    coefficients[k, :len(power)] = power
+                segments.append({'indices': indices, 'parameter': parameter,
+                                 'coefficients': coefficients, 'error': error})
+        return segments
+
+    def boundary_definition(self, segments):
+        """Parametrische Randkurven 'boundary k' der Abschnitte aus boundary_segments als Evolver-Text."""
+        lines = []
+        for number, segment in enumerate(segments, start=1):
+            lines.append(f"boundary {number} parameters 1\n")
+            for k, coefficients in enumerate(segment['coefficients'], start=1):
+                lines.append(f"x{k}: {_polynomial_expression(coefficients)}\n")
+            lines.append("\n")
+        return ''.join(lines)
+
+    def generate_surface_evolver_input(self, boundary='fixed', degree=6, corner_angle=np.radians(30)):
+        """
+        Erzeugt den Text der .fe-Datei für das Startnetz.
+
+        boundary='fixed' hält die Randvertices fest. Mit boundary='parametric' liegen
+        die äußeren Randvertices über ihren Parameter auf den Randkurven aus
+        boundary_segments und können beim Verfeinern entlang des Randes gleiten.
+        Die Endpunkte der Abschnitte (Ecken) und die an sie anschließenden Kanten
+        bleiben fest, damit jede gleitende Kante zu genau einer Randkurve gehört.
+        """
+        if boundary not in ('fixed', 'parametric'):
+            raise ValueError("Unsupported boundary mode. Choose 'fixed' or 'parametric'.")
+        vertices, simplices, fixed = self.build_mesh()
+        mesh = Mesh(vertices, simplices)
+
         evolver_input = []
+        # Randkurve und Parameter je Vertex; 0 heißt: keine Randkurve
+        vertex_boundary = np.zeros(len(vertices), dtype=int)
+        vertex_parameter = np.zeros(len(vertices))
+        # Randkurve je Kante zwischen benachbarten Randpunkten, Schlüssel min * N + max
+        curve_edges = {}
+        if boundary == 'parametric':
+            segments = self.boundary_segments(degree, corner_angle)
+            evolver_input.append(self.boundary_definition(segments))
+            # Der äußere Radius ist die letzte Spalte des (Winkel x Radius)-Gitters
+            outer = np.arange(self.num_angles) * self.num_radii + self.num_radii - 1
+            for number, segment in enumerate(segments, start=1):
+                inner = outer[segment['indices'][1:-1]]
+                vertex_boundary[inner] = number
+                vertex_parameter[inner] = segment['parameter'][1:-1]
+                ends = outer[segment['indices']]
+                for key in np.minimum(ends[:-1], ends[1:]) * len(vertices) + np.maximum(ends[:-1], ends[1:]):
+                    curve_edges[int(key)] = number
+            fixed = fixed & (vertex_boundary == 0)
 
         # Vertices
         evolver_input.append("vertices\n")
-        vertices = np.column_stack((X.ravel(), Y.ravel()))  # (x, y)-Punkte erzeugen
-        triangulation = Delaunay(vertices)  # Delaunay-Triangulation
-
-        vertex_mapping = {}
-        vertex_id = 1
         for i in range(vertices.shape[0]):
-            # Berechne den aktuellen Radius des Vertex
-            r_current = np.sqrt((vertices[i, 0] - self.rand.center_x)**2 + (vertices[i, 1] - self.rand.center_y)**2)
-            phi_current = np.arctan2(vertices[i, 1] - self.rand.center_y, vertices[i, 0] - self.rand.center_x)
+            if vertex_boundary[i]:
+                # Randvertices werden nur durch ihren Parameter beschrieben
+                evolver_input.append(f"{i + 1} {vertex_parameter[i]} boundary {vertex_boundary[i]}\n")
+                continue
+            fixed_text = " fixed" if fixed[i] else ""
+            evolver_input.append(f"{i + 1} {vertices[i, 0]} {vertices[i, 1]} {vertices[i, 2]}{fixed_text}\n")
+
+        # Edges (Kanten definieren): Nummerierung und Richtung nach dem ersten Auftreten in den Dreiecken
+        half_edge_edge = mesh.face_edges.reshape(-1)
+        first = np.full(len(mesh.edges), len(half_edge_edge))
+        np.minimum.at(first, half_edge_edge, np.arange(len(half_edge_edge)))
+        order = np.argsort(first)
+        edge_id = np.empty(len(order), dtype=int)
+        edge_id[order] = np.arange(1, len(order) + 1)
+        start, end = mesh.half_edge_origin[first[order]], mesh.half_edge_target[first[order]]
 
-            # Prüfe, ob der Vertex auf dem maximalen Radius für den Winkel liegt
-            max_radius = self.rand.getRadius(phi_current)
-            is_fixed = np.isclose(r_current, max_radius)
-
-            fixed_text = " fixed" if is_fixed else ""
-            evolver_input.append(f"{vertex_id} {vertices[i, 0]} {vertices[i, 1]} {Z.ravel()[i]}{fixed_text}\n")
-            vertex_mapping[i] = vertex_id
-            vertex_id += 1
-
-        # Edges (Kanten definieren)
         evolver_input.append("\nedges\n")
-        edge_mapping = {}
-        edge_id = 1
-        for simplex in triangulation.simplices:
-            for k in range(3):
-                v1 = simplex[k]
-                v2 = simplex[(k + 1) % 3]
-                edge_key = (v1, v2)
-
-                # Berechne die Radien der Endpunkte der Kante
-                r1 = np.sqrt((vertices[v1, 0] - self.rand.center_x)**2 + (vertices[v1, 1] - self.rand.center_y)**2)
-                r2 = np.sqrt((vertices[v2, 0] - self.rand.center_x)**2 + (vertices[v2, 1] - self.rand.center_y)**2)
-                phi1 = np.arctan2(vertices[v1, 1] - self.rand.center_y, vertices[v1, 0] - self.rand.center_x)
-                phi2 = np.arctan2(vertices[v2, 1] - self.rand.center_y, vertices[v2, 0] - self.rand.center_x)
-
-                # Prüfe, ob beide Endpunkte der Kante auf dem maximalen Radius für ihren Winkel liegen
-                is_fixed = np.isclose(r1, self.rand.getRadius(phi1)) and np.isclose(r2, self.rand.getRadius(phi2))
-                fixed_text = " fixed" if is_fixed else ""
-
-                # Kante nur einmal definieren
-                if edge_key not in edge_mapping and (v2, v1) not in edge_mapping:
-                    evolver_input.append(f"{edge_id} {vertex_mapping[v1]} {vertex_mapping[v2]}{fixed_text}\n")
-                    edge_mapping[edge_key] = edge_id
-                    edge_mapping[(v2, v1)] = -edge_id  # Gegenorientierte Kante
-                    edge_id += 1
-
-        # Temporäre Speicherung der Facetten
-        faces = []
-        for simplex in triangulation.simplices:
-            v1, v2, v3 = simplex
-            edge1 = edge_mapping.get((v1, v2))
-            edge2 = edge_mapping.get((v2, v3))
-            edge3 = edge_mapping.get((v3, v1))
-            faces.append([edge1, edge2, edge3])  # Temporär speichern
-
-        # Sortiere die Facetten und überprüfe die Kantenorientierung
-        sorted_faces = []
-        for face in faces:
-            sorted_face = []
-            for edge in face:
-                # Kante bereits richtig orientiert, ansonsten negativ markieren
-                if edge > 0:
-                    sorted_face.append(edge)
-                else:
-                    sorted_face.append(edge)  # Bereits umgekehrt
-            sorted_faces.append(sorted_face)
-
-        # Füge die sortierten Facetten dem Evolver Input hinzu
+        for i, (v1, v2) in enumerate(zip(start, end), start=1):
+            # Python-int, Halbkantenindizes sind int32 und liefen bei großen Netzen über
+            v1, v2 = int(v1), int(v2)
+            number = curve_edges.get(min(v1, v2) * len(vertices) + max(v1, v2), 0)
+            if number and vertex_boundary[v1] and vertex_boundary[v2]:
+                # Randkante zwischen zwei gleitenden Vertices derselben Randkurve
+                fixed_text = f" boundary {number}"
+            elif number:
+                # Randkante an einer festen Ecke
+                fixed_text = " fixed"
+            else:
+                # Kante ist fest, wenn beide Endpunkte auf dem Rand liegen
+                fixed_text = " fixed" if fixed[v1] and fixed[v2] else ""
+            evolver_input.append(f"{i} {v1 + 1} {v2 + 1}{fixed_text}\n")
+
+        # Facetten: gegenläufig zum ersten Auftreten durchlaufene Kanten negativ
+        same_direction = mesh.half_edge_origin == mesh.half_edge_origin[first[half_edge_edge]]
+        face_edges = (edge_id[half_edge_edge] * np.where(same_direction, 1, -1)).reshape(-1, 3)
+
         evolver_input.append("\nfaces\n")
-        face_id = 1
-        for face in sorted_faces:
+        for face_id, face in enumerate(face_edges, start=1):
             evolver_input.append(f"{face_id} {face[0]} {face[1]} {face[2]}\n")
-            face_id += 1
 
         return ''.join(evolver_input)
 
 
 # Beispielaufruf der Klasse
-if __name__ == "__main__":
-    from rand import Rand  # Beispielhafte Randklasse
+def main():
     from minimal_surface import read_file  # Funktion zum Einlesen von Punkten aus einer Datei
     points, file_path = read_file(True)  # Einlesen der Punkte aus einer Datei
 
@@ -166,4 +249,8 @@ if __name__ == "__main__":
     # Speichern des Inputs in eine Datei
     with open("surface_evolver_input.fe", "w") as file:
         file.write(evolver_input_text)
-    print("Surface Evolver Input erfolgreich generiert.")
\ No newline at end of file
+    print("Surface Evolver Input erfolgreich generiert.")
+
+
+if __name__ == "__main__":
+    main()
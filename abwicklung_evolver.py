@@ -1,7 +1,8 @@
 import numpy as np
-import tkinter as tk
-from tkinter import filedialog
 import os
+import re
+
+from netz import Mesh, orient_faces
 
 def parse_off(file_path):
     """
@@ -25,42 +26,142 @@ def parse_off(file_path):
     
     return np.array(vertices), np.array(faces)
 
-def generate_surface_evolver_file(vertices, faces, output_file_path):
+def parse_fe(file_path):
+    """
+    Funktion zum Parsen einer Surface Evolver (.fe)-Datei.
+
+    Facetten werden über ihre orientierten Kantenschleifen in Vertex-Dreiecke
+    umgewandelt, Vielecke werden als Fächer trianguliert.
+    Rückgabe: vertices (N, 3), faces (M, 3) mit 0-basierten Indizes und die Maske
+    der als 'fixed' markierten Vertices.
+    """
+    with open(file_path, 'r') as file:
+        text = file.read()
+
+    # Kommentare entfernen
+    text = re.sub(r'/\*.*?\*/', ' ', text, flags=re.S)
+    text = re.sub(r'//[^\n]*', '', text)
+
+    vertex_ids, vertices, fixed = {}, [], []
+    edges = {}
+    face_loops = []
+    section = None
+    for line in text.splitlines():
+        tokens = line.split()
+        if not tokens:
+            continue
+        keyword = tokens[0].lower()
+        if keyword in ('vertices', 'edges', 'faces', 'facets', 'bodies'):
+            section = keyword
+            continue
+        if not tokens[0].isdigit():
+            if section is not None and keyword.isalpha():
+                section = None  # Unbekannter Abschnitt (z.B. read)
+            continue
+
+        if section == 'vertices':
+            vertex_ids[int(tokens[0])] = len(vertices)
+            vertices.append([float(value) for value in tokens[1:4]])
+            fixed.append('fixed' in tokens[4:])
+        elif section == 'edges':
+            edges[int(tokens[0])] = (int(tokens[1]), int(tokens[2]))
+        elif section in ('faces', 'facets'):
+            loop = []
+            for token in tokens[1:]:
+                if not token.lstrip('-').isdigit():
+                    break
+                loop.append(int(token))
+            face_loops.append(loop)
+
+    faces = []
+    for loop in face_loops:
+        if edges:
+            # Startvertex jeder orientierten Kante
+            corners = [vertex_ids[edges[e][0]] if e > 0 else vertex_ids[edges[-e][1]] for e in loop]
+        else:
+            # Ohne Kantenabschnitt sind die Facetten direkt über Vertex-IDs angegeben
+            corners = [vertex_ids[v] for v in loop]
+        for k in range(1, len(corners) - 1):
+            faces.append([corners[0], corners[k], corners[k + 1]])
+
+    return np.array(vertices), np.array(faces, dtype=int).reshape(-1, 3), np.array(fixed, dtype=bool)
+
+def _body_definition(vertices, faces, body):
+    """Facetliste und Volumen- bzw. Druckvorgabe eines Körpers als Zeile der bodies-Sektion."""
+    from flaechenanalyse import enclosed_volume
+
+    face_ids = np.arange(len(faces)) if body.get('faces') is None else np.asarray(body['faces'])
+    if 'volume' in body and 'pressure' in body:
+        raise ValueError("Ein Körper kann entweder ein Volumen oder einen Druck vorgeben, nicht beides.")
+    volume = enclosed_volume(np.asarray(vertices, dtype=float), np.asarray(faces)[face_ids])
+    # Nach innen orientierte Körper mit negativen Facetnummern umdrehen
+    sign = -1 if volume < 0 else 1
+    facets = ' '.join(map(str, sign * (face_ids + 1)))
+    if 'pressure' in body:
+        return f"{facets} pressure {body['pressure']}"
+    return f"{facets} volume {body.get('volume', abs(volume))}"
+
+
+def generate_surface_evolver_file(vertices, faces, output_file_path, orient=True, fixed=None, bodies=None):
     """
     Generiert eine Surface Evolver (.fe)-Datei aus Vertices und Faces mit konsistenter Kantenorientierung.
+
+    Mit orient=True werden die Faces vorher mit netz.orient_faces einheitlich ausgerichtet.
+    Vertices mit gesetzter fixed-Maske werden als 'fixed' geschrieben.
+    bodies beschreibt Körper wie in bubble2.fe als Liste von Dictionaries mit
+    'faces' (Faceindizes, ohne Angabe alle Faces) und 'volume' oder 'pressure';
+    ohne beides wird das aktuelle Volumen vorgegeben. Die Facets eines Körpers
+    werden so orientiert, dass sein Volumen positiv ist.
+    Rückgabe: mit orient=True ein Dictionary mit 'flipped' (Anzahl umgedrehter
+    Faces), 'non_manifold_edges' und 'loops' aus orient_faces, sonst None.
     """
+    stats = None
+    if orient:
+        faces, flipped, non_manifold_edges, loops = orient_faces(faces, vertices)
+        stats = {'flipped': int(np.count_nonzero(flipped)), 'non_manifold_edges': non_manifold_edges, 'loops': loops}
+
+    # Kanten einmalig mit v1 < v2, Vorzeichen nach Durchlaufrichtung in der Face
+    mesh = Mesh(vertices, faces)
+    edges, face_edges = mesh.edges, mesh.face_edges
+    signs = np.where(faces < np.roll(faces, -1, axis=1), 1, -1)
+    signed_face_edges = (face_edges + 1) * signs
+
     with open(output_file_path, 'w') as fe_file:
         # Header-Informationen schreiben
         fe_file.write("// Surface Evolver Datenfile mit konsistenter Kantenorientierung\n")
         fe_file.write("vertices\n")
-        
+
         # Schreiben der Vertices
-        for i, (x, y, z) in enumerate(vertices, start=1):
-            fe_file.write(f"{i} {x} {y} {z}\n")
-        
-        # Definieren der Kanten mit konsistenter Orientierung
+        fixed_text = np.where(fixed, " fixed", "") if fixed is not None else [""] * len(vertices)
+        for i, ((x, y, z), text) in enumerate(zip(vertices, fixed_text), start=1):
+            fe_file.write(f"{i} {x} {y} {z}{text}\n")
+
+        # Definieren der Kanten
         fe_file.write("\nedges\n")
-        edge_map = {}
-        edge_id = 1
-        for v1, v2, v3 in faces:
-            edges = [(v1, v2), (v2, v3), (v3, v1)]
-            for v_start, v_end in edges:
-                if (v_start, v_end) not in edge_map and (v_end, v_start) not in edge_map:
-                    fe_file.write(f"{edge_id} {v_start + 1} {v_end + 1}\n")
-                    edge_map[(v_start, v_end)] = edge_id
-                    edge_map[(v_end, v_start)] = -edge_id  # Umgekehrte Orientierung
-                    edge_id += 1
+        for i, (v_start, v_end) in enumerate(edges, start=1):
+            fe_file.write(f"{i} {v_start + 1} {v_end + 1}\n")
 
         # Schreiben der Faces mit korrekt orientierten Kanten
         fe_file.write("\nfaces\n")
-        for i, (v1, v2, v3) in enumerate(faces, start=1):
-            face_edges = [edge_map[(v1, v2)], edge_map[(v2, v3)], edge_map[(v3, v1)]]
+        for i, face_edges in enumerate(signed_face_edges, start=1):
             fe_file.write(f"{i} {' '.join(map(str, face_edges))}\n")
 
-def select_file_and_generate_fe():
+        if bodies:
+            fe_file.write("\nbodies\n")
+            for i, body in enumerate(bodies, start=1):
+                fe_file.write(f"{i} {_body_definition(vertices, faces, body)}\n")
+    return stats
+
+def select_file_and_generate_fe(target_faces=None):
     """
     Öffnet einen Dateidialog zur Auswahl einer .off-Datei und generiert die entsprechende .fe-Datei.
+
+    Mit target_faces wird das Netz vorher per Quadrik-Kantenkollaps vereinfacht,
+    Randvertices bleiben dabei erhalten und werden als 'fixed' markiert.
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     # Öffnen des Dateidialogs zur Auswahl der .off-Datei
     root = tk.Tk()
     root.withdraw()  # Versteckt das Hauptfenster
@@ -72,12 +173,18 @@ def select_file_and_generate_fe():
 
     # Parsen der OFF-Datei
     vertices, faces = parse_off(file_path)
-    
+    fixed = None
+    if target_faces is not None:
+        from dezimierung import decimate
+        vertices, faces, fixed = decimate(vertices, faces, target_faces=target_faces)
+
     # Definieren des Ausgabewegs für die Surface Evolver-Datei
     output_file_path = os.path.splitext(file_path)[0] + "_oriented.fe"
     
     # Generieren der Surface Evolver-Datei mit konsistenter Kantenorientierung
-    generate_surface_evolver_file(vertices, faces, output_file_path)
+    stats = generate_surface_evolver_file(vertices, faces, output_file_path, fixed=fixed)
+    print(f"Ausrichtung: {stats['flipped']} Faces umgedreht, "
+          f"{len(stats['non_manifold_edges'])} nicht-mannigfaltige Kanten, {len(stats['loops'])} Randschleifen")
     print(f"Surface Evolver-Datei erfolgreich generiert: {output_file_path}")
 
 # Ausführen der GUI und der Verarbeitungsfunktion
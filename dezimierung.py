@@ -0,0 +1,154 @@
+import heapq
+
+import numpy as np
+
+from netz import Mesh
+
+
+def _face_quadrics(vertices, faces):
+    """Flächengewichtete Fehlerquadriken K = p p^T der Dreiecksebenen (M, 4, 4)."""
+    p0, p1, p2 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    normal = np.cross(p1 - p0, p2 - p0)
+    double_area = np.linalg.norm(normal, axis=1)
+    normal /= np.where(double_area > 0, double_area, 1.0)[:, None]
+    plane = np.column_stack((normal, -np.sum(normal * p0, axis=1)))
+    return 0.5 * double_area[:, None, None] * plane[:, :, None] * plane[:, None, :]
+
+
+def _collapse_target(Q, p_u, p_v, locked_u, locked_v):
+    """Optimale Position und Fehler für das Zusammenlegen einer Kante."""
+    if locked_u:
+        position = p_u
+    elif locked_v:
+        position = p_v
+    else:
+        A = Q[:3, :3]
+        if abs(np.linalg.det(A)) > 1e-12:
+            position = np.linalg.solve(A, -Q[:3, 3])
+        else:
+            # Schlecht konditioniert: den besten der Kandidaten Endpunkte/Mittelpunkt nehmen
+            candidates = (p_u, p_v, 0.5 * (p_u + p_v))
+            position = min(candidates, key=lambda c: np.append(c, 1.0) @ Q @ np.append(c, 1.0))
+    homogeneous = np.append(position, 1.0)
+    return position, max(homogeneous @ Q @ homogeneous, 0.0)
+
+
+def decimate(vertices, faces, target_faces=None, max_error=None, fixed=None, preserve_boundary=True):
+    """
+    Vereinfacht ein Dreiecksnetz durch Kantenkollaps nach dem Quadrikfehler (Garland/Heckbert).
+
+    Die Kanten werden über eine Prioritätswarteschlange in der Reihenfolge ihres
+    Fehlers zusammengelegt, bis target_faces erreicht ist oder der kleinste Fehler
+    max_error übersteigt. Randvertices (bei preserve_boundary) und als fixed
+    markierte Vertices werden nicht verschoben, Randkanten bleiben damit erhalten.
+
+    Rückgabe: vertices, faces und die Maske der festen Vertices des vereinfachten Netzes.
+    """
+    vertices = np.array(vertices, dtype=float)
+    faces = np.array(faces, dtype=int)
+    num_vertices = len(vertices)
+    if target_faces is None and max_error is None:
+        raise ValueError("target_faces oder max_error muss angegeben werden.")
+    target_faces = 0 if target_faces is None else target_faces
+    max_error = np.inf if max_error is None else max_error
+
+    mesh = Mesh(vertices, faces)
+    locked = np.zeros(num_vertices, dtype=bool) if fixed is None else np.array(fixed, dtype=bool)
+    if preserve_boundary:
+        locked |= mesh.boundary_vertices
+
+    # Vertex-Quadriken als Summe der Quadriken der angrenzenden Dreiecke
+    face_quadrics = _face_quadrics(vertices, faces).reshape(-1, 16)
+    quadrics = np.column_stack([np.bincount(faces.ravel(), weights=np.repeat(face_quadrics[:, k], 3),
+                                            minlength=num_vertices) for k in range(16)]).reshape(-1, 4, 4)
+
+    vertex_faces = [set() for _ in range(num_vertices)]
+    for face_id, face in enumerate(faces):
+        for v in face:
+            vertex_faces[v].add(face_id)
+    face_alive = np.ones(len(faces), dtype=bool)
+    vertex_alive = np.ones(num_vertices, dtype=bool)
+    stamp = np.zeros(num_vertices, dtype=int)
+
+    def neighbors(v):
+        return set(faces[list(vertex_faces[v])].ravel()) - {v}
+
+    heap = []
+
+    def push(u, v):
+        if locked[u] and locked[v]:
+            return
+        _, error = _collapse_target(quadrics[u] + quadrics[v], vertices[u], vertices[v], locked[u], locked[v])
+        heapq.heappush(heap, (error, u, v, stamp[u], stamp[v]))
+
+    for u, v in mesh.edges:
+        push(u, v)
+
+    num_faces = len(faces)
+    while heap and num_faces > target_faces:
+        error, u, v, stamp_u, stamp_v = heapq.heappop(heap)
+        if not (vertex_alive[u] and vertex_alive[v]) or stamp[u] != stamp_u or stamp[v] != stamp_v:
+            continue  # Veralteter Eintrag
+        if error > max_error:
+            break
+
+        # Der verbleibende Vertex ist der feste, falls einer fest ist
+        if locked[v]:
+            u, v = v, u
+        shared = vertex_faces[u] & vertex_faces[v]
+        if len(neighbors(u) & neighbors(v)) != len(shared):
+            continue  # Link-Bedingung verletzt, der Kollaps würde das Netz nicht-mannigfaltig machen
+
+        position, _ = _collapse_target(quadrics[u] + quadrics[v], vertices[u], vertices[v], locked[u], locked[v])
+
+        # Keine Dreiecke umklappen lassen
+        moved = list((vertex_faces[u] | vertex_faces[v]) - shared)
+        corners = faces[moved]
+        new_corners = np.where((corners == u) | (corners == v), -1, corners)
+        old_p = vertices[corners]
+        new_p = np.where((new_corners == -1)[:, :, None], position, vertices[np.maximum(new_corners, 0)])
+        old_n = np.cross(old_p[:, 1] - old_p[:, 0], old_p[:, 2] - old_p[:, 0])
+        new_n = np.cross(new_p[:, 1] - new_p[:, 0], new_p[:, 2] - new_p[:, 0])
+        if np.any(np.sum(old_n * new_n, axis=1) <= 1e-3 * np.sum(old_n * old_n, axis=1)):
+            continue
+
+        # Kollaps v -> u
+        for face_id in shared:
+            face_alive[face_id] = False
+            for w in faces[face_id]:
+                vertex_faces[w].discard(face_id)
+        num_faces -= len(shared)
+        for face_id in vertex_faces[v]:
+            faces[face_id][faces[face_id] == v] = u
+            vertex_faces[u].add(face_id)
+        vertex_faces[v] = set()
+        vertex_alive[v] = False
+        vertices[u] = position
+        quadrics[u] += quadrics[v]
+        stamp[u] += 1
+
+        for w in neighbors(u):
+            push(min(u, w), max(u, w))
+
+    # Netz verdichten und Indizes neu vergeben
+    faces = faces[face_alive]
+    used = np.zeros(num_vertices, dtype=bool)
+    used[faces.ravel()] = True
+    remap = np.cumsum(used) - 1
+    return vertices[used], remap[faces], locked[used]
+
+
+# Beispielaufruf: dichtes OFF-Netz vor der Übergabe an den Evolver vereinfachen
+if __name__ == "__main__":
+    import sys
+    import os
+    from abwicklung_evolver import parse_off, generate_surface_evolver_file
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else 'symm_aussen.off'
+    target = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    vertices, faces = parse_off(file_path)
+    vertices, faces, fixed = decimate(vertices, faces, target_faces=target)
+    output_file_path = os.path.splitext(file_path)[0] + f"_{len(faces)}.fe"
+    generate_surface_evolver_file(vertices, faces, output_file_path, fixed=fixed)
+    print(f"Vereinfachtes Netz mit {len(faces)} Faces gespeichert: {output_file_path}")
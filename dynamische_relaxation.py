@@ -0,0 +1,263 @@
+import numpy as np
+
+from netz import triangle_gradients
+
+
+class DynamicRelaxation:
+    """
+    Dynamische Relaxation mit kinetischer Dämpfung für Seil-, Membran- und Stabtragwerke.
+
+    Seile und Membranen tragen nur Zug, Druckstangen tragen Zug und Druck.
+    Alle Elementkräfte werden pro Zeitschritt mit Array-Operationen über alle
+    Elemente gleichzeitig berechnet.
+    """
+
+    def __init__(self, vertices, fixed=None, loads=None, dt=1.0):
+        self.vertices = np.array(vertices, dtype=float)
+        num_vertices = len(self.vertices)
+        self.fixed = np.zeros(num_vertices, dtype=bool) if fixed is None else np.asarray(fixed, dtype=bool)
+        self.loads = np.zeros_like(self.vertices) if loads is None else np.array(loads, dtype=float)
+        self.velocities = np.zeros_like(self.vertices)
+        self.dt = dt
+
+        # Stabelemente (Seile und Druckstangen)
+        self.bar_edges = np.zeros((0, 2), dtype=int)
+        self.bar_EA = np.zeros(0)
+        self.bar_rest_length = np.zeros(0)
+        self.bar_prestress = np.zeros(0)
+        self.bar_tension_only = np.zeros(0, dtype=bool)
+
+        # Membranelemente (CST-Dreiecke)
+        self.membrane_faces = np.zeros((0, 3), dtype=int)
+        self.membrane_grad = np.zeros((0, 3, 2))  # Formfunktionsgradienten in der Referenzlage
+        self.membrane_volume = np.zeros(0)  # Referenzfläche * Dicke
+        self.membrane_lame = np.zeros((0, 2))  # (lambda, mu) für den ebenen Spannungszustand
+        self.membrane_prestress = np.zeros(0)
+        self.pressure = 0.0
+
+    @classmethod
+    def from_mesh(cls, vertices, faces, fixed, E, thickness, nu=0.3, prestress=0.0, **kwargs):
+        """Erzeugt ein Membrantragwerk aus einem Dreiecksnetz."""
+        relaxation = cls(vertices, fixed=fixed, **kwargs)
+        relaxation.add_membrane(faces, E, thickness, nu=nu, prestress=prestress)
+        return relaxation
+
+    @classmethod
+    def from_force_density(cls, solver, EA, **kwargs):
+        """
+        Übernimmt die Gleichgewichtsform eines ForceDensitySolver als Seilnetz.
+
+        Die Stabkräfte S = q * L werden als Vorspannung in der aktuellen Länge
+        übernommen, die Form ist damit ohne äußere Last im Gleichgewicht.
+        """
+        relaxation = cls(solver.vertices, fixed=solver.fixed, loads=solver.loads, **kwargs)
+        relaxation.add_cables(solver.edges, EA, prestress=solver.edge_forces())
+        return relaxation
+
+    def _add_bars(self, edges, EA, prestress, rest_length, tension_only):
+        edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        if rest_length is None:
+            vectors = self.vertices[edges[:, 1]] - self.vertices[edges[:, 0]]
+            rest_length = np.linalg.norm(vectors, axis=1)
+        num_edges = len(edges)
+
+        self.bar_edges = np.vstack((self.bar_edges, edges))
+        self.bar_EA = np.concatenate((self.bar_EA, np.broadcast_to(EA, (num_edges,))))
+        self.bar_rest_length = np.concatenate((self.bar_rest_length, np.broadcast_to(rest_length, (num_edges,))))
+        self.bar_prestress = np.concatenate((self.bar_prestress, np.broadcast_to(prestress, (num_edges,))))
+        self.bar_tension_only = np.concatenate((self.bar_tension_only, np.full(num_edges, tension_only)))
+
+    def add_cables(self, edges, EA, prestress=0.0, rest_length=None):
+        """Fügt Seile hinzu, die nur Zug aufnehmen."""
+        self._add_bars(edges, EA, prestress, rest_length, tension_only=True)
+
+    def add_struts(self, edges, EA, prestress=0.0, rest_length=None):
+        """Fügt Druckstangen hinzu, die Zug und Druck aufnehmen."""
+        self._add_bars(edges, EA, prestress, rest_length, tension_only=False)
+
+    def add_membrane(self, faces, E, thickness, nu=0.3, prestress=0.0):
+        """
+        Fügt Membrandreiecke hinzu, die Referenzlage ist die aktuelle Geometrie.
+
+        Druckspannungen werden abgeschnitten (Faltenbildung), die Membran trägt nur Zug.
+        """
+        faces = np.asarray(faces, dtype=int).reshape(-1, 3)
+        grad, area, _ = triangle_gradients(self.vertices, faces)
+
+        num_faces = len(faces)
+        E = np.broadcast_to(E, (num_faces,))
+        nu = np.broadcast_to(nu, (num_faces,))
+        lame = np.column_stack((E * nu / (1 - nu**2), E / (2 * (1 + nu))))
+
+        self.membrane_faces = np.vstack((self.membrane_faces, faces))
+        self.membrane_grad = np.concatenate((self.membrane_grad, grad))
+        self.membrane_volume = np.concatenate((self.membrane_volume, area * np.broadcast_to(thickness, (num_faces,))))
+        self.membrane_lame = np.vstack((self.membrane_lame, lame))
+        self.membrane_prestress = np.concatenate((self.membrane_prestress, np.broadcast_to(prestress, (num_faces,))))
+
+    def set_pressure(self, pressure):
+        """Setzt einen Flächendruck normal zu den Membrandreiecken (z.B. Winddruck)."""
+        self.pressure = pressure
+
+    def bar_forces(self, x=None):
+        """Gibt die Stabkräfte zurück (positiv: Zug)."""
+        x = self.vertices if x is None else x
+        vectors = x[self.bar_edges[:, 1]] - x[self.bar_edges[:, 0]]
+        lengths = np.linalg.norm(vectors, axis=1)
+        forces = self.bar_prestress + self.bar_EA * (lengths - self.bar_rest_length) / self.bar_rest_length
+        forces = np.where(self.bar_tension_only, np.maximum(forces, 0.0), forces)
+        return forces, vectors, lengths
+
+    def membrane_stresses(self, x=None):
+        """
+        Gibt die Spalten des Deformationsgradienten (f1, f2) und die
+        2. Piola-Kirchhoff-Spannungen (s11, s12, s22) je Dreieck zurück.
+
+        Negative Hauptspannungen werden auf null gesetzt.
+        """
+        x = self.vertices if x is None else x
+        xf = x[self.membrane_faces]
+        g1, g2 = self.membrane_grad[:, :, 0], self.membrane_grad[:, :, 1]
+        f1 = xf[:, 0] * g1[:, 0, None] + xf[:, 1] * g1[:, 1, None] + xf[:, 2] * g1[:, 2, None]
+        f2 = xf[:, 0] * g2[:, 0, None] + xf[:, 1] * g2[:, 1, None] + xf[:, 2] * g2[:, 2, None]
+
+        # Green-Lagrange-Verzerrungen und ebener Spannungszustand
+        e11 = 0.5 * (np.sum(f1 * f1, axis=1) - 1.0)
+        e22 = 0.5 * (np.sum(f2 * f2, axis=1) - 1.0)
+        e12 = 0.5 * np.sum(f1 * f2, axis=1)
+        lam, mu = self.membrane_lame[:, 0], self.membrane_lame[:, 1]
+        isotropic = lam * (e11 + e22) + self.membrane_prestress
+        s11 = isotropic + 2 * mu * e11
+        s22 = isotropic + 2 * mu * e22
+        s12 = 2 * mu * e12
+
+        # Hauptspannungen des symmetrischen 2x2-Tensors
+        mean = 0.5 * (s11 + s22)
+        radius = np.sqrt((0.5 * (s11 - s22))**2 + s12**2)
+        p1, p2 = mean + radius, mean - radius
+
+        # Einachsiger Zug: Projektion auf die Richtung von p1, schlaffe Dreiecke tragen nichts
+        factor = np.where((p2 < 0) & (p1 > 0), p1 / np.where(radius > 0, 2 * radius, 1.0), 0.0)
+        intact = p2 >= 0
+        s11 = np.where(intact, s11, factor * (s11 - p2))
+        s22 = np.where(intact, s22, factor * (s22 - p2))
+        s12 = np.where(intact, s12, factor * s12)
+        return f1, f2, s11, s12, s22
+
+    def _scatter(self, indices, forces):
+        """Summiert Elementkräfte (K, 3) auf die Knoten."""
+        num_vertices = len(self.vertices)
+        return np.column_stack([np.bincount(indices, weights=forces[:, k], minlength=num_vertices)
+                                for k in range(3)])
+
+    def residual_forces(self, x=None):
+        """Berechnet die Knotenkräfte aus äußerer Last und Elementkräften."""
+        x = self.vertices if x is None else x
+        residual = self.loads.copy()
+
+        if len(self.bar_edges):
+            forces, vectors, lengths = self.bar_forces(x)
+            bar_force = (forces / lengths)[:, None] * vectors
+            indices = np.concatenate((self.bar_edges[:, 0], self.bar_edges[:, 1]))
+            residual += self._scatter(indices, np.vstack((bar_force, -bar_force)))
+
+        if len(self.membrane_faces):
+            f1, f2, s11, s12, s22 = self.membrane_stresses(x)
+            volume = self.membrane_volume[:, None]
+            t1 = -volume * (s11[:, None] * f1 + s12[:, None] * f2)  # Spalten von -V F S
+            t2 = -volume * (s12[:, None] * f1 + s22[:, None] * f2)
+            g1, g2 = self.membrane_grad[:, :, 0], self.membrane_grad[:, :, 1]
+            nodal = g1[:, :, None] * t1[:, None, :] + g2[:, :, None] * t2[:, None, :]
+            if self.pressure:
+                xf = x[self.membrane_faces]
+                area_vectors = 0.5 * np.cross(xf[:, 1] - xf[:, 0], xf[:, 2] - xf[:, 0])
+                nodal += (self.pressure / 3.0) * area_vectors[:, None, :]
+            residual += self._scatter(self.membrane_faces.ravel(), nodal.reshape(-1, 3))
+
+        return residual
+
+    def reactions(self):
+        """Gibt die Auflagerkräfte an den festen Knoten zurück."""
+        return -self.residual_forces()[self.fixed]
+
+    def _fictitious_masses(self, x):
+        """Fiktive Knotenmassen aus einer Steifigkeitsabschätzung, damit dt stabil bleibt."""
+        stiffness = np.zeros(len(self.vertices))
+        if len(self.bar_edges):
+            forces, _, lengths = self.bar_forces(x)
+            k = self.bar_EA / self.bar_rest_length + np.abs(forces) / lengths
+            stiffness += np.bincount(self.bar_edges.ravel(), weights=np.repeat(k, 2), minlength=len(stiffness))
+        if len(self.membrane_faces):
+            lam, mu = self.membrane_lame[:, 0], self.membrane_lame[:, 1]
+            modulus = lam + 2 * mu + np.abs(self.membrane_prestress)
+            grad_norm = np.linalg.norm(self.membrane_grad, axis=2)
+            k = (self.membrane_volume * modulus)[:, None] * grad_norm * grad_norm.sum(axis=1)[:, None]
+            stiffness += np.bincount(self.membrane_faces.ravel(), weights=k.ravel(), minlength=len(stiffness))
+        return np.maximum(stiffness, 1e-12) * self.dt**2
+
+    def run(self, max_steps=10000, tol=1e-6, callback=None):
+        """
+        Relaxiert das Tragwerk bis die größte Restkraft kleiner als tol ist.
+
+        Kinetische Dämpfung: Sobald die kinetische Energie abnimmt, wird auf das
+        Energiemaximum zurückgesetzt und die Geschwindigkeiten auf null gestellt.
+        Rückgabe: (konvergiert, Anzahl Schritte, größte Restkraft)
+        """
+        dt = self.dt
+        free = ~self.fixed
+        x = self.vertices
+        masses = self._fictitious_masses(x)[:, None]
+        residual = self.residual_forces(x)
+        residual[self.fixed] = 0.0
+        v = 0.5 * dt * residual / masses
+        kinetic_energy = 0.0
+
+        for step in range(1, max_steps + 1):
+            x += dt * v
+            residual = self.residual_forces(x)
+            residual[self.fixed] = 0.0
+            max_residual = np.max(np.linalg.norm(residual[free], axis=1)) if free.any() else 0.0
+            if max_residual < tol:
+                self.velocities = np.zeros_like(v)
+                return True, step, max_residual
+
+            v_new = v + dt * residual / masses
+            energy = 0.5 * np.sum(masses * v_new**2)
+            if energy < kinetic_energy:
+                # Energiemaximum überschritten: auf die Lage des Maximums zurückrechnen
+                x -= 0.5 * dt * v
+                masses = self._fictitious_masses(x)[:, None]
+                residual = self.residual_forces(x)
+                residual[self.fixed] = 0.0
+                v_new = 0.5 * dt * residual / masses
+                energy = 0.0
+            v = v_new
+            kinetic_energy = energy
+
+            if callback is not None:
+                callback(step, x, max_residual)
+
+        self.velocities = v
+        return False, max_steps, max_residual
+
+
+# Beispielaufruf: Seitenwind auf eine formgefundene Membran
+if __name__ == "__main__":
+    from rand import Rand
+    from SrfaceEvolver import SurfaceEvolverInput
+    from kraftdichte import ForceDensitySolver
+    from minimal_surface import read_file
+
+    points, file_path = read_file()
+    surface_input = SurfaceEvolverInput(Rand(points, interpolation_type='linear'))
+    vertices, faces, fixed = surface_input.build_mesh()
+
+    # Form mit der Kraftdichtemethode finden, danach als vorgespannte Membran relaxieren
+    form = ForceDensitySolver.from_mesh(vertices, faces, fixed).solve()
+    relaxation = DynamicRelaxation.from_mesh(form, faces, fixed, E=1000.0, thickness=0.001, prestress=1.0)
+    relaxation.set_pressure(0.01)
+
+    converged, steps, max_residual = relaxation.run(max_steps=20000, tol=1e-8)
+    displacement = np.linalg.norm(relaxation.vertices - form, axis=1).max()
+    print(f"Konvergiert: {converged} nach {steps} Schritten, Restkraft {max_residual:.2e}, "
+          f"maximale Verschiebung {displacement:.4f}")
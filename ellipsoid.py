@@ -1,11 +1,12 @@
 import numpy as np
-from scipy.optimize import minimize
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from tkinter import Tk, filedialog
+from kurven import load_points
 
 # Funktion zum Öffnen einer Datei und Einlesen der Kurvendaten
 def open_and_plot_minimal_surface():
+    from scipy.optimize import minimize
+    import matplotlib.pyplot as plt
+    from tkinter import Tk, filedialog
+
     # Erstelle ein verstecktes Tkinter-Fenster
     root = Tk()
     root.withdraw()  # Verstecke das Hauptfenster
@@ -21,16 +22,7 @@ def open_and_plot_minimal_surface():
         return
 
     # Lese die Kurvendaten aus der Datei
-    points = []
-    with open(file_path, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line:
-                # Lese die Koordinaten (x, y, z) als Tupel
-                point = tuple(map(float, line.split(',')))
-                points.append(point)
-
-    points = np.array(points)
+    points = load_points(file_path)
     x_points = points[:, 0]
     y_points = points[:, 1]
     z_points = points[:, 2]
@@ -0,0 +1,185 @@
+import numpy as np
+
+from netz import Mesh
+
+
+def grid_mesh(X, Y, Z):
+    """
+    Wandelt ein strukturiertes Gitter (z.B. aus MinSurface.get_points) in ein Dreiecksnetz um.
+
+    Jede Gitterzelle wird in zwei Dreiecke zerlegt, Zellen mit NaN-Werten entfallen.
+    """
+    rows, cols = Z.shape
+    vertices = np.column_stack((X.ravel(), Y.ravel(), Z.ravel()))
+    ids = np.arange(rows * cols).reshape(rows, cols)
+    a, b = ids[:-1, :-1].ravel(), ids[:-1, 1:].ravel()
+    c, d = ids[1:, :-1].ravel(), ids[1:, 1:].ravel()
+    faces = np.vstack((np.column_stack((a, b, d)), np.column_stack((a, d, c))))
+    valid = ~np.isnan(vertices[faces]).any(axis=(1, 2))
+    return vertices, faces[valid]
+
+
+def area_vectors(vertices, faces):
+    """Gibt die Flächenvektoren (Normale * Fläche) aller Dreiecke zurück."""
+    p0, p1, p2 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    return 0.5 * np.cross(p1 - p0, p2 - p0)
+
+
+def face_areas(vertices, faces):
+    """Gibt die Flächeninhalte aller Dreiecke zurück."""
+    return np.linalg.norm(area_vectors(vertices, faces), axis=1)
+
+
+def face_normals(vertices, faces):
+    """Gibt die Einheitsnormalen aller Dreiecke zurück (Orientierung nach Umlaufsinn)."""
+    vectors = area_vectors(vertices, faces)
+    areas = np.linalg.norm(vectors, axis=1)
+    return vectors / np.where(areas > 0, areas, 1.0)[:, None]
+
+
+def total_area(vertices, faces):
+    """Gibt die Gesamtfläche zurück."""
+    return face_areas(vertices, faces).sum()
+
+
+def enclosed_volume(vertices, faces):
+    """
+    Gibt das eingeschlossene Volumen nach dem Gaußschen Integralsatz zurück.
+
+    Positiv, wenn die Normalen nach außen zeigen. Bei offenen Flächen ist es das
+    Volumen des Kegels vom Ursprung über der Fläche; bei festem Rand unterscheidet
+    es sich vom Kissenvolumen nur um eine Konstante.
+    """
+    p0, p1, p2 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    return np.einsum('ij,ij->', p0, np.cross(p1, p2)) / 6.0
+
+
+def projected_areas(vertices, faces, closed=False):
+    """
+    Gibt die projizierten Flächen entlang der x-, y- und z-Achse zurück.
+
+    Bei geschlossenen Körpern wird jede Richtung doppelt überdeckt, daher wird halbiert.
+    """
+    projected = np.abs(area_vectors(vertices, faces)).sum(axis=0)
+    return 0.5 * projected if closed else projected
+
+
+def boundary_vertex_mask(faces, num_vertices):
+    """Markiert Vertices, die auf einer Randkante (nur ein angrenzendes Dreieck) liegen."""
+    return Mesh(np.zeros((num_vertices, 3)), faces).boundary_vertices
+
+
+def vertex_curvatures(vertices, faces):
+    """
+    Berechnet die mittlere und die Gaußsche Krümmung je Vertex.
+
+    Mittlere Krümmung über den Kotangens-Laplace-Operator, Gaußsche Krümmung über
+    den Winkeldefekt, beide bezogen auf die gemischte Voronoi-Fläche (Meyer et al.).
+    Randvertices erhalten NaN.
+    """
+    num_vertices = len(vertices)
+    p = vertices[faces]  # (M, 3, 3)
+    # Kante gegenüber Ecke k: von Ecke k+1 zu Ecke k+2
+    e = np.roll(p, -2, axis=1) - np.roll(p, -1, axis=1)
+    double_area = np.linalg.norm(np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]), axis=1)
+    double_area = np.where(double_area > 0, double_area, np.finfo(float).tiny)
+
+    # Innenwinkel und Kotangens an jeder Ecke
+    u = np.roll(p, -1, axis=1) - p
+    w = np.roll(p, -2, axis=1) - p
+    dot = np.sum(u * w, axis=2)
+    cot = dot / double_area[:, None]
+    angle = np.arctan2(double_area[:, None], dot)
+
+    # Gemischte Voronoi-Fläche
+    squared = np.sum(e**2, axis=2)
+    voronoi = (np.roll(squared, -1, axis=1) * np.roll(cot, -1, axis=1)
+               + np.roll(squared, -2, axis=1) * np.roll(cot, -2, axis=1)) / 8.0
+    area = 0.5 * double_area[:, None]
+    obtuse = angle > np.pi / 2
+    any_obtuse = obtuse.any(axis=1)[:, None]
+    mixed = np.where(any_obtuse, np.where(obtuse, area / 2, area / 4), voronoi)
+    vertex_area = np.bincount(faces.ravel(), weights=mixed.ravel(), minlength=num_vertices)
+
+    # Kotangens-Laplace: Beitrag der Kante gegenüber Ecke k mit Gewicht cot_k / 2
+    i, j = np.roll(faces, -1, axis=1).ravel(), np.roll(faces, -2, axis=1).ravel()
+    weight = 0.5 * cot.ravel()
+    diff = (vertices[j] - vertices[i]) * weight[:, None]
+    laplace = np.column_stack([np.bincount(i, weights=diff[:, k], minlength=num_vertices)
+                               - np.bincount(j, weights=diff[:, k], minlength=num_vertices)
+                               for k in range(3)])
+    vertex_area_safe = np.where(vertex_area > 0, vertex_area, np.nan)
+    mean_curvature_normal = laplace / vertex_area_safe[:, None]
+
+    # Vorzeichen über die flächengewichtete Vertexnormale (konvex zur Normalen hin: positiv)
+    normals = np.column_stack([np.bincount(faces.ravel(), weights=np.repeat(area_vectors(vertices, faces)[:, k], 3),
+                                           minlength=num_vertices) for k in range(3)])
+    sign = -np.sign(np.sum(mean_curvature_normal * normals, axis=1))
+    mean = 0.5 * sign * np.linalg.norm(mean_curvature_normal, axis=1)
+
+    angle_sum = np.bincount(faces.ravel(), weights=angle.ravel(), minlength=num_vertices)
+    gaussian = (2 * np.pi - angle_sum) / vertex_area_safe
+
+    boundary = Mesh(vertices, faces).boundary_vertices
+    mean[boundary] = np.nan
+    gaussian[boundary] = np.nan
+    return mean, gaussian
+
+
+def side_force_coefficient(vertices, faces, wind_direction=(0.0, 1.0, 0.0), closed=False):
+    """
+    Schätzt den Seitenkraftbeiwert für Anströmung aus wind_direction (Newtonsche Stoßtheorie).
+
+    Jedes angeströmte Dreieck erhält c_p = 2 cos²(theta), die resultierende Kraft in
+    Windrichtung wird auf die projizierte Fläche quer zum Wind bezogen. Für offene
+    Flächen zählt jeweils die dem Wind zugewandte Seite, bei geschlossenen Körpern
+    (äußere Normalen) nur die Luvseite. Der Wert dient dem Vergleich von Varianten,
+    nicht als absolute Vorhersage.
+    """
+    wind = np.array(wind_direction, dtype=float)
+    wind /= np.linalg.norm(wind)
+    vectors = area_vectors(vertices, faces)
+    areas = np.linalg.norm(vectors, axis=1)
+    cos_theta = (vectors @ wind) / np.where(areas > 0, areas, 1.0)
+
+    if closed:
+        exposed_area = np.where(cos_theta < 0, areas, 0.0)
+    else:
+        exposed_area = areas
+    force = np.sum(2 * cos_theta**2 * exposed_area * np.abs(cos_theta))
+
+    reference_area = np.abs(vectors @ wind).sum()
+    if closed:
+        reference_area *= 0.5
+    return force / reference_area if reference_area > 0 else 0.0
+
+
+def analyze(vertices, faces, wind_direction=(0.0, 1.0, 0.0), closed=False):
+    """Fasst die Kennwerte einer Fläche für Optimierungs- und Parameterstudien zusammen."""
+    mean, gaussian = vertex_curvatures(vertices, faces)
+    projected = projected_areas(vertices, faces, closed=closed)
+    return {
+        'area': total_area(vertices, faces),
+        'projected_x': projected[0],
+        'projected_y': projected[1],
+        'projected_z': projected[2],
+        'mean_curvature_abs_max': np.nanmax(np.abs(mean)) if np.isfinite(mean).any() else np.nan,
+        'mean_curvature_rms': np.sqrt(np.nanmean(mean**2)) if np.isfinite(mean).any() else np.nan,
+        'gaussian_curvature_mean': np.nanmean(gaussian) if np.isfinite(gaussian).any() else np.nan,
+        'side_force_coefficient': side_force_coefficient(vertices, faces, wind_direction, closed=closed),
+    }
+
+
+# Beispielaufruf: Kennwerte einer OFF- oder .fe-Datei ausgeben
+if __name__ == "__main__":
+    import sys
+    from abwicklung_evolver import parse_off, parse_fe
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else 'symm_aussen.off'
+    if file_path.endswith('.fe'):
+        vertices, faces, _ = parse_fe(file_path)
+    else:
+        vertices, faces = parse_off(file_path)
+
+    for name, value in analyze(vertices, faces).items():
+        print(f"{name}: {value:.6g}")
@@ -0,0 +1,255 @@
+import os
+import time
+
+import numpy as np
+
+from kollision import morton_codes
+from netzstrom import attach_shared_memory, create_shared_memory, release_shared_memory
+
+
+def partition_vertices(vertices, num_parts):
+    """
+    Teilt die Vertices in num_parts räumlich zusammenhängende, gleich große Gebiete.
+
+    Die Vertices werden nach ihrem Morton-Code sortiert und in Abschnitte zerlegt.
+    Rückgabe: Gebietsnummer je Vertex (N,).
+    """
+    order = np.argsort(morton_codes(np.asarray(vertices, dtype=float)), kind='stable')
+    owner = np.empty(len(vertices), dtype=int)
+    owner[order] = np.arange(len(vertices)) * num_parts // len(vertices)
+    return owner
+
+
+def build_patches(faces, owner, num_parts):
+    """
+    Lokale Netze der Gebiete mit Halo.
+
+    Ein Gebiet enthält alle Dreiecke mit mindestens einem eigenen Vertex, damit der
+    Flächengradient jedes eigenen Vertex vollständig lokal berechnet werden kann.
+    Die übrigen Vertices dieser Dreiecke bilden den Halo, der in jeder Iteration
+    aus dem gemeinsamen Speicher gelesen wird.
+    Rückgabe: Liste von Dictionaries mit 'vertices' (globale Indizes, eigene zuerst),
+    'faces' (lokale Indizes) und 'num_owned'.
+    """
+    return [build_patch(faces, owner, part) for part in range(num_parts)]
+
+
+def build_patch(faces, owner, part):
+    """Lokales Netz des Gebiets part mit Halo, siehe build_patches."""
+    patch_faces = faces[(owner[faces] == part).any(axis=1)]
+    used = np.unique(patch_faces)
+    own = used[owner[used] == part]
+    halo = used[owner[used] != part]
+    local_vertices = np.concatenate((own, halo))
+    local = np.empty(used.max() + 1 if len(used) else 0, dtype=int)
+    local[local_vertices] = np.arange(len(local_vertices))
+    return {'vertices': local_vertices, 'faces': local[patch_faces], 'num_owned': len(own)}
+
+
+def _mesh_views(buffer, num_vertices, num_faces):
+    """Faces (F, 3), Gebietsnummern (N,) und feste Vertices (N,) im gemeinsamen Netzblock."""
+    faces = np.ndarray((num_faces, 3), dtype=np.int64, buffer=buffer)
+    owner = np.ndarray((num_vertices,), dtype=np.int64, buffer=buffer, offset=faces.nbytes)
+    fixed = np.ndarray((num_vertices,), dtype=bool, buffer=buffer, offset=faces.nbytes + owner.nbytes)
+    return faces, owner, fixed
+
+
+def _relax_patch(rank, names, num_vertices, num_faces, num_parts, barrier, max_steps, tol, omega, momentum):
+    """
+    Jacobi-Relaxation eines Gebiets, läuft in einem eigenen Prozess.
+
+    Faces, Gebietsnummern und feste Vertices liest das Gebiet aus dem gemeinsamen
+    Netzblock und baut daraus sein lokales Netz; übergeben werden nur die Namen
+    der Blöcke, keine Arrays.
+
+    Die Lagen liegen doppelt im gemeinsamen Speicher: gelesen wird Puffer k,
+    geschrieben nur die eigenen Vertices in Puffer 1 - k. Nach der Barriere sehen
+    alle Gebiete die neuen Halo-Lagen, ohne dass Daten verschickt werden. Die
+    größte Verschiebung jedes Gebiets steht ebenfalls doppelt gepuffert im
+    gemeinsamen Speicher, sodass alle Prozesse mit einer Barriere je Schritt
+    gleichzeitig über den Abbruch entscheiden. Gebiet 0 hinterlegt am Ende die
+    Zahl der Schritte; bricht die Barriere (anderer Prozess abgestürzt oder
+    Zeitüberschreitung), endet das Gebiet ohne diesen Eintrag.
+    """
+    from threading import BrokenBarrierError
+
+    blocks = [attach_shared_memory(name) for name in names]
+    buffers = np.ndarray((2, num_vertices, 3), dtype=np.float64, buffer=blocks[0].buf)
+    status = np.ndarray((2 * num_parts + 1,), dtype=np.float64, buffer=blocks[1].buf)
+    changes = status[:-1].reshape(2, num_parts)
+    mesh_faces, owner, fixed = _mesh_views(blocks[2].buf, num_vertices, num_faces)
+    patch = build_patch(mesh_faces, owner, rank)
+    local_vertices, faces, num_owned = patch['vertices'], patch['faces'], patch['num_owned']
+    owned = local_vertices[:num_owned]
+    moving = ~fixed[owned]
+    del mesh_faces, owner, fixed
+
+    # Die Kante gegenüber Ecke k verbindet die beiden anderen Ecken
+    i = np.roll(faces, -1, axis=1).ravel()
+    j = np.roll(faces, -2, axis=1).ravel()
+    edges_i, edges_j = np.concatenate((i, j)), np.concatenate((j, i))
+    mine = edges_i < num_owned
+    edges_i, edges_j = edges_i[mine], edges_j[mine]
+    previous = buffers[0][owned]
+
+    try:
+        steps = 0
+        for steps in range(1, max_steps + 1):
+            k = (steps - 1) % 2
+            x = buffers[k][local_vertices]
+            p = x[faces]
+            following, opposite = np.roll(p, -1, axis=1) - p, np.roll(p, -2, axis=1) - p
+            cross = np.linalg.norm(np.cross(following, opposite), axis=2)
+            cot = np.einsum('tkd,tkd->tk', following, opposite) / np.where(cross > 0, cross, 1.0)
+            weight = np.tile(0.5 * cot.ravel(), 2)[mine]
+
+            # dA/dx_i = sum_j w_ij (x_i - x_j), Schrittweite aus der Diagonalen von |L|
+            difference = weight[:, None] * (x[edges_i] - x[edges_j])
+            gradient = np.column_stack([np.bincount(edges_i, weights=difference[:, d], minlength=num_owned)
+                                        for d in range(3)])
+            diagonal = np.bincount(edges_i, weights=np.abs(weight), minlength=num_owned)
+            step = np.zeros((num_owned, 3))
+            step[moving] = -omega * gradient[moving] / np.maximum(diagonal[moving], 1e-300)[:, None]
+            # Impuls aus der letzten Verschiebung der eigenen Vertices, feste bleiben stehen
+            buffers[1 - k][owned] = x[:num_owned] + step + momentum * (x[:num_owned] - previous)
+            previous = x[:num_owned]
+            changes[k, rank] = np.abs(step).max() if num_owned else 0.0
+
+            barrier.wait()
+            if changes[k].max() < tol:
+                break
+
+        if rank == 0:
+            status[-1] = steps
+    except BrokenBarrierError:
+        pass
+    finally:
+        del buffers, status, changes
+        for block in blocks:
+            block.close()
+
+
+class DomainDecompositionSolver:
+    """
+    Flächenminimierung mit festem Rand, auf mehrere Prozesse verteilt.
+
+    Das Netz wird in räumlich zusammenhängende Gebiete mit Halo zerlegt
+    (partition_vertices, build_patches). Jeder Prozess verschiebt seine eigenen
+    freien Vertices mit einem gedämpften Jacobi-Schritt x_i -= omega * dA/dx_i / D_i
+    (Kotangens-Gewichte nach Pinkall-Polthier, D_i die Summe ihrer Beträge); für
+    positive Gewichte und omega = 1 ist das der gewichtete Mittelpunkt der Nachbarn.
+    Dazu kommt ein Impuls momentum * (x_i - x_i vorher) (Heavy-Ball). Da jeder
+    Schritt nur die Lagen des vorigen liest, ist das Ergebnis unabhängig von der
+    Zahl der Prozesse. Vertices, Faces, Gebietsnummern und Verschiebungen liegen
+    in multiprocessing.shared_memory, die Halos werden an einer Barriere je
+    Schritt abgeglichen; kommuniziert werden nur diese Barriere und P Zahlen.
+
+    Ohne Impuls wächst die Zahl der Schritte wie beim Jacobi-Verfahren linear mit
+    der Zahl der Vertices, mit Impuls etwa mit ihrer Wurzel. Ein Verfahren mit
+    netzunabhängiger Schrittzahl bräuchte einen groben globalen Löser;
+    VolumeConstrainedSurface braucht viel weniger Schritte, löst aber global und
+    in einem Prozess.
+    """
+
+    def __init__(self, vertices, faces, fixed, processes=None):
+        self.vertices = np.array(vertices, dtype=float)
+        self.faces = np.asarray(faces, dtype=int)
+        self.fixed = np.asarray(fixed, dtype=bool)
+        self.processes = processes or os.cpu_count()
+        self.owner = partition_vertices(self.vertices, self.processes)
+        self.patches = build_patches(self.faces, self.owner, self.processes)
+
+    def halo_fraction(self):
+        """Anteil der Halo-Vertices an allen lokal gehaltenen Vertices."""
+        local = sum(len(patch['vertices']) for patch in self.patches)
+        return 1.0 - len(self.vertices) / local if local else 0.0
+
+    def solve(self, max_steps=5000, tol=1e-6, omega=0.9, momentum=0.9, barrier_timeout=60.0):
+        """
+        Relaxiert, bis die größte Verschiebung eines Schritts kleiner als tol mal die Diagonale ist.
+
+        Gemessen wird der Jacobi-Anteil ohne Impuls. momentum=0 ergibt das reine
+        Jacobi-Verfahren; auf sehr groben Netzen kann ein großer Impuls aufschwingen.
+        barrier_timeout (Sekunden) begrenzt das Warten auf die übrigen Gebiete; stürzt
+        ein Prozess ab oder hängt er, werden die anderen beendet und es folgt ein RuntimeError.
+        Rückgabe: (konvergiert, Anzahl Schritte, größte Verschiebung im letzten Schritt)
+        """
+        import multiprocessing
+        from multiprocessing.connection import wait
+
+        num_vertices, num_faces, num_parts = len(self.vertices), len(self.faces), self.processes
+        diagonal = np.linalg.norm(np.ptp(self.vertices, axis=0))
+        blocks = [create_shared_memory(2 * num_vertices * 3 * 8), create_shared_memory((2 * num_parts + 1) * 8),
+                  create_shared_memory(max(num_faces * 3 * 8 + num_vertices * 9, 1))]
+        try:
+            buffers = np.ndarray((2, num_vertices, 3), dtype=np.float64, buffer=blocks[0].buf)
+            status = np.ndarray((2 * num_parts + 1,), dtype=np.float64, buffer=blocks[1].buf)
+            buffers[:] = self.vertices
+            status[:] = np.inf
+            mesh = _mesh_views(blocks[2].buf, num_vertices, num_faces)
+            for view, values in zip(mesh, (self.faces, self.owner, self.fixed)):
+                view[:] = values
+            del mesh, view
+            names = [block.name for block in blocks]
+
+            if num_parts == 1:
+                # Ohne Zerlegung im eigenen Prozess rechnen
+                import threading
+                barrier = threading.Barrier(1)
+            else:
+                context = multiprocessing.get_context()
+                barrier = context.Barrier(num_parts, timeout=barrier_timeout)
+            arguments = [(rank, names, num_vertices, num_faces, num_parts, barrier, max_steps, tol * diagonal,
+                          omega, momentum) for rank in range(num_parts)]
+
+            if num_parts == 1:
+                _relax_patch(*arguments[0])
+            else:
+                workers = [context.Process(target=_relax_patch, args=args) for args in arguments]
+                for worker in workers:
+                    worker.start()
+                running = list(workers)
+                while running:
+                    # Ist ein Gebiet fertig, folgen die übrigen spätestens nach barrier_timeout
+                    ready = wait([worker.sentinel for worker in running],
+                                 None if len(running) == len(workers) else barrier_timeout)
+                    exitcodes = [worker.exitcode for worker in running]
+                    if not ready or any(code not in (None, 0) for code in exitcodes):
+                        # Beenden statt barrier.abort(): ein in barrier.wait abgestürzter
+                        # Prozess kann die Sperre der Barriere noch halten
+                        for worker in running:
+                            worker.terminate()
+                        for worker in running:
+                            worker.join()
+                        break
+                    running = [worker for worker, code in zip(running, exitcodes) if code is None]
+                if any(worker.exitcode != 0 for worker in workers) or not np.isfinite(status[-1]):
+                    raise RuntimeError("Ein Gebietsprozess ist abgebrochen.")
+
+            steps = int(status[-1])
+            last = (steps - 1) % 2
+            self.vertices = buffers[1 - last].copy()
+            change = status[:-1].reshape(2, num_parts)[last].max()
+            del buffers, status
+        finally:
+            for block in blocks:
+                release_shared_memory(block)
+        return bool(change < tol * diagonal), steps, float(change / diagonal)
+
+
+# Beispielaufruf: gewölbtes Gitter mit festem Rand auf allen Kernen zur Minimalfläche relaxieren
+if __name__ == "__main__":
+    import sys
+    from flaechenanalyse import grid_mesh, total_area
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 101
+    X, Y = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n))
+    vertices, faces = grid_mesh(X, Y, 0.3 * np.sin(np.pi * X) * np.cos(np.pi * Y / 2))
+    fixed = (np.abs(vertices[:, 0]) == 1) | (np.abs(vertices[:, 1]) == 1)
+
+    solver = DomainDecompositionSolver(vertices, faces, fixed)
+    start = time.perf_counter()
+    converged, steps, change = solver.solve()
+    print(f"{len(faces)} Faces auf {solver.processes} Prozessen (Halo {solver.halo_fraction():.1%}): "
+          f"konvergiert {converged} nach {steps} Schritten in {time.perf_counter() - start:.2f} s, "
+          f"Fläche {total_area(vertices, faces):.5f} -> {total_area(solver.vertices, faces):.5f}")
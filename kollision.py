@@ -0,0 +1,292 @@
+import numpy as np
+
+# Abfragen je Durchlauf durch den Baum, begrenzt den Speicher der Kandidatenpaare
+QUERY_CHUNK = 4096
+
+
+def _spread_bits(values):
+    """Verteilt die unteren 10 Bit jedes Werts auf jede dritte Bitposition (für Morton-Codes)."""
+    x = values.astype(np.uint64) & np.uint64(0x3FF)
+    x = (x | (x << np.uint64(16))) & np.uint64(0x30000FF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x300F00F)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x30C30C3)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x9249249)
+    return x
+
+
+def morton_codes(points):
+    """30-Bit-Morton-Codes der Punkte (N, 3) im umschließenden Quader."""
+    lower = points.min(axis=0)
+    extent = np.maximum(np.ptp(points, axis=0), 1e-300)
+    cells = np.clip(((points - lower) / extent * 1023).astype(np.int64), 0, 1023)
+    return (_spread_bits(cells[:, 0]) << np.uint64(2)) | (_spread_bits(cells[:, 1]) << np.uint64(1)) \
+        | _spread_bits(cells[:, 2])
+
+
+def closest_points_on_triangles(points, a, b, c):
+    """
+    Nächstgelegene Punkte auf den Dreiecken (a, b, c) zu points, alle (K, 3).
+
+    Fallunterscheidung nach den Voronoi-Regionen von Ecken, Kanten und Innerem
+    (Ericson, Real-Time Collision Detection), für alle Paare gleichzeitig.
+    """
+    def dot(u, v):
+        return np.einsum('ij,ij->i', u, v)
+
+    ab, ac = b - a, c - a
+    ap, bp, cp = points - a, points - b, points - c
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denominator = va + vb + vc
+        result = a + ab * (vb / denominator)[:, None] + ac * (vc / denominator)[:, None]
+        # Regionen in umgekehrter Rangfolge, damit die vorrangigen zuletzt überschreiben
+        regions = [
+            ((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0),
+             lambda: b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))[:, None]),
+            ((vb <= 0) & (d2 >= 0) & (d6 <= 0), lambda: a + ac * (d2 / (d2 - d6))[:, None]),
+            ((d6 >= 0) & (d5 <= d6), lambda: c),
+            ((vc <= 0) & (d1 >= 0) & (d3 <= 0), lambda: a + ab * (d1 / (d1 - d3))[:, None]),
+            ((d3 >= 0) & (d4 <= d3), lambda: b),
+            ((d1 <= 0) & (d2 <= 0), lambda: a),
+        ]
+        for mask, point in regions:
+            if mask.any():
+                result = np.where(mask[:, None], point(), result)
+    return result
+
+
+def segments_hit_triangles(start, end, a, b, c, eps=1e-12):
+    """Schneidet die Strecken start-end die Dreiecke (a, b, c)? Möller-Trumbore für alle Paare, (K,)."""
+    direction = end - start
+    e1, e2 = b - a, c - a
+    h = np.cross(direction, e2)
+    det = np.einsum('ij,ij->i', e1, h)
+    valid = np.abs(det) > eps * np.linalg.norm(e1, axis=1) * np.linalg.norm(e2, axis=1) \
+        * np.linalg.norm(direction, axis=1)
+    inverse = 1.0 / np.where(valid, det, 1.0)
+    s = start - a
+    u = inverse * np.einsum('ij,ij->i', s, h)
+    q = np.cross(s, e1)
+    v = inverse * np.einsum('ij,ij->i', direction, q)
+    t = inverse * np.einsum('ij,ij->i', e2, q)
+    return valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= 1)
+
+
+def triangles_intersect(p, q):
+    """
+    Schneiden sich die Dreiecke p[i] und q[i] (je (K, 3, 3))?
+
+    Zwei Dreiecke schneiden sich, wenn eine Kante des einen das andere durchstößt.
+    Koplanare Überlappungen werden nicht erkannt.
+    """
+    hit = np.zeros(len(p), dtype=bool)
+    for first, second in ((p, q), (q, p)):
+        for k in range(3):
+            hit |= segments_hit_triangles(first[:, k], first[:, (k + 1) % 3], second[:, 0], second[:, 1], second[:, 2])
+    return hit
+
+
+class TriangleBVH:
+    """
+    Hüllkörperhierarchie (achsparallele Quader) über einem Dreiecksnetz.
+
+    Die Dreiecke werden nach dem Morton-Code ihrer Schwerpunkte sortiert und zu
+    Blättern mit leaf_size Dreiecken zusammengefasst; darüber entsteht ein
+    Binärbaum, dessen Ebenen als Arrays vorliegen (Kinder von Knoten i sind 2i und
+    2i + 1 der Ebene darunter). Abfragen laufen für alle Anfragen gleichzeitig
+    ebenenweise durch den Baum, ohne Python-Schleife über einzelne Knoten.
+    """
+
+    def __init__(self, vertices, faces, leaf_size=2):
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.faces = np.asarray(faces)
+        self.leaf_size = leaf_size
+
+        triangles = self.vertices[self.faces]
+        self.order = np.argsort(morton_codes(triangles.mean(axis=1)), kind='stable')
+        self.triangles = triangles[self.order]
+
+        starts = np.arange(0, len(self.faces), leaf_size)
+        lower = [np.minimum.reduceat(self.triangles.min(axis=1), starts)]
+        upper = [np.maximum.reduceat(self.triangles.max(axis=1), starts)]
+        while len(lower[-1]) > 1:
+            pairs = np.arange(0, len(lower[-1]), 2)
+            lower.append(np.minimum.reduceat(lower[-1], pairs))
+            upper.append(np.maximum.reduceat(upper[-1], pairs))
+        # levels[0] ist die Wurzel, levels[-1] die Blattebene
+        self.lower, self.upper = lower[::-1], upper[::-1]
+
+    @classmethod
+    def from_off(cls, file_path, leaf_size=2):
+        from abwicklung_evolver import parse_off
+
+        return cls(*parse_off(file_path), leaf_size=leaf_size)
+
+    def _children(self, level, nodes):
+        """Kinder der Knoten auf Ebene level + 1 und die Position des Elternpaars je Kind."""
+        children = np.stack((2 * nodes, 2 * nodes + 1), axis=1).ravel()
+        parents = np.repeat(np.arange(len(nodes)), 2)
+        keep = children < len(self.lower[level + 1])
+        return children[keep], parents[keep]
+
+    def _leaf_triangles(self, leaves):
+        """Sortierte Dreiecksindizes der Blätter und die Position des Blatts je Dreieck."""
+        triangles = (leaves[:, None] * self.leaf_size + np.arange(self.leaf_size)).ravel()
+        owners = np.repeat(np.arange(len(leaves)), self.leaf_size)
+        keep = triangles < len(self.triangles)
+        return triangles[keep], owners[keep]
+
+    def _box_distance(self, level, nodes, points):
+        gap = np.maximum(self.lower[level][nodes] - points, 0.0) + np.maximum(points - self.upper[level][nodes], 0.0)
+        return np.linalg.norm(gap, axis=1)
+
+    def closest_points(self, points, max_distance=np.inf):
+        """
+        Nächster Punkt auf der Fläche zu jedem Abfragepunkt.
+
+        Eine obere Schranke je Punkt liefert das Dreieck mit dem nächsten Schwerpunkt
+        (KD-Baum), danach werden nur Knoten besucht, deren Quader näher liegt.
+        Rückgabe: Abstände (Q,), Dreiecksindizes in faces (Q,) und die Punkte (Q, 3);
+        jenseits von max_distance ist der Abstand inf und der Index -1.
+        """
+        from raumindex import SpatialIndex
+
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        distances = np.full(len(points), np.inf)
+        indices = np.full(len(points), -1)
+        closest = np.full((len(points), 3), np.nan)
+
+        _, nearest = SpatialIndex(self.triangles.mean(axis=1)).nearest(points)
+        t = self.triangles[nearest]
+        bound = np.linalg.norm(closest_points_on_triangles(points, t[:, 0], t[:, 1], t[:, 2]) - points, axis=1)
+        bound = np.minimum(bound * (1 + 1e-12), max_distance)
+
+        for start in range(0, len(points), QUERY_CHUNK):
+            chunk = np.arange(start, min(start + QUERY_CHUNK, len(points)))
+            queries, nodes = chunk, np.zeros(len(chunk), dtype=int)
+            for level in range(len(self.lower)):
+                if level > 0:
+                    nodes, parents = self._children(level - 1, nodes)
+                    queries = queries[parents]
+                keep = self._box_distance(level, nodes, points[queries]) <= bound[queries]
+                queries, nodes = queries[keep], nodes[keep]
+
+            triangles, owners = self._leaf_triangles(nodes)
+            queries = queries[owners]
+            t = self.triangles[triangles]
+            candidates = closest_points_on_triangles(points[queries], t[:, 0], t[:, 1], t[:, 2])
+            candidate_distances = np.linalg.norm(candidates - points[queries], axis=1)
+
+            # Je Abfrage das nächste Kandidatendreieck
+            order = np.lexsort((candidate_distances, queries))
+            first = order[np.r_[True, queries[order][1:] != queries[order][:-1]]] if len(order) else order
+            hit = first[candidate_distances[first] <= bound[queries[first]]]
+            distances[queries[hit]] = candidate_distances[hit]
+            indices[queries[hit]] = self.order[triangles[hit]]
+            closest[queries[hit]] = candidates[hit]
+        return distances, indices, closest
+
+    def distance(self, points):
+        """Abstand jedes Punktes zur Fläche."""
+        return self.closest_points(points)[0]
+
+    def _overlapping_leaves(self, other, margin=0.0):
+        """
+        Paare von Blättern beider Bäume, deren Quader sich (um margin erweitert) überlappen.
+
+        Ist other derselbe Baum, wird jedes Paar nur einmal geliefert (a <= b).
+        """
+        a, b = np.zeros(1, dtype=int), np.zeros(1, dtype=int)
+        level_a, level_b = 0, 0
+        while True:
+            overlap = np.all((self.lower[level_a][a] - margin <= other.upper[level_b][b])
+                             & (other.lower[level_b][b] <= self.upper[level_a][a] + margin), axis=1)
+            if other is self and level_a == level_b:
+                # Symmetrische Paare nur einmal weiterverfolgen
+                overlap &= a <= b
+            a, b = a[overlap], b[overlap]
+            remaining_a, remaining_b = len(self.lower) - 1 - level_a, len(other.lower) - 1 - level_b
+            if remaining_a == 0 and remaining_b == 0:
+                return a, b
+            # Den Baum mit mehr verbleibenden Ebenen (größeren Quadern) zuerst verfeinern
+            if remaining_a >= remaining_b:
+                a, parents = self._children(level_a, a)
+                b = b[parents]
+                level_a += 1
+            else:
+                b, parents = other._children(level_b, b)
+                a = a[parents]
+                level_b += 1
+
+    def intersecting_pairs(self, other=None):
+        """
+        Sich schneidende Dreieckspaare (P, 2) als Indizes in faces beider Netze.
+
+        Ohne other werden Selbstdurchdringungen gesucht; Paare mit gemeinsamem
+        Vertex (Nachbarn im Netz) zählen dabei nicht.
+        """
+        tree = self if other is None else other
+        a, b = self._overlapping_leaves(tree)
+        triangles_a, owners = self._leaf_triangles(a)
+        b = b[owners]
+        triangles_b, owners = tree._leaf_triangles(b)
+        triangles_a = triangles_a[owners]
+
+        # Quadertest je Dreieckspaar, bevor der genaue Schnitttest läuft
+        p, q = self.triangles[triangles_a], tree.triangles[triangles_b]
+        keep = np.all((p.min(axis=1) <= q.max(axis=1)) & (q.min(axis=1) <= p.max(axis=1)), axis=1)
+        faces_a, faces_b = self.order[triangles_a[keep]], tree.order[triangles_b[keep]]
+        if other is None:
+            shared = (self.faces[faces_a][:, :, None] == self.faces[faces_b][:, None, :]).any(axis=(1, 2))
+            # Innerhalb eines Blatts kommt jedes Paar in beiden Reihenfolgen vor
+            same_leaf = triangles_a[keep] // self.leaf_size == triangles_b[keep] // self.leaf_size
+            keep_pairs = ~shared & (~same_leaf | (faces_a < faces_b))
+            faces_a, faces_b = faces_a[keep_pairs], faces_b[keep_pairs]
+        hit = triangles_intersect(self.vertices[self.faces[faces_a]], tree.vertices[tree.faces[faces_b]])
+        return np.column_stack((faces_a[hit], faces_b[hit]))
+
+
+def clearance(inner_vertices, inner_faces, outer_vertices, outer_faces):
+    """
+    Abstand zwischen zwei Flächen, z.B. Innen- und Außenhaut.
+
+    Es werden die Abstände der Vertices jeder Fläche zur jeweils anderen Fläche
+    bestimmt; bei feinen Netzen ist das Minimum davon der Mindestabstand (Kante-
+    Kante-Nähe zwischen zwei Vertices wird nicht gesondert erfasst). Schneiden sich
+    die Flächen, ist der Mindestabstand 0.
+    Rückgabe: Dictionary mit 'min', den Abständen je Vertex 'inner' und 'outer'
+    und der Anzahl sich schneidender Dreieckspaare 'intersections'.
+    """
+    inner = TriangleBVH(inner_vertices, inner_faces)
+    outer = TriangleBVH(outer_vertices, outer_faces)
+    inner_distances = outer.distance(inner_vertices)
+    outer_distances = inner.distance(outer_vertices)
+    intersections = len(inner.intersecting_pairs(outer))
+    minimum = 0.0 if intersections else min(inner_distances.min(), outer_distances.min())
+    return {'min': minimum, 'inner': inner_distances, 'outer': outer_distances, 'intersections': intersections}
+
+
+# Beispielaufruf: Abstand zwischen Innen- und Außenhaut und Selbstdurchdringungen prüfen
+if __name__ == "__main__":
+    import sys
+    import time
+    from abwicklung_evolver import parse_off
+
+    if len(sys.argv) == 2:
+        sys.exit("Aufruf: python kollision.py [innen.off außen.off]")
+    inner_path = sys.argv[1] if len(sys.argv) > 2 else 'symm_innen.off'
+    outer_path = sys.argv[2] if len(sys.argv) > 2 else 'symm_aussen.off'
+    inner_vertices, inner_faces = parse_off(inner_path)
+    outer_vertices, outer_faces = parse_off(outer_path)
+
+    start = time.perf_counter()
+    result = clearance(inner_vertices, inner_faces, outer_vertices, outer_faces)
+    print(f"Mindestabstand {result['min']:.6g}, {result['intersections']} Schnittpaare "
+          f"({time.perf_counter() - start:.2f} s)")
+    for name, vertices, faces in (('innen', inner_vertices, inner_faces), ('außen', outer_vertices, outer_faces)):
+        pairs = TriangleBVH(vertices, faces).intersecting_pairs()
+        print(f"Selbstdurchdringungen {name}: {len(pairs)}")
@@ -0,0 +1,190 @@
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from scipy.sparse.linalg import splu
+
+from netz import Mesh
+
+
+class ForceDensitySolver:
+    """
+    Formfindung für Seilnetze und Membranen mit der Kraftdichtemethode.
+
+    Jede Kante trägt eine Kraftdichte q = S / L. Das Gleichgewicht der freien
+    Knoten ist dann linear: D_ff x_f = p_f - D_fx x_x mit D = C^T Q C.
+    Die Faktorisierung von D_ff wird zwischengespeichert und bei Änderungen
+    der Kraftdichten so weit wie möglich wiederverwendet.
+    """
+
+    def __init__(self, vertices, edges, fixed, q=1.0, loads=None, max_update_rank=256):
+        self.vertices = np.array(vertices, dtype=float)
+        self.edges = np.asarray(edges, dtype=int)
+        self.fixed = np.asarray(fixed, dtype=bool)
+        self.free = ~self.fixed
+        if not self.fixed.any():
+            raise ValueError("Mindestens ein Knoten muss fest sein.")
+
+        num_edges = len(self.edges)
+        self.q = np.array(np.broadcast_to(q, (num_edges,)), dtype=float)
+        self.loads = np.zeros_like(self.vertices) if loads is None else np.array(loads, dtype=float)
+        self.cable_ids = np.full(num_edges, -1)  # -1: Membrankante ohne Seilzuordnung
+        self.max_update_rank = max_update_rank
+
+        # Verzweigungsmatrix C (Kanten x Knoten), aufgeteilt in freie und feste Spalten
+        rows = np.repeat(np.arange(num_edges), 2)
+        cols = self.edges.ravel()
+        values = np.tile([1.0, -1.0], num_edges)
+        C = csr_matrix((values, (rows, cols)), shape=(num_edges, len(self.vertices)))
+        self.C_free = C[:, self.free].tocsc()
+        self.C_fixed = C[:, self.fixed].tocsc()
+
+        # Zwischengespeicherte Faktorisierung und die Kraftdichten, zu denen sie gehört
+        self._lu = None
+        self._q_factorized = None
+
+    @classmethod
+    def from_mesh(cls, vertices, faces, fixed, q=1.0, **kwargs):
+        """Erzeugt den Löser aus einem Dreiecksnetz, jede Netzkante wird zum Stab."""
+        return cls(vertices, Mesh(vertices, faces).edges, fixed, q=q, **kwargs)
+
+    @classmethod
+    def from_surface_input(cls, surface_input, q=1.0, **kwargs):
+        """Erzeugt den Löser aus dem Startnetz eines SurfaceEvolverInput."""
+        vertices, faces, fixed = surface_input.build_mesh()
+        return cls.from_mesh(vertices, faces, fixed, q=q, **kwargs)
+
+    @classmethod
+    def from_curves(cls, curves, q=1.0, tol=1e-9, **kwargs):
+        """
+        Erzeugt ein Seilnetz aus Polylinien, z.B. den Kantenkurven aus tetraeder.py.
+
+        Gemeinsame Endpunkte werden verschweißt, jede Kurve wird zu einem Seil
+        und ihre Endpunkte werden als Auflager festgehalten.
+        """
+        points = np.vstack(curves)
+        keys = np.round(points / tol).astype(np.int64)
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        vertices = points[first]
+
+        offsets = np.cumsum([0] + [len(curve) for curve in curves])
+        edge_list, cable_list = [], []
+        fixed = np.zeros(len(vertices), dtype=bool)
+        for cable_id, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+            ids = inverse[start:end]
+            fixed[ids[[0, -1]]] = True
+            edge_list.append(np.column_stack((ids[:-1], ids[1:])))
+            cable_list.append(np.full(len(ids) - 1, cable_id))
+        edges = np.vstack(edge_list)
+        cable_ids = np.concatenate(cable_list)
+
+        # Kanten der Länge null (doppelte Kurvenpunkte) verwerfen
+        keep = edges[:, 0] != edges[:, 1]
+        solver = cls(vertices, edges[keep], fixed, q=q, **kwargs)
+        solver.cable_ids = cable_ids[keep]
+        return solver
+
+    def set_force_density(self, q, edge_ids=None):
+        """Setzt die Kraftdichte für alle oder ausgewählte Kanten."""
+        if edge_ids is None:
+            self.q[:] = q
+        else:
+            self.q[edge_ids] = q
+
+    def set_cable_force_density(self, cable_id, q):
+        """Setzt die Kraftdichte aller Kanten eines Seils."""
+        self.q[self.cable_ids == cable_id] = q
+
+    def factorize(self):
+        """Faktorisiert D_ff für die aktuellen Kraftdichten."""
+        D_ff = (self.C_free.T @ diags(self.q) @ self.C_free).tocsc()
+        self._lu = splu(D_ff, permc_spec='MMD_AT_PLUS_A')
+        self._q_factorized = self.q.copy()
+
+    def _solve_free(self, rhs):
+        """Löst D_ff x = rhs und nutzt dabei die vorhandene Faktorisierung wieder."""
+        if self._lu is None:
+            self.factorize()
+            return self._lu.solve(rhs)
+
+        delta = self.q - self._q_factorized
+        changed = np.flatnonzero(delta)
+        if len(changed) == 0:
+            return self._lu.solve(rhs)
+
+        # Gleichmäßig skalierte Kraftdichten: D_ff skaliert mit demselben Faktor
+        scale = self.q[changed[0]] / self._q_factorized[changed[0]] if self._q_factorized[changed[0]] else 0.0
+        if scale > 0 and np.allclose(self.q, scale * self._q_factorized, rtol=1e-12, atol=0.0):
+            return self._lu.solve(rhs) / scale
+
+        # Wenige geänderte Kanten: Niedrigrang-Korrektur nach Sherman-Morrison-Woodbury
+        if len(changed) <= self.max_update_rank:
+            U = self.C_free[changed].T.toarray()
+            y = self._lu.solve(rhs)
+            Z = self._lu.solve(U)
+            capacitance = np.diag(1.0 / delta[changed]) + U.T @ Z
+            try:
+                return y - Z @ np.linalg.solve(capacitance, U.T @ y)
+            except np.linalg.LinAlgError:
+                pass
+
+        self.factorize()
+        return self._lu.solve(rhs)
+
+    def solve(self, loads=None):
+        """
+        Berechnet die Gleichgewichtslage für die aktuellen Kraftdichten.
+
+        Rückgabe: Koordinaten aller Knoten (N, 3), die festen Knoten bleiben unverändert.
+        """
+        if loads is not None:
+            self.loads = np.array(loads, dtype=float)
+
+        x_fixed = self.vertices[self.fixed]
+        D_fx = self.C_free.T @ diags(self.q) @ self.C_fixed
+        rhs = self.loads[self.free] - D_fx @ x_fixed
+
+        self.vertices[self.free] = self._solve_free(rhs)
+        return self.vertices
+
+    def adjoint_gradient(self, gradient):
+        """
+        Überträgt die Ableitung dJ/dx (N, 3) eines Zielwerts auf die festen Knoten.
+
+        Die freien Knoten hängen über D_ff x_f = p_f - D_fx x_x von den festen ab.
+        Mit der adjungierten Lösung D_ff λ = dJ/dx_f (D ist symmetrisch) gilt
+        dJ/dx_x = ∂J/∂x_x - D_xf λ; dafür genügt ein Lösen mit der vorhandenen
+        Faktorisierung, unabhängig von der Zahl der Entwurfsparameter.
+        Rückgabe: Gesamtableitung nach den festen Knoten (K, 3).
+        """
+        gradient = np.asarray(gradient, dtype=float)
+        adjoint = self._solve_free(gradient[self.free])
+        D_xf = self.C_fixed.T @ diags(self.q) @ self.C_free
+        return gradient[self.fixed] - D_xf @ adjoint
+
+    def edge_lengths(self):
+        """Gibt die aktuellen Kantenlängen zurück."""
+        vectors = self.vertices[self.edges[:, 1]] - self.vertices[self.edges[:, 0]]
+        return np.linalg.norm(vectors, axis=1)
+
+    def edge_forces(self):
+        """Gibt die Stabkräfte S = q * L zurück."""
+        return self.q * self.edge_lengths()
+
+
+# Beispielaufruf: Formfindung der Membran für eine Seitenfläche
+if __name__ == "__main__":
+    from rand import Rand
+    from SrfaceEvolver import SurfaceEvolverInput
+    from minimal_surface import read_file
+
+    points, file_path = read_file()
+    surface_input = SurfaceEvolverInput(Rand(points, interpolation_type='linear'))
+
+    solver = ForceDensitySolver.from_surface_input(surface_input, q=1.0)
+    vertices = solver.solve()
+    print(f"Formfindung für {file_path} abgeschlossen: {len(vertices)} Knoten, {len(solver.edges)} Kanten.")
+
+    # Vorspannung eines Randbereichs erhöhen, die Faktorisierung wird dabei wiederverwendet
+    solver.set_force_density(2.0, edge_ids=np.arange(10))
+    vertices = solver.solve()
+    print(f"Maximale Stabkraft nach Änderung: {solver.edge_forces().max():.4f}")
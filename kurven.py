@@ -0,0 +1,326 @@
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+# Endungen der Cache-Dateien neben der Textdatei
+CACHE_ARRAY_SUFFIX = '.kurven.npy'
+CACHE_META_SUFFIX = '.kurven.json'
+CACHE_VERSION = 1
+
+# Eine oder mehrere Leerzeilen trennen die Kurven
+_CURVE_SEPARATOR = re.compile(rb'\r?\n(?:[ \t]*\r?\n)+')
+
+
+def parse_curves(data):
+    """
+    Liest Kurven im Textformat 'x, y, z' (eine Zeile je Punkt, Leerzeile zwischen den Kurven).
+
+    data: Inhalt der Datei als bytes oder str. Alle Zahlen werden in einem Schritt
+    von NumPy gelesen statt zeilenweise mit map(float, ...).
+    Rückgabe: Liste von (K, D)-Arrays, D ist die Spaltenzahl der ersten Zeile.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    blocks = [block.strip() for block in _CURVE_SEPARATOR.split(data.strip())]
+    blocks = [block for block in blocks if block]
+    if not blocks:
+        return []
+
+    dimension = blocks[0].split(b'\n', 1)[0].count(b',') + 1
+    counts = np.array([block.count(b'\n') + 1 for block in blocks])
+    joined = b'\n'.join(blocks)
+
+    # Spaltenzahl jeder Zeile über die Kommas prüfen, ohne Schleife über die Zeilen
+    text = np.frombuffer(joined, dtype=np.uint8)
+    commas = np.cumsum(text == ord(','))
+    line_ends = np.append(np.flatnonzero(text == ord('\n')), len(text))
+    commas_per_line = np.diff(commas[line_ends - 1], prepend=0)
+    bad = np.flatnonzero(commas_per_line != dimension - 1)
+    if len(bad):
+        number = np.searchsorted(np.cumsum(counts), bad[0], side='right')
+        row = bad[0] - (np.cumsum(counts)[number - 1] if number else 0)
+        raise ValueError(f"Kurve {number + 1}, Zeile {row + 1}: {commas_per_line[bad[0]] + 1} Werte "
+                         f"statt {dimension} Koordinaten.")
+
+    values = np.array(joined.replace(b',', b' ').split(), dtype=float)
+    if values.size != counts.sum() * dimension:
+        raise ValueError(f"{values.size} Werte für {counts.sum()} Punkte mit je {dimension} Koordinaten.")
+    return np.split(values.reshape(-1, dimension), np.cumsum(counts)[:-1])
+
+
+def _file_signature(file_path):
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _file_hash(file_path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_cache(file_path, mmap):
+    """Gibt (points, offsets) aus dem Cache zurück oder None, wenn er fehlt oder veraltet ist."""
+    meta_path = file_path + CACHE_META_SUFFIX
+    array_path = file_path + CACHE_ARRAY_SUFFIX
+    try:
+        with open(meta_path, 'r') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != CACHE_VERSION:
+        return None
+
+    signature = _file_signature(file_path)
+    if signature['size'] != meta['size']:
+        return None
+    if signature['mtime_ns'] != meta['mtime_ns']:
+        # Nur der Zeitstempel hat sich geändert (z.B. nach dem Kopieren): Inhalt über den Hash prüfen
+        if _file_hash(file_path) != meta['hash']:
+            return None
+        meta.update(signature)
+        _write_meta(meta_path, meta)
+
+    try:
+        points = np.load(array_path, mmap_mode='r' if mmap else None)
+    except (OSError, ValueError):
+        return None
+    return points, np.asarray(meta['offsets'])
+
+
+def _write_meta(meta_path, meta):
+    temp_path = meta_path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(meta, file)
+    os.replace(temp_path, meta_path)
+
+
+def _write_cache(file_path, points, offsets, file_hash):
+    """Schreibt den Cache; ein nicht beschreibbares Verzeichnis wird stillschweigend übergangen."""
+    array_path = file_path + CACHE_ARRAY_SUFFIX
+    try:
+        temp_path = array_path + '.tmp.npy'
+        np.save(temp_path, points)
+        os.replace(temp_path, array_path)
+        meta = dict(_file_signature(file_path), version=CACHE_VERSION, hash=file_hash,
+                    offsets=[int(offset) for offset in offsets])
+        _write_meta(file_path + CACHE_META_SUFFIX, meta)
+    except OSError:
+        pass
+
+
+def _load(file_path, cache, mmap):
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Kurvendatei nicht gefunden: {file_path}")
+    if cache:
+        cached = _read_cache(file_path, mmap)
+        if cached is not None:
+            return cached
+
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    curves = parse_curves(data)
+    if not curves:
+        raise ValueError(f"Keine gültigen Kurvendaten gefunden: {file_path}")
+    points = np.vstack(curves)
+    offsets = np.cumsum([0] + [len(curve) for curve in curves])
+    if cache:
+        _write_cache(file_path, points, offsets, hashlib.blake2b(data, digest_size=16).hexdigest())
+    return points, offsets
+
+
+def load_curves(file_path, cache=True, mmap=True):
+    """
+    Lädt eine Kurvendatei als Liste von (K, D)-Arrays.
+
+    Das Ergebnis wird als .npy-Datei neben der Textdatei zwischengespeichert und
+    beim nächsten Aufruf (bei mmap=True speicherabgebildet, also nur lesbar) geladen.
+    Der Cache gilt, solange Größe und Änderungszeit passen; bei nur geänderter
+    Änderungszeit entscheidet der Hash des Inhalts.
+    """
+    points, offsets = _load(file_path, cache, mmap)
+    return [points[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+
+
+def load_points(file_path, cache=True, mmap=True):
+    """Lädt alle Punkte einer Kurvendatei als ein (N, D)-Array, die Kurven hintereinander."""
+    return _load(file_path, cache, mmap)[0]
+
+
+def clear_cache(file_path):
+    """Entfernt die Cache-Dateien einer Kurvendatei."""
+    for suffix in (CACHE_ARRAY_SUFFIX, CACHE_META_SUFFIX):
+        if os.path.exists(file_path + suffix):
+            os.remove(file_path + suffix)
+
+
+def save_curves(file_path, curves, closed=False):
+    """
+    Speichert Kurven im Textformat (Koordinaten je Zeile durch Komma getrennt,
+    Leerzeile zwischen den Kurven).
+
+    Jede Kurve wird mit einem einzigen %-Aufruf formatiert und in einem Stück
+    geschrieben. %r auf Python-Floats liefert die kürzeste exakte Darstellung,
+    wie str() je Punkt. closed=True wiederholt den ersten Punkt am Ende.
+    """
+    with open(file_path, 'w') as file:
+        for curve in curves:
+            curve = np.asarray(curve, dtype=float)
+            if closed:
+                curve = np.vstack((curve, curve[:1]))
+            row_format = ', '.join(['%r'] * curve.shape[1]) + '\n'
+            file.write((row_format * len(curve)) % tuple(curve.ravel().tolist()) + '\n')
+
+
+def _weld_tolerance(curves, tol):
+    if tol is not None:
+        return tol
+    points = np.vstack(curves)
+    return 1e-6 * max(np.linalg.norm(np.ptp(points, axis=0)), 1e-300)
+
+
+def remove_duplicates(points, tol=0.0, closed=False):
+    """Entfernt aufeinanderfolgende Punkte, die näher als tol beieinander liegen."""
+    points = np.asarray(points)
+    if len(points) < 2:
+        return points
+    step = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    keep = np.concatenate(([True], step > tol))
+    points = points[keep]
+    if closed and len(points) > 1 and np.linalg.norm(points[-1] - points[0]) <= tol:
+        points = points[:-1]
+    return points
+
+
+def chain_curves(curves, tol=None):
+    """
+    Verkettet Randkurven zu einer geschlossenen Schleife und verschweißt die Ecken.
+
+    Die Kurven werden der Reihe nach über den jeweils nächstgelegenen freien
+    Endpunkt angehängt und bei Bedarf umgedreht. Endpunkte, die näher als tol
+    beieinander liegen (Standard: 1e-6 der Diagonale des Hüllquaders), werden zu
+    einem Eckpunkt zusammengelegt.
+    Rückgabe: Schleife (K, D) ohne wiederholten Startpunkt und die Indizes der Ecken.
+    """
+    curves = [np.asarray(curve, dtype=float) for curve in curves if len(curve)]
+    if not curves:
+        raise ValueError("Keine Kurven zum Verketten vorhanden.")
+    tol = _weld_tolerance(curves, tol)
+
+    remaining = [remove_duplicates(curve, tol) for curve in curves]
+    pieces = [remaining.pop(0)]
+    while remaining:
+        end = pieces[-1][-1]
+        starts = np.array([curve[0] for curve in remaining])
+        ends = np.array([curve[-1] for curve in remaining])
+        distance_start = np.linalg.norm(starts - end, axis=1)
+        distance_end = np.linalg.norm(ends - end, axis=1)
+        if distance_start.min() <= distance_end.min():
+            curve = remaining.pop(int(np.argmin(distance_start)))
+        else:
+            curve = remaining.pop(int(np.argmin(distance_end)))[::-1]
+        pieces.append(curve)
+
+    # Ecken verschweißen: ein gemeinsamer Endpunkt wird nur einmal übernommen
+    loop, corners, count = [], [], 0
+    for piece in pieces:
+        if loop and np.linalg.norm(loop[-1][-1] - piece[0]) <= tol:
+            piece = piece[1:]
+            corners.append(count - 1)
+        else:
+            # Offene Stelle: Ende der vorigen und Anfang dieser Kurve sind Ecken
+            corners.extend([count - 1, count] if loop else [count])
+        loop.append(piece)
+        count += len(piece)
+    loop = np.vstack(loop)
+    if len(loop) > 1 and np.linalg.norm(loop[-1] - loop[0]) <= tol:
+        loop = loop[:-1]
+    else:
+        corners.append(len(loop) - 1)
+    corners = np.unique(np.minimum(corners, len(loop) - 1))
+    return loop, corners
+
+
+def turning_angles(loop):
+    """Richtungsänderung (Außenwinkel) an jedem Punkt einer geschlossenen Schleife."""
+    incoming = loop - np.roll(loop, 1, axis=0)
+    outgoing = np.roll(loop, -1, axis=0) - loop
+    cosine = np.sum(incoming * outgoing, axis=1)
+    norms = np.linalg.norm(incoming, axis=1) * np.linalg.norm(outgoing, axis=1)
+    return np.arccos(np.clip(cosine / np.where(norms > 0, norms, 1.0), -1.0, 1.0))
+
+
+def resample_loop(loop, num_points, corners=None, mode='arc', curvature_weight=1.0, corner_angle=np.radians(30)):
+    """
+    Tastet eine geschlossene Schleife mit num_points Punkten neu ab.
+
+    mode='arc' verteilt die Punkte gleichmäßig nach Bogenlänge, mode='curvature'
+    verdichtet sie zusätzlich in gekrümmten Bereichen (Bogenlänge plus
+    curvature_weight * L / 2pi je Radiant Richtungsänderung). Ecken (die
+    übergebenen Indizes und alle Punkte mit einem Knick über corner_angle) bleiben
+    exakt erhalten, die Punkte werden je Abschnitt zwischen zwei Ecken verteilt.
+    Rückgabe: (num_points, D)-Array.
+    """
+    loop = np.asarray(loop, dtype=float)
+    if mode not in ('arc', 'curvature'):
+        raise ValueError("Unbekannter Modus. Wähle 'arc' oder 'curvature'.")
+    angles = turning_angles(loop)
+    corner_mask = angles > corner_angle
+    if corners is not None:
+        corner_mask[np.asarray(corners, dtype=int)] = True
+    corner_ids = np.flatnonzero(corner_mask)
+    if len(corner_ids) == 0:
+        corner_ids = np.array([0])
+    if num_points < len(corner_ids):
+        raise ValueError(f"num_points={num_points} ist kleiner als die Zahl der Ecken ({len(corner_ids)}).")
+
+    # Parameter entlang der geschlossenen Schleife, bei Bedarf nach Krümmung gewichtet
+    closed = np.vstack((loop, loop[:1]))
+    step = np.linalg.norm(np.diff(closed, axis=0), axis=1)
+    if mode == 'curvature':
+        smooth_angles = np.where(corner_mask, 0.0, angles)
+        scale = curvature_weight * step.sum() / (2 * np.pi)
+        step = step + scale * 0.5 * (smooth_angles + np.roll(smooth_angles, -1))
+    parameter = np.concatenate(([0.0], np.cumsum(step)))
+
+    # Punkte je Abschnitt proportional zu seiner Länge, mindestens einer (die Ecke selbst)
+    segment_start = parameter[corner_ids]
+    segment_length = np.diff(np.append(segment_start, segment_start[0] + parameter[-1]))
+    share = num_points * segment_length / parameter[-1]
+    counts = np.maximum(np.floor(share).astype(int), 1)
+    while counts.sum() > num_points:
+        counts[np.argmax(np.where(counts > 1, counts - share, -np.inf))] -= 1
+    while counts.sum() < num_points:
+        counts[np.argmax(share - counts)] += 1
+
+    segment = np.repeat(np.arange(len(corner_ids)), counts)
+    local = np.arange(num_points) - np.repeat(np.cumsum(counts) - counts, counts)
+    targets = (segment_start[segment] + local * segment_length[segment] / counts[segment]) % parameter[-1]
+    return np.column_stack([np.interp(targets, parameter, closed[:, k]) for k in range(loop.shape[1])])
+
+
+def prepare_boundary(curves, num_points=None, mode='arc', tol=None, curvature_weight=1.0):
+    """
+    Verkettet, verschweißt und tastet die Randkurven einer Fläche neu ab.
+
+    Ohne num_points bleibt die Punktzahl der verschweißten Schleife erhalten.
+    Rückgabe: geschlossene Schleife (num_points, D) ohne doppelte Punkte.
+    """
+    loop, corners = chain_curves(curves, tol)
+    if num_points is None:
+        num_points = len(loop)
+    return resample_loop(loop, num_points, corners, mode=mode, curvature_weight=curvature_weight)
+
+
+# Beispielaufruf: Kurven einer Seitenfläche laden
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else 'doppelbauch_seite_1_2_3.txt'
+    curves = load_curves(file_path)
+    print(f"{len(curves)} Kurven mit {sum(len(curve) for curve in curves)} Punkten geladen: {file_path}")
@@ -1,6 +1,4 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from tkinter import Tk, filedialog
+from kurven import load_points
 from minsurface_class import MinSurface  # Importiere deine MinSurface-Klasse
 from rand import Rand  # Importiere die Rand-Klasse
 
@@ -14,6 +12,8 @@ default_file_path = 'seite_1_2_3.txt'
 def read_file(_use_file_dialog=use_file_dialog):
     # Datei wählen basierend auf der Booleschen Variable
     if _use_file_dialog:
+        from tkinter import Tk, filedialog
+
         # Erstelle ein verstecktes Tkinter-Fenster
         root = Tk()
         root.withdraw()  # Verstecke das Hauptfenster
@@ -30,20 +30,13 @@ def read_file(_use_file_dialog=use_file_dialog):
     else:
         file_path = default_file_path
 
-    # Lese die Kurvendaten aus der Datei
-    points = []
-    with open(file_path, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line:
-                # Lese die Koordinaten (x, y, z) als Tupel
-                point = tuple(map(float, line.split(',')))
-                points.append(point)
-
-    return np.array(points), file_path
+    # Lese die Kurvendaten aus der Datei, alle Kurven hintereinander
+    return load_points(file_path), file_path
 
 # Hauptprogramm
-if __name__ == "__main__":
+def main():
+    import matplotlib.pyplot as plt
+
     # Einlesen der Datei und der Randpunkte
     points, file_path = read_file()
 
@@ -85,4 +78,8 @@ if __name__ == "__main__":
     ax_opt.legend(['Optimierte Fläche', 'Randpunkte'])
 
     # Zeige die Plots an
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
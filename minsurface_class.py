@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.optimize import minimize
 from rand import Rand  # Importiere die Rand-Klasse
 
 class MinSurface:
@@ -29,18 +28,13 @@ class MinSurface:
     def initial_surface(self, r, phi):
         x = r * np.cos(phi) + self.rand.center_x
         y = r * np.sin(phi) + self.rand.center_y
-        Z_init = np.full_like(r, np.nan)
 
         # Berechnung der initialen Z-Werte basierend auf den nächstgelegenen Randpunkten
-        for i in range(r.shape[0]):
-            for j in range(r.shape[1]):
-                distances = np.sqrt((self.rand.x_points - x[i, j])**2 + (self.rand.y_points - y[i, j])**2)
-                closest_idx = np.argmin(distances)
-                Z_init[i, j] = self.rand.z_points[closest_idx]
-
-        return Z_init
+        return self.rand.nearestZ(x, y)
 
     def optimize_surface(self):
+        from scipy.optimize import minimize
+
         # Optimiert die Fläche durch Minimierung der Flächenenergie mit Dirichlet-Randbedingungen
         def surface_energy(Z_flat, R, Phi):
             Z = Z_flat.reshape(R.shape)
@@ -123,7 +117,11 @@ class MinSurface:
         # Gibt die Randpunkte zurück
         return self.rand.x_points, self.rand.y_points, self.rand.z_points  
 
-if __name__ == "__main__":
+def main():
     import os
     # run minimal_surface.py
-    os.system("python minimal_surface.py")
\ No newline at end of file
+    os.system("python minimal_surface.py")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,316 @@
+import numpy as np
+
+
+def _edge_keys(faces, num_vertices=None):
+    """Schlüssel min * N + max der ungerichteten Kante jeder Halbkante (3M,) als int64."""
+    faces = np.asarray(faces)
+    if num_vertices is None:
+        num_vertices = int(faces.max()) + 1 if faces.size else 0
+    start = faces.reshape(-1).astype(np.int64)
+    end = np.roll(faces, -1, axis=1).reshape(-1).astype(np.int64)
+    return np.minimum(start, end) * num_vertices + np.maximum(start, end), num_vertices
+
+
+def unique_edges(faces):
+    """
+    Bestimmt die ungerichteten Kanten eines Dreiecksnetzes.
+
+    Rückgabe: edges (E, 2) mit v1 < v2 und face_edges (M, 3) mit dem
+    Kantenindex jeder Dreiecksseite (v1->v2, v2->v3, v3->v1).
+    """
+    faces = np.asarray(faces)
+    keys, num_vertices = _edge_keys(faces)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    edges = np.column_stack((unique // max(num_vertices, 1), unique % max(num_vertices, 1)))
+    return edges, inverse.reshape(faces.shape)
+
+
+def triangle_gradients(vertices, faces):
+    """
+    Gradienten der linearen Formfunktionen je Dreieck in einem lokalen 2D-System.
+
+    Das lokale System hat seine x-Achse entlang der ersten Dreieckskante.
+    Rückgabe: grad (M, 3, 2), Flächeninhalte (M,) und die lokalen Koordinaten (M, 3, 2).
+    """
+    x = vertices[faces]
+    e1 = x[:, 1] - x[:, 0]
+    e1 /= np.linalg.norm(e1, axis=1)[:, None]
+    normal = np.cross(x[:, 1] - x[:, 0], x[:, 2] - x[:, 0])
+    area = 0.5 * np.linalg.norm(normal, axis=1)
+    normal /= (2 * area)[:, None]
+    e2 = np.cross(normal, e1)
+    local = np.stack((np.einsum('tai,ti->ta', x - x[:, :1], e1),
+                      np.einsum('tai,ti->ta', x - x[:, :1], e2)), axis=-1)
+
+    # Zeilen von [-1 -1; 1 0; 0 1] J^-T mit den Kantenvektoren als Zeilen von J
+    J = np.stack((local[:, 1] - local[:, 0], local[:, 2] - local[:, 0]), axis=1)
+    J_inv = np.linalg.inv(J)
+    grad = np.einsum('ak,tjk->taj', np.array([[-1.0, -1.0], [1.0, 0.0], [0.0, 1.0]]), J_inv)
+    return grad, area, local
+
+
+def _chain_boundary(boundary):
+    """Verkettet gerichtete Randkanten (B, 2) zu Schleifen von Vertexindizes."""
+    if len(boundary) == 0:
+        return []
+
+    # Nachfolger jeder Randkante: die Randkante, die am Endpunkt beginnt
+    order = np.argsort(boundary[:, 0], kind='stable')
+    position = np.searchsorted(boundary[order, 0], boundary[:, 1])
+    position = np.minimum(position, len(boundary) - 1)
+    successor = np.where(boundary[order[position], 0] == boundary[:, 1], order[position], -1)
+
+    loops = []
+    visited = np.zeros(len(boundary), dtype=bool)
+    for start in range(len(boundary)):
+        if visited[start]:
+            continue
+        loop = []
+        edge = start
+        while edge >= 0 and not visited[edge]:
+            visited[edge] = True
+            loop.append(int(boundary[edge, 0]))
+            edge = successor[edge]
+        loops.append(loop)
+    return loops
+
+
+def boundary_loops(faces):
+    """
+    Gibt die Randschleifen eines Dreiecksnetzes als Listen von Vertexindizes zurück.
+
+    Randkanten sind gerichtete Kanten ohne Gegenkante, die Schleifen folgen dem
+    Umlaufsinn der angrenzenden Dreiecke.
+    """
+    faces = np.asarray(faces)
+    half_edges = np.stack((faces, np.roll(faces, -1, axis=1)), axis=-1).reshape(-1, 2)
+    keys, _ = _edge_keys(faces)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    return _chain_boundary(half_edges[counts[inverse] == 1])
+
+
+def orient_faces(faces, vertices=None):
+    """
+    Richtet die Dreiecke konsistent aus (Breitensuche über die Nachbarschaft der Dreiecke).
+
+    Zwei Dreiecke an einer mannigfaltigen Kante sind konsistent, wenn sie die Kante
+    gegenläufig durchlaufen. Der Umlaufsinn wird über einen Breitensuchbaum je
+    Zusammenhangskomponente weitergegeben und alle abweichenden Dreiecke werden auf
+    einmal umgedreht. Kanten mit mehr als zwei Dreiecken gelten als nicht-mannigfaltig
+    und trennen die Nachbarschaft. Sind vertices angegeben, werden geschlossene
+    Komponenten so gedreht, dass die Normalen nach außen zeigen.
+
+    Rückgabe: ausgerichtete faces, Maske der umgedrehten Dreiecke,
+    nicht-mannigfaltige Kanten (K, 2) und die Randschleifen.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import breadth_first_order, connected_components
+
+    faces = np.asarray(faces)
+    num_faces = len(faces)
+    mesh = Mesh(np.zeros((int(faces.max()) + 1 if faces.size else 0, 3)), faces)
+    non_manifold_edges = mesh.edges[mesh.non_manifold_edges]
+
+    # Paare von Halbkanten an mannigfaltigen Innenkanten
+    first = np.flatnonzero(mesh.twin > np.arange(3 * num_faces))
+    second = mesh.twin[first]
+    face_a, face_b = first // 3, second // 3
+    # Gleichläufige Halbkanten: eines der beiden Dreiecke muss umgedreht werden
+    relative = (mesh.half_edge_origin[first] == mesh.half_edge_origin[second]).astype(np.int8)
+
+    # Nachbarschaftsgraph mit einem virtuellen Wurzelknoten je Komponente
+    adjacency = coo_matrix((np.ones(len(first)), (face_a, face_b)), shape=(num_faces, num_faces))
+    num_components, labels = connected_components(adjacency, directed=False)
+    _, component_roots = np.unique(labels, return_index=True)
+    root = num_faces
+    graph = coo_matrix((np.ones(len(first) + num_components),
+                        (np.concatenate((face_a, np.full(num_components, root))),
+                         np.concatenate((face_b, component_roots)))),
+                       shape=(num_faces + 1, num_faces + 1)).tocsr()
+    _, predecessors = breadth_first_order(graph, root, directed=False, return_predecessors=True)
+
+    # Relative Ausrichtung jedes Dreiecks zu seinem Vorgänger im Baum
+    pair_keys = np.concatenate((face_a * (num_faces + 1) + face_b, face_b * (num_faces + 1) + face_a))
+    pair_relative = np.concatenate((relative, relative))
+    key_order = np.argsort(pair_keys, kind='stable')
+    parent = predecessors[:num_faces]
+    tree_keys = np.arange(num_faces) * (num_faces + 1) + parent
+    position = np.minimum(np.searchsorted(pair_keys[key_order], tree_keys), len(key_order) - 1)
+    parity = np.zeros(num_faces + 1, dtype=np.int8)
+    if len(key_order):
+        parity[:num_faces] = np.where(parent == root, 0, pair_relative[key_order[position]])
+
+    # Pointer Jumping: Parität entlang des Pfades zur Wurzel in O(log Tiefe) Schritten
+    pointer = np.append(parent, root)
+    while np.any(pointer != root):
+        parity ^= parity[pointer]
+        pointer = pointer[pointer]
+    flipped = parity[:num_faces].astype(bool)
+
+    oriented = faces.copy()
+    oriented[flipped] = oriented[flipped][:, ::-1]
+
+    if vertices is not None:
+        # Geschlossene Komponenten mit negativem Volumen nach außen drehen
+        boundary_faces = np.zeros(num_faces, dtype=bool)
+        boundary_faces[np.flatnonzero(mesh.boundary_half_edges) // 3] = True
+        closed = np.bincount(labels, weights=boundary_faces, minlength=num_components) == 0
+        p = np.asarray(vertices)[oriented]
+        volume = np.einsum('ti,ti->t', p[:, 0], np.cross(p[:, 1], p[:, 2])) / 6.0
+        inward = closed & (np.bincount(labels, weights=volume, minlength=num_components) < 0)
+        turn = inward[labels]
+        oriented[turn] = oriented[turn][:, ::-1]
+        flipped ^= turn
+
+    return oriented, flipped, non_manifold_edges, boundary_loops(oriented)
+
+
+class Mesh:
+    """
+    Dreiecksnetz auf zusammenhängenden NumPy-Arrays mit Halbkanten-Nachbarschaft.
+
+    Halbkante h = 3 * f + k läuft in Dreieck f von faces[f, k] nach
+    faces[f, (k + 1) % 3]. Die Nachbarschaft (Kanten, Gegenkanten, Randmasken)
+    wird beim ersten Zugriff einmal vektorisiert aufgebaut und zwischengespeichert.
+    Mit dtype=np.float32 werden die Koordinaten in einfacher Genauigkeit gehalten;
+    Indizes sind int32, solange die Vertexzahl das erlaubt.
+    Speicherbedarf bei float32 etwa 12 Byte je Vertex und 54 Byte je Dreieck
+    (faces, twin, face_edges, edges, edge_face_count), siehe nbytes.
+    """
+
+    def __init__(self, vertices, faces, dtype=np.float64):
+        self.vertices = np.ascontiguousarray(vertices, dtype=dtype)
+        index_dtype = np.int32 if len(self.vertices) < 2**31 else np.int64
+        self.faces = np.ascontiguousarray(np.asarray(faces).reshape(-1, 3), dtype=index_dtype)
+        self._connectivity = None
+
+    @classmethod
+    def from_off(cls, file_path, dtype=np.float64):
+        """Liest ein Netz aus einer OFF-Datei."""
+        from abwicklung_evolver import parse_off
+
+        vertices, faces = parse_off(file_path)
+        return cls(vertices, faces, dtype=dtype)
+
+    @property
+    def num_vertices(self):
+        return len(self.vertices)
+
+    @property
+    def num_faces(self):
+        return len(self.faces)
+
+    def astype(self, dtype):
+        """Kopie mit anderer Genauigkeit der Koordinaten; die Nachbarschaft wird übernommen."""
+        mesh = Mesh(self.vertices, self.faces, dtype=dtype)
+        mesh._connectivity = self._connectivity
+        return mesh
+
+    def _build(self):
+        if self._connectivity is not None:
+            return self._connectivity
+        index_dtype = self.faces.dtype
+        keys, _ = _edge_keys(self.faces, self.num_vertices)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        first = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        edge_of_sorted = np.cumsum(first) - 1
+        half_edge_edge = np.empty(len(keys), dtype=index_dtype)
+        half_edge_edge[order] = edge_of_sorted
+        counts = np.bincount(edge_of_sorted)
+
+        # Gegenkanten an Kanten mit genau zwei Halbkanten; Rand und nicht-mannigfaltig: -1
+        twin = np.full(len(keys), -1, dtype=index_dtype)
+        starts = np.flatnonzero(first)
+        paired = starts[counts == 2]
+        twin[order[paired]] = order[paired + 1]
+        twin[order[paired + 1]] = order[paired]
+
+        unique = sorted_keys[starts]
+        edges = np.column_stack((unique // self.num_vertices, unique % self.num_vertices)).astype(index_dtype)
+        self._connectivity = {
+            'edges': edges,
+            'face_edges': half_edge_edge.reshape(-1, 3),
+            'twin': twin,
+            'edge_face_count': counts.astype(index_dtype),
+        }
+        return self._connectivity
+
+    @property
+    def edges(self):
+        """Ungerichtete Kanten (E, 2) mit v1 < v2, lexikographisch sortiert wie bei unique_edges."""
+        return self._build()['edges']
+
+    @property
+    def face_edges(self):
+        """Kantenindex jeder Dreiecksseite (M, 3), entspricht unique_edges."""
+        return self._build()['face_edges']
+
+    @property
+    def twin(self):
+        """
+        Partner-Halbkante derselben Kante (3M,), bei konsistenter Orientierung gegenläufig.
+
+        An Rand- und nicht-mannigfaltigen Kanten -1.
+        """
+        return self._build()['twin']
+
+    @property
+    def edge_face_count(self):
+        """Anzahl der Dreiecke an jeder Kante (E,)."""
+        return self._build()['edge_face_count']
+
+    @property
+    def half_edge_next(self):
+        """Nächste Halbkante im selben Dreieck (3M,)."""
+        h = np.arange(3 * self.num_faces, dtype=self.faces.dtype)
+        return h - h % 3 + (h + 1) % 3
+
+    @property
+    def half_edge_prev(self):
+        """Vorherige Halbkante im selben Dreieck (3M,)."""
+        h = np.arange(3 * self.num_faces, dtype=self.faces.dtype)
+        return h - h % 3 + (h + 2) % 3
+
+    @property
+    def half_edge_origin(self):
+        """Startvertex jeder Halbkante (3M,)."""
+        return self.faces.reshape(-1)
+
+    @property
+    def half_edge_target(self):
+        """Endvertex jeder Halbkante (3M,)."""
+        return np.roll(self.faces, -1, axis=1).reshape(-1)
+
+    @property
+    def boundary_half_edges(self):
+        """Maske der Halbkanten auf dem Rand (Kante mit nur einem Dreieck)."""
+        return self.edge_face_count[self.face_edges.reshape(-1)] == 1
+
+    @property
+    def boundary_edges(self):
+        """Maske der Randkanten (E,)."""
+        return self.edge_face_count == 1
+
+    @property
+    def non_manifold_edges(self):
+        """Maske der Kanten mit mehr als zwei Dreiecken (E,)."""
+        return self.edge_face_count > 2
+
+    @property
+    def boundary_vertices(self):
+        """Maske der Vertices auf einer Randkante (N,)."""
+        mask = np.zeros(self.num_vertices, dtype=bool)
+        mask[self.edges[self.boundary_edges].ravel()] = True
+        return mask
+
+    def boundary_loops(self):
+        """Randschleifen als Listen von Vertexindizes im Umlaufsinn der Dreiecke."""
+        boundary = self.boundary_half_edges
+        return _chain_boundary(np.column_stack((self.half_edge_origin[boundary], self.half_edge_target[boundary])))
+
+    @property
+    def nbytes(self):
+        """Speicherbedarf der Arrays in Byte (Geometrie, faces und bereits aufgebaute Nachbarschaft)."""
+        arrays = [self.vertices, self.faces] + list((self._connectivity or {}).values())
+        return sum(array.nbytes for array in arrays)
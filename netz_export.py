@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+# Zeilen bzw. Datensätze je Schreibvorgang
+CHUNK_SIZE = 1 << 16
+
+# Datensatz eines Dreiecks im binären STL-Format (50 Byte, ohne Ausrichtung)
+STL_DTYPE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+# Face-Datensatz im binären PLY-Format: Anzahl der Ecken (uchar) und drei Indizes (int)
+PLY_FACE_DTYPE = np.dtype([('count', 'u1'), ('vertices', '<i4', (3,))])
+
+
+def _write_chunks(file, array, chunk_size=CHUNK_SIZE):
+    """Schreibt ein zusammenhängendes Array abschnittsweise ohne Kopie über das Pufferprotokoll."""
+    array = np.ascontiguousarray(array)
+    for start in range(0, len(array), chunk_size):
+        file.write(memoryview(array[start:start + chunk_size]).cast('B'))
+
+
+def _format_rows(rows, row_format, chunk_size=CHUNK_SIZE):
+    """Formatiert die Zeilen eines Arrays abschnittsweise mit einem einzigen %-Aufruf je Abschnitt."""
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        yield (row_format * len(chunk)) % tuple(chunk.ravel().tolist())
+
+
+def write_ply(file_path, vertices, faces, float_type='float'):
+    """
+    Schreibt ein Dreiecksnetz als binäre PLY-Datei (little endian).
+
+    float_type='double' speichert die Koordinaten in doppelter Genauigkeit.
+    """
+    vertex_dtype = {'float': '<f4', 'double': '<f8'}[float_type]
+    vertices = np.ascontiguousarray(vertices, dtype=vertex_dtype)
+    faces = np.asarray(faces)
+    records = np.empty(len(faces), dtype=PLY_FACE_DTYPE)
+    records['count'] = 3
+    records['vertices'] = faces
+
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        f"element vertex {len(vertices)}\n"
+        f"property {float_type} x\nproperty {float_type} y\nproperty {float_type} z\n"
+        f"element face {len(faces)}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+    with open(file_path, 'wb') as file:
+        file.write(header.encode('ascii'))
+        _write_chunks(file, vertices)
+        _write_chunks(file, records)
+
+
+def write_stl(file_path, vertices, faces, header=b'netz_export binary STL'):
+    """Schreibt ein Dreiecksnetz als binäre STL-Datei mit Dreiecksnormalen."""
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces)
+    with open(file_path, 'wb') as file:
+        file.write(header[:80].ljust(80, b'\0'))
+        file.write(np.uint32(len(faces)).astype('<u4').tobytes())
+        # Datensätze abschnittsweise aufbauen, damit der Zwischenspeicher begrenzt bleibt
+        for start in range(0, len(faces), CHUNK_SIZE):
+            p = vertices[faces[start:start + CHUNK_SIZE]]
+            normal = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+            length = np.linalg.norm(normal, axis=1)
+            records = np.zeros(len(p), dtype=STL_DTYPE)
+            records['normal'] = normal / np.where(length > 0, length, 1.0)[:, None]
+            records['vertices'] = p
+            file.write(memoryview(records).cast('B'))
+
+
+def write_obj(file_path, vertices, faces, precision=9):
+    """Schreibt ein Dreiecksnetz als ASCII-OBJ, abschnittsweise formatiert."""
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces, dtype=np.int64) + 1
+    with open(file_path, 'w') as file:
+        file.write(f"# {len(vertices)} vertices, {len(faces)} faces\n")
+        for text in _format_rows(vertices, f"v %.{precision}g %.{precision}g %.{precision}g\n"):
+            file.write(text)
+        for text in _format_rows(faces, "f %d %d %d\n"):
+            file.write(text)
+
+
+def write_off(file_path, vertices, faces, precision=9):
+    """Schreibt ein Dreiecksnetz als ASCII-OFF, abschnittsweise formatiert."""
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces, dtype=np.int64)
+    with open(file_path, 'w') as file:
+        file.write(f"OFF\n{len(vertices)} {len(faces)} 0\n")
+        for text in _format_rows(vertices, f"%.{precision}g %.{precision}g %.{precision}g\n"):
+            file.write(text)
+        for text in _format_rows(faces, "3 %d %d %d\n"):
+            file.write(text)
+
+
+# Schreibfunktionen nach Dateiendung
+WRITERS = {'.ply': write_ply, '.stl': write_stl, '.obj': write_obj, '.off': write_off}
+
+
+def write_mesh(file_path, vertices, faces):
+    """Schreibt ein Netz im Format der Dateiendung (.ply, .stl, .obj oder .off)."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unbekanntes Ausgabeformat '{extension}'. Wähle {', '.join(WRITERS)}.")
+    WRITERS[extension](file_path, vertices, faces)
+
+
+# Beispielaufruf: OFF-Netz in alle Formate umwandeln
+if __name__ == "__main__":
+    import sys
+    from abwicklung_evolver import parse_off
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else 'symm_aussen.off'
+    vertices, faces = parse_off(file_path)
+    base = os.path.splitext(file_path)[0]
+    for extension in ('.ply', '.stl', '.obj'):
+        write_mesh(base + '_export' + extension, vertices, faces)
+        print(f"Gespeichert: {base}_export{extension}")
@@ -0,0 +1,293 @@
+import time
+
+import numpy as np
+
+# Kopf des Speicherblocks: 8 int64 und 8 float64, danach Vertices (float64) und Faces (int64)
+HEADER_INTS = 8
+HEADER_FLOATS = 8
+HEADER_BYTES = 8 * (HEADER_INTS + HEADER_FLOATS)
+# Positionen im int64-Kopf
+SEQ, NUM_VERTICES, NUM_FACES, ITERATION, FACES_VERSION, CAPACITY_VERTICES, CAPACITY_FACES = range(7)
+# Positionen im float64-Kopf
+RESIDUAL, ENERGY, TIMESTAMP = range(3)
+
+# Namen der in diesem Prozess angelegten Blöcke (beim resource_tracker bereits eingetragen)
+_created = set()
+
+
+def create_shared_memory(size, name=None):
+    """Legt einen Shared-Memory-Block an, den dieser Prozess besitzt und später mit unlink freigibt."""
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name, create=True, size=size)
+    _created.add(block.name)
+    return block
+
+
+def release_shared_memory(block):
+    """Schließt und löscht einen mit create_shared_memory angelegten Block."""
+    block.close()
+    block.unlink()
+    _created.discard(block.name)
+
+
+def attach_shared_memory(name):
+    """Öffnet einen vorhandenen Block, ohne dass der resource_tracker ihn beim Beenden des Lesers löscht."""
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Vor Python 3.13 registriert jeder Prozess den Block beim resource_tracker, der
+    # ihn beim Beenden freigibt. Kindprozesse von multiprocessing teilen den Tracker
+    # der Eltern (fork wie spawn), dort ist der Block schon eingetragen und das
+    # erneute Registrieren ändert nichts; ein unregister würde dagegen den Eintrag
+    # des Schreibers löschen. Dasselbe gilt im Prozess des Schreibers. Nur ein
+    # eigenständiger Prozess mit eigenem Tracker trägt den Block wieder aus.
+    import multiprocessing
+    from multiprocessing import resource_tracker
+
+    block = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None and block.name not in _created:
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+class _MeshBlock:
+    """Sichten auf Kopf, Vertices und Faces eines Speicherblocks."""
+
+    def __init__(self, block, capacity_vertices=None, capacity_faces=None):
+        self.block = block
+        self.ints = np.ndarray((HEADER_INTS,), dtype=np.int64, buffer=block.buf)
+        self.floats = np.ndarray((HEADER_FLOATS,), dtype=np.float64, buffer=block.buf, offset=8 * HEADER_INTS)
+        if capacity_vertices is None:
+            capacity_vertices, capacity_faces = int(self.ints[CAPACITY_VERTICES]), int(self.ints[CAPACITY_FACES])
+        self.vertices = np.ndarray((capacity_vertices, 3), dtype=np.float64, buffer=block.buf, offset=HEADER_BYTES)
+        self.faces = np.ndarray((capacity_faces, 3), dtype=np.int64, buffer=block.buf,
+                                offset=HEADER_BYTES + self.vertices.nbytes)
+
+    @staticmethod
+    def size(capacity_vertices, capacity_faces):
+        return HEADER_BYTES + 24 * (capacity_vertices + capacity_faces)
+
+
+class MeshPublisher:
+    """
+    Veröffentlicht die aktuelle Lage eines Netzes in einem Shared-Memory-Block.
+
+    Andere Prozesse öffnen den Block über name mit MeshSubscriber und lesen die
+    Vertices ohne Dateien oder Pipes. Die Konsistenz sichert ein Sequenzzähler
+    (Seqlock): vor dem Schreiben wird er ungerade, danach wieder gerade. Der
+    Schreiber wartet nie auf Leser; ein Veröffentlichen kostet ein Kopieren des
+    Vertex-Arrays. Mit min_interval (Sekunden) werden zu häufige Aufrufe, z.B.
+    aus der callback jedes Löserschritts, übersprungen.
+
+    capacity_vertices/capacity_faces reservieren Platz für spätere Verfeinerung.
+    Der Block gehört dem Schreiber und wird mit close() freigegeben.
+    """
+
+    def __init__(self, vertices, faces, name=None, capacity_vertices=None, capacity_faces=None, min_interval=0.0):
+        vertices, faces = np.asarray(vertices, dtype=float), np.asarray(faces)
+        capacity_vertices = len(vertices) if capacity_vertices is None else capacity_vertices
+        capacity_faces = len(faces) if capacity_faces is None else capacity_faces
+        self.block = create_shared_memory(_MeshBlock.size(capacity_vertices, capacity_faces), name=name)
+        self.name = self.block.name
+        self.min_interval = min_interval
+        self._last = -np.inf
+        self._views = _MeshBlock(self.block, capacity_vertices, capacity_faces)
+        self._views.ints[:] = 0
+        self._views.ints[CAPACITY_VERTICES] = capacity_vertices
+        self._views.ints[CAPACITY_FACES] = capacity_faces
+        self.publish(vertices, faces)
+
+    @property
+    def sequence(self):
+        return int(self._views.ints[SEQ])
+
+    def publish(self, vertices, faces=None, iteration=-1, residual=np.nan, energy=np.nan):
+        """Schreibt eine neue Lage (und bei Topologieänderung neue Faces). Rückgabe: Sequenznummer."""
+        views = self._views
+        vertices = np.asarray(vertices, dtype=float)
+        faces = None if faces is None else np.asarray(faces)
+        if vertices.ndim != 2 or vertices.shape[1] != 3 or (faces is not None and faces.shape[1:] != (3,)):
+            raise ValueError("Vertices und Faces müssen die Form (N, 3) haben.")
+        if len(vertices) > len(views.vertices) or (faces is not None and len(faces) > len(views.faces)):
+            raise ValueError("Netz größer als der reservierte Speicherblock.")
+        views.ints[SEQ] += 1  # ungerade: Schreiben läuft
+        try:
+            views.vertices[:len(vertices)] = vertices
+            views.ints[NUM_VERTICES] = len(vertices)
+            if faces is not None:
+                views.faces[:len(faces)] = faces
+                views.ints[NUM_FACES] = len(faces)
+                views.ints[FACES_VERSION] += 1
+            views.ints[ITERATION] = iteration
+            views.floats[[RESIDUAL, ENERGY, TIMESTAMP]] = residual, energy, time.time()
+        finally:
+            views.ints[SEQ] += 1  # gerade: Lage vollständig, auch nach einem Fehler nie dauerhaft ungerade
+        self._last = time.perf_counter()
+        return self.sequence
+
+    def publish_status(self, iteration=-1, residual=np.nan, energy=np.nan):
+        """Aktualisiert nur die Kennwerte, z.B. aus den Iterationszeilen des Evolvers."""
+        views = self._views
+        views.ints[SEQ] += 1
+        try:
+            views.ints[ITERATION] = iteration
+            views.floats[[RESIDUAL, ENERGY, TIMESTAMP]] = residual, energy, time.time()
+        finally:
+            views.ints[SEQ] += 1
+        return self.sequence
+
+    def callback(self, iteration, x, residual):
+        """Passt als callback von VolumeConstrainedSurface.solve und DynamicRelaxation.run."""
+        if time.perf_counter() - self._last >= self.min_interval:
+            self.publish(x, iteration=iteration, residual=residual)
+
+    def close(self):
+        """Gibt den Block frei; verbundene Leser behalten ihre Abbildung bis zum eigenen close()."""
+        self._views = None
+        release_shared_memory(self.block)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MeshSubscriber:
+    """
+    Liest die von MeshPublisher veröffentlichten Lagen aus einem anderen Prozess.
+
+    read() kopiert eine konsistente Lage; view() liefert Sichten direkt in den
+    Block, ohne Kopie, die nur gültig sind, solange valid(sequence) gilt. So lassen
+    sich Kennwerte auf der Lage rechnen und erst danach prüfen, ob der Schreiber
+    dazwischen war.
+    """
+
+    def __init__(self, name):
+        self.block = attach_shared_memory(name)
+        self._views = _MeshBlock(self.block)
+        self._faces = None
+        self._faces_version = -1
+
+    @property
+    def sequence(self):
+        return int(self._views.ints[SEQ])
+
+    def valid(self, sequence):
+        """True, wenn seit dem Lesen von sequence nichts geschrieben wurde."""
+        return sequence % 2 == 0 and self.sequence == sequence
+
+    def _stable_sequence(self, timeout):
+        start = time.perf_counter()
+        while True:
+            sequence = self.sequence
+            if sequence % 2 == 0:
+                return sequence
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("Kein vollständiger Stand im Speicherblock.")
+            time.sleep(0)  # GIL abgeben, sonst kommt ein Schreiber-Thread im selben Prozess nicht voran
+
+    def view(self, timeout=1.0):
+        """Rückgabe: (Sequenznummer, Sicht auf die Vertices (N, 3)) ohne Kopie."""
+        sequence = self._stable_sequence(timeout)
+        return sequence, self._views.vertices[:int(self._views.ints[NUM_VERTICES])]
+
+    def read(self, timeout=1.0):
+        """
+        Kopiert eine konsistente Lage.
+
+        Rückgabe: (Sequenznummer, vertices (N, 3), Dictionary mit 'iteration',
+        'residual', 'energy' und 'time').
+        """
+        start = time.perf_counter()
+        while True:
+            sequence = self._stable_sequence(timeout)
+            views = self._views
+            vertices = views.vertices[:int(views.ints[NUM_VERTICES])].copy()
+            info = {'iteration': int(views.ints[ITERATION]), 'residual': float(views.floats[RESIDUAL]),
+                    'energy': float(views.floats[ENERGY]), 'time': float(views.floats[TIMESTAMP])}
+            if self.valid(sequence):
+                return sequence, vertices, info
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("Der Schreiber überholt den Leser ständig.")
+
+    @property
+    def faces(self):
+        """Faces als Kopie, siehe read_faces."""
+        return self.read_faces()
+
+    def read_faces(self, timeout=1.0):
+        """Faces als Kopie; wird nur neu gelesen, wenn sich die Topologie geändert hat."""
+        start = time.perf_counter()
+        while True:
+            sequence = self._stable_sequence(timeout)
+            version = int(self._views.ints[FACES_VERSION])
+            if version == self._faces_version:
+                return self._faces.copy()
+            faces = self._views.faces[:int(self._views.ints[NUM_FACES])].copy()
+            if self.valid(sequence):
+                self._faces, self._faces_version = faces, version
+                return faces.copy()
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("Der Schreiber überholt den Leser ständig.")
+
+    def wait(self, sequence, timeout=None, poll_interval=0.01):
+        """Wartet auf einen neueren Stand als sequence. Rückgabe: neue Sequenznummer oder None nach timeout."""
+        start = time.perf_counter()
+        while self.sequence <= sequence + (sequence % 2):
+            if timeout is not None and time.perf_counter() - start > timeout:
+                return None
+            time.sleep(poll_interval)
+        return self._stable_sequence(1.0)
+
+    def close(self):
+        self._views = None
+        self.block.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def monitor(name, interval=0.5, duration=None):
+    """Gibt laufend Fläche und Iteration des veröffentlichten Netzes aus, bis der Schreiber aufhört."""
+    from flaechenanalyse import total_area
+
+    with MeshSubscriber(name) as subscriber:
+        faces, sequence, start = subscriber.faces, -1, time.perf_counter()
+        while duration is None or time.perf_counter() - start < duration:
+            new = subscriber.wait(sequence, timeout=interval * 10)
+            if new is None:
+                break
+            sequence, vertices, info = subscriber.read()
+            print(f"Schritt {info['iteration']}: Fläche {total_area(vertices, faces):.6f}, "
+                  f"Restkraft {info['residual']:.2e}")
+            time.sleep(interval)
+
+
+# Beispielaufruf: Kissen aufblasen und die Lösung aus einem zweiten Prozess beobachten
+if __name__ == "__main__":
+    from multiprocessing import Process
+    from flaechenanalyse import grid_mesh
+    from volumenzwang import VolumeConstrainedSurface
+
+    X, Y = np.meshgrid(np.linspace(-1, 1, 41), np.linspace(-1, 1, 41))
+    vertices, faces = grid_mesh(X, Y, np.zeros_like(X))
+    fixed = (np.abs(vertices[:, 0]) == 1) | (np.abs(vertices[:, 1]) == 1)
+    vertices[:, 2] = 0.1 * (1 - vertices[:, 0]**2) * (1 - vertices[:, 1]**2)
+
+    with MeshPublisher(vertices, faces) as publisher:
+        viewer = Process(target=monitor, args=(publisher.name, 0.2))
+        viewer.start()
+        cushion = VolumeConstrainedSurface(vertices, faces, fixed, volume=1.0)
+        converged, steps, residual = cushion.solve(callback=publisher.callback)
+        publisher.publish(cushion.vertices, iteration=steps, residual=residual)
+        viewer.join()
+    print(f"Konvergiert: {converged} nach {steps} Schritten, Fläche {cushion.area():.5f}")
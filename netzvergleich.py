@@ -0,0 +1,84 @@
+import numpy as np
+
+from flaechenanalyse import face_normals
+from kollision import TriangleBVH
+
+
+def vertex_weights(vertices, faces):
+    """Ein Drittel der angrenzenden Dreiecksflächen je Vertex, als Gewicht für Mittelwerte über die Fläche."""
+    p = vertices[faces]
+    areas = 0.5 * np.linalg.norm(np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]), axis=1)
+    return np.bincount(faces.ravel(), weights=np.repeat(areas / 3.0, 3), minlength=len(vertices))
+
+
+def signed_deviation(points, tree):
+    """
+    Vorzeichenbehafteter Abstand der Punkte zur Fläche des Baums.
+
+    Positiv auf der Seite, in die die Normale des nächsten Dreiecks zeigt.
+    Rückgabe: (Abweichungen (Q,), Indizes der nächsten Dreiecke (Q,))
+    """
+    distances, indices, closest = tree.closest_points(points)
+    normals = face_normals(tree.vertices, tree.faces)[indices]
+    sign = np.where(np.einsum('ij,ij->i', points - closest, normals) < 0, -1.0, 1.0)
+    return sign * distances, indices
+
+
+def compare_meshes(vertices_a, faces_a, vertices_b, faces_b):
+    """
+    Vergleicht zwei Flächen über die Abstände ihrer Vertices zur jeweils anderen Fläche.
+
+    Für jeden Vertex wird der genaue Abstand zum nächsten Punkt der anderen Fläche
+    bestimmt (TriangleBVH). Die Hausdorff-Distanz ist das Maximum beider Richtungen,
+    RMS und Mittelwert sind mit den Vertexflächen gewichtet und damit von der
+    Netzdichte weitgehend unabhängig. Wie bei clearance werden nur Vertices
+    abgefragt; für ähnlich feine Netze ist das eine gute Näherung der Flächenwerte.
+    Rückgabe: Dictionary mit 'hausdorff', 'hausdorff_ab', 'hausdorff_ba', 'rms',
+    'mean' und den vorzeichenbehafteten Abweichungen je Vertex 'deviation_a'
+    (zu Fläche b) und 'deviation_b' (zu Fläche a).
+    """
+    vertices_a, faces_a = np.asarray(vertices_a, dtype=float), np.asarray(faces_a)
+    vertices_b, faces_b = np.asarray(vertices_b, dtype=float), np.asarray(faces_b)
+    deviation_a, _ = signed_deviation(vertices_a, TriangleBVH(vertices_b, faces_b))
+    deviation_b, _ = signed_deviation(vertices_b, TriangleBVH(vertices_a, faces_a))
+
+    weights = np.concatenate((vertex_weights(vertices_a, faces_a), vertex_weights(vertices_b, faces_b)))
+    distances = np.abs(np.concatenate((deviation_a, deviation_b)))
+    return {
+        'hausdorff_ab': np.abs(deviation_a).max(),
+        'hausdorff_ba': np.abs(deviation_b).max(),
+        'hausdorff': distances.max(),
+        'rms': np.sqrt(np.sum(weights * distances**2) / weights.sum()),
+        'mean': np.sum(weights * distances) / weights.sum(),
+        'deviation_a': deviation_a,
+        'deviation_b': deviation_b,
+    }
+
+
+def compare_off(file_a, file_b):
+    """Vergleicht zwei OFF-Dateien mit compare_meshes."""
+    from abwicklung_evolver import parse_off
+
+    return compare_meshes(*parse_off(file_a), *parse_off(file_b))
+
+
+def save_deviations(file_path, vertices, deviations):
+    """Speichert x, y, z und die Abweichung je Vertex als Textdatei, z.B. zum Einfärben in einem Viewer."""
+    np.savetxt(file_path, np.column_stack((vertices, deviations)), header='x y z abweichung')
+
+
+# Beispielaufruf: aufeinanderfolgende Evolver-Ergebnisse derselben Eingabe vergleichen
+if __name__ == "__main__":
+    import sys
+    import time
+    from glob import glob
+
+    if len(sys.argv) == 2:
+        sys.exit("Aufruf: python netzvergleich.py [a.off b.off ...]")
+    files = sys.argv[1:] if len(sys.argv) > 2 else sorted(glob('surface_evolver_input_20241222_*.off'))
+    for file_a, file_b in zip(files[:-1], files[1:]):
+        start = time.perf_counter()
+        result = compare_off(file_a, file_b)
+        print(f"{file_a} <-> {file_b}: Hausdorff {result['hausdorff']:.3e} "
+              f"({result['hausdorff_ab']:.3e} / {result['hausdorff_ba']:.3e}), RMS {result['rms']:.3e}, "
+              f"Mittel {result['mean']:.3e} ({time.perf_counter() - start:.2f} s)")
@@ -0,0 +1,248 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Parameter, die an generate_frame weitergereicht werden; 'faktor_XY' setzt den Bauchfaktor der Kante XY
+FRAME_PARAMETER = ('breite', 'bauchfaktor', 'gleichseitig', 'höhe', 'länge', 'spitzen_versatz', 'num_points')
+
+
+def grid_parameters(ranges):
+    """
+    Erzeugt alle Kombinationen eines Parametergitters.
+
+    ranges: Dictionary Name -> Liste von Werten, z.B. {'bauchfaktor': [0.1, 0.2]}.
+    """
+    names = list(ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*(ranges[name] for name in names))]
+
+
+def latin_hypercube(bounds, num_samples, seed=None):
+    """
+    Erzeugt num_samples Varianten als Latin-Hypercube-Stichprobe.
+
+    bounds: Dictionary Name -> (untere Grenze, obere Grenze).
+    """
+    rng = np.random.default_rng(seed)
+    names = list(bounds)
+    # Je Dimension eine zufällige Permutation der Schichten, innerhalb der Schicht gleichverteilt
+    strata = np.argsort(rng.random((len(names), num_samples)), axis=1)
+    samples = (strata + rng.random((len(names), num_samples))) / num_samples
+    variants = []
+    for k in range(num_samples):
+        variants.append({name: bounds[name][0] + samples[i, k] * (bounds[name][1] - bounds[name][0])
+                         for i, name in enumerate(names)})
+    return variants
+
+
+def _frame_arguments(params):
+    """Trennt die Rahmenparameter von den Kantenfaktoren ('faktor_12' usw.)."""
+    arguments = {name: params[name] for name in FRAME_PARAMETER if name in params}
+    kanten_faktoren = {name[len('faktor_'):]: value for name, value in params.items() if name.startswith('faktor_')}
+    if kanten_faktoren:
+        arguments['kanten_faktoren'] = kanten_faktoren
+    return arguments
+
+
+def mesh_faces(face_curves, num_r=10, num_angles=None):
+    """
+    Vernetzt mehrere Seitenflächen aus ihren Randkurven.
+
+    Die Randkurven jeder Fläche werden verkettet und mit num_angles Punkten neu
+    abgetastet (ohne Angabe bleibt die Punktzahl erhalten). Die Ebenen aller
+    Flächen werden gemeinsam mit PlaneFrames bestimmt, die Ränder in einem Schritt
+    in die XY-Ebene gedreht, dort mit SurfaceEvolverInput vernetzt und die Netze
+    anschließend wieder gemeinsam zurücktransformiert.
+    Rückgabe: Liste von (vertices, faces, fixed) wie bei SurfaceEvolverInput.build_mesh.
+    """
+    from planaroid_transformation import PlaneFrames
+    from rand import Rand
+    from SrfaceEvolver import SurfaceEvolverInput
+    from kurven import prepare_boundary
+
+    boundaries = [prepare_boundary(curves, num_points=num_angles) for curves in face_curves]
+    frames = PlaneFrames.fit(boundaries)
+    meshes = [SurfaceEvolverInput(Rand(points, interpolation_type='linear'), num_r=num_r).build_mesh()
+              for points in frames.transform_all(boundaries)]
+    vertices = frames.inverse_transform_all([mesh[0] for mesh in meshes])
+    return [(v, faces, fixed) for v, (_, faces, fixed) in zip(vertices, meshes)]
+
+
+def mesh_face(curves, num_r=10, num_angles=None):
+    """Vernetzt eine einzelne Seitenfläche, siehe mesh_faces."""
+    return mesh_faces([curves], num_r=num_r, num_angles=num_angles)[0]
+
+
+def run_variant(params, num_r=10, wind_direction=(0.0, 1.0, 0.0), num_angles=None):
+    """
+    Rechnet eine Variante: Rahmen erzeugen, Seitenflächen vernetzen, mit der
+    Kraftdichtemethode entwickeln und auswerten.
+
+    Rückgabe: Dictionary mit den Parametern, Kennwerten und Laufzeiten der Schritte.
+    """
+    from tetraeder import generate_frame
+    from kraftdichte import ForceDensitySolver
+    from flaechenanalyse import analyze
+
+    row = dict(params)
+    timings = {'zeit_rahmen': 0.0, 'zeit_netz': 0.0, 'zeit_loeser': 0.0, 'zeit_auswertung': 0.0}
+    start = time.perf_counter()
+    try:
+        t = time.perf_counter()
+        frame = generate_frame(**_frame_arguments(params))
+        timings['zeit_rahmen'] += time.perf_counter() - t
+
+        t = time.perf_counter()
+        meshes = mesh_faces(list(frame['seiten'].values()), num_r=num_r, num_angles=num_angles)
+        timings['zeit_netz'] += time.perf_counter() - t
+
+        totals = {}
+        for vertices, faces, fixed in meshes:
+            t = time.perf_counter()
+            vertices = ForceDensitySolver.from_mesh(vertices, faces, fixed).solve()
+            timings['zeit_loeser'] += time.perf_counter() - t
+
+            t = time.perf_counter()
+            metrics = analyze(vertices, faces, wind_direction=wind_direction)
+            timings['zeit_auswertung'] += time.perf_counter() - t
+
+            # Flächen summieren, Mittelwerte flächengewichtet, RMS über die Quadrate, Maxima als Maximum
+            for name, value in metrics.items():
+                if name == 'mean_curvature_abs_max':
+                    totals[name] = np.fmax(totals.get(name, np.nan), value)
+                elif name == 'mean_curvature_rms':
+                    totals[name] = totals.get(name, 0.0) + metrics['area'] * value**2
+                elif name in ('side_force_coefficient', 'gaussian_curvature_mean'):
+                    totals[name] = totals.get(name, 0.0) + metrics['area'] * value
+                else:
+                    totals[name] = totals.get(name, 0.0) + value
+
+        for name in ('side_force_coefficient', 'gaussian_curvature_mean', 'mean_curvature_rms'):
+            totals[name] /= totals['area']
+        totals['mean_curvature_rms'] = np.sqrt(totals['mean_curvature_rms'])
+        row.update(totals)
+        row['fehler'] = ''
+    except Exception as e:
+        row['fehler'] = f"{type(e).__name__}: {e}"
+
+    row.update(timings)
+    row['zeit_gesamt'] = time.perf_counter() - start
+    return row
+
+
+def variant_mesh(params, num_r=10, num_angles=None):
+    """
+    Erzeugt den Rahmen einer Variante und formfindet alle Seitenflächen mit der Kraftdichtemethode.
+
+    Rückgabe: vertices, faces aller Seitenflächen in einem Netz.
+    """
+    from tetraeder import generate_frame
+    from kraftdichte import ForceDensitySolver
+
+    frame = generate_frame(**_frame_arguments(params))
+    all_vertices, all_faces, offset = [], [], 0
+    for vertices, faces, fixed in mesh_faces(list(frame['seiten'].values()), num_r=num_r, num_angles=num_angles):
+        all_vertices.append(ForceDensitySolver.from_mesh(vertices, faces, fixed).solve())
+        all_faces.append(faces + offset)
+        offset += len(vertices)
+    return np.vstack(all_vertices), np.vstack(all_faces)
+
+
+def _title(params, names):
+    return ", ".join(f"{name}={params[name]:.3g}" if isinstance(params[name], float) else f"{name}={params[name]}"
+                     for name in names if name in params)
+
+
+def preview_sweep(variants, output_path='parameter_studie.png', processes=None, num_r=10, num_angles=None,
+                  columns=None):
+    """
+    Rechnet die Netze aller Varianten parallel und speichert sie als Übersichtsbild (PNG/SVG).
+
+    Fehlgeschlagene Varianten bleiben als leere Zelle mit Fehlermeldung im Bild.
+    """
+    from vorschau import contact_sheet
+
+    # Im Titel nur die Parameter, die sich zwischen den Varianten unterscheiden
+    names = list(dict.fromkeys(name for params in variants for name in params))
+    varying = [name for name in names if len({repr(params.get(name)) for params in variants}) > 1] or names
+
+    items = [None] * len(variants)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {pool.submit(variant_mesh, params, num_r, num_angles): job for job, params in enumerate(variants)}
+        for future in as_completed(futures):
+            job = futures[future]
+            title = f"{job}: {_title(variants[job], varying)}"
+            try:
+                vertices, faces = future.result()
+                items[job] = (title, vertices, faces)
+            except Exception as e:
+                items[job] = (f"{title}\n{type(e).__name__}", None, [])
+
+    contact_sheet(items, output_path, columns=columns)
+    print(f"Übersichtsbild gespeichert: {output_path}")
+    return output_path
+
+
+def _columns(rows):
+    """Wandelt eine Liste von Ergebnis-Dictionaries in Spalten um."""
+    names = []
+    for row in rows:
+        names.extend(name for name in row if name not in names)
+    columns = {}
+    for name in names:
+        values = [row.get(name, np.nan) for row in rows]
+        if all(isinstance(value, str) for value in values):
+            columns[name] = np.array(values, dtype=str)
+        else:
+            columns[name] = np.array([np.nan if isinstance(value, str) else value for value in values])
+    return columns
+
+
+def save_results(columns, output_path):
+    """
+    Speichert die Ergebnistabelle als .npz oder, falls pandas/pyarrow vorhanden sind, als .parquet.
+    """
+    if output_path.endswith('.parquet'):
+        try:
+            import pandas as pd
+            pd.DataFrame(columns).to_parquet(output_path)
+            return output_path
+        except ImportError:
+            output_path = os.path.splitext(output_path)[0] + '.npz'
+            print(f"pandas/pyarrow nicht verfügbar, speichere stattdessen {output_path}")
+    np.savez(output_path, **columns)
+    return output_path
+
+
+def run_sweep(variants, output_path='parameter_studie.npz', processes=None, num_r=10, num_angles=None):
+    """
+    Rechnet alle Varianten parallel in einem Prozesspool und speichert eine Ergebnistabelle.
+
+    Rückgabe: Spalten der Ergebnistabelle (Dictionary Name -> Array).
+    """
+    rows = [None] * len(variants)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {pool.submit(run_variant, params, num_r, num_angles=num_angles): job for job, params in enumerate(variants)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            rows[job] = future.result()
+            rows[job]['job'] = job
+            print(f"Variante {job} fertig ({done}/{len(variants)}), {rows[job]['zeit_gesamt']:.2f} s")
+
+    columns = _columns(rows)
+    output_path = save_results(columns, output_path)
+    print(f"Ergebnisse gespeichert: {output_path}")
+    return columns
+
+
+# Beispielaufruf: Gitterstudie über Bauchfaktor und Breite
+if __name__ == "__main__":
+    variants = grid_parameters({
+        'bauchfaktor': [0.1, 0.2, 0.3],
+        'faktor_12': [-0.1, 0.0],
+        'breite': [2.0],
+        'num_points': [60],
+    })
+    run_sweep(variants, output_path='parameter_studie.npz')
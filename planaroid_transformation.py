@@ -1,6 +1,5 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from tkinter import Tk, filedialog
+from kurven import load_points as load_curve_points
 
 class Randpunkte:
     def __init__(self, file_path=None):
@@ -9,6 +8,8 @@ class Randpunkte:
         self.points = self.load_points(file_path)
 
     def ask_file(self):
+        from tkinter import Tk, filedialog
+
         root = Tk()
         root.withdraw()  # Verhindert, dass das Hauptfenster angezeigt wird
         file_path = filedialog.askopenfilename(title="Wähle die Datei mit den Randpunkten",
@@ -19,64 +20,149 @@ class Randpunkte:
 
     def load_points(self, file_path):
         try:
-            points = np.loadtxt(file_path, delimiter=",")
+            points = load_curve_points(file_path)
         except Exception as e:
             raise ValueError(f"Fehler beim Einlesen der Datei: {e}")
         return points
 
+def fit_planes(point_sets):
+    """
+    Ausgleichsebenen vieler Punktmengen in einem Schritt.
+
+    Die Kovarianzmatrizen aller Mengen werden über Segmentsummen gebildet und
+    gestapelt mit eigh zerlegt; die Normale ist der Eigenvektor zum kleinsten
+    Eigenwert (entspricht der letzten Zeile von vh der SVD). Die Normalen werden
+    so ausgerichtet, dass ihre z-Komponente nicht negativ ist.
+    Rückgabe: Schwerpunkte (N, 3) und Normalen (N, 3).
+    """
+    sets = [np.asarray(points, dtype=float) for points in point_sets]
+    counts = np.array([len(points) for points in sets])
+    if len(sets) == 0 or counts.min() < 3:
+        raise ValueError("Für jede Ebene werden mindestens drei Punkte benötigt.")
+    points = np.vstack(sets)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    centroids = np.add.reduceat(points, starts, axis=0) / counts[:, None]
+    centered = points - np.repeat(centroids, counts, axis=0)
+    outer = (centered[:, :, None] * centered[:, None, :]).reshape(-1, 9)
+    covariance = np.add.reduceat(outer, starts, axis=0).reshape(-1, 3, 3)
+    _, eigenvectors = np.linalg.eigh(covariance)
+    normals = eigenvectors[:, :, 0]
+    normals *= np.where(normals[:, 2] < 0, -1.0, 1.0)[:, None]
+    return centroids, normals
+
+
+def plane_rotations(normals):
+    """
+    Rotationsmatrizen (N, 3, 3), die die Normalen auf die z-Achse drehen.
+
+    Rodrigues-Formel in der Form R = I + K + K^2 / (1 + cos), K aus n x z.
+    """
+    normals = np.asarray(normals, dtype=float)
+    axis = np.cross(normals, [0.0, 0.0, 1.0])
+    cosine = normals[:, 2]
+    K = np.zeros((len(normals), 3, 3))
+    K[:, 0, 1], K[:, 0, 2] = -axis[:, 2], axis[:, 1]
+    K[:, 1, 0], K[:, 1, 2] = axis[:, 2], -axis[:, 0]
+    K[:, 2, 0], K[:, 2, 1] = -axis[:, 1], axis[:, 0]
+    return np.eye(3) + K + (K @ K) / (1.0 + cosine)[:, None, None]
+
+
+class PlaneFrames:
+    """
+    Ebenen-Koordinatensysteme vieler Punktmengen (z.B. aller Seitenflächen eines Rahmens).
+
+    Je Menge werden Schwerpunkt, Rotation in die XY-Ebene und deren Inverse
+    (die Transponierte) gespeichert. transform_all und inverse_transform_all
+    bilden alle Mengen in einem vektorisierten Schritt ab; der Schwerpunkt bleibt
+    wie bei PlaneFitter an seiner Stelle.
+    """
+
+    def __init__(self, centroids, rotations):
+        self.centroids = np.asarray(centroids, dtype=float)
+        self.rotations = np.asarray(rotations, dtype=float)
+        self.inverse_rotations = np.transpose(self.rotations, (0, 2, 1))
+
+    @classmethod
+    def fit(cls, point_sets):
+        centroids, normals = fit_planes(point_sets)
+        return cls(centroids, plane_rotations(normals))
+
+    def __len__(self):
+        return len(self.centroids)
+
+    def transform(self, index, points):
+        """Dreht eine Punktmenge in die XY-Ebene ihres Systems."""
+        centroid = self.centroids[index]
+        return (np.asarray(points) - centroid) @ self.rotations[index].T + centroid
+
+    def inverse_transform(self, index, points):
+        """Bildet Punkte aus der XY-Ebene zurück in die ursprüngliche Lage."""
+        centroid = self.centroids[index]
+        return (np.asarray(points) - centroid) @ self.inverse_rotations[index].T + centroid
+
+    def _apply(self, point_sets, matrices):
+        sets = [np.asarray(points, dtype=float) for points in point_sets]
+        if len(sets) != len(self):
+            raise ValueError(f"{len(sets)} Punktmengen für {len(self)} Ebenen übergeben.")
+        counts = [len(points) for points in sets]
+        frame = np.repeat(np.arange(len(sets)), counts)
+        centroid = self.centroids[frame]
+        centered = np.vstack(sets) - centroid
+        result = np.einsum('pij,pj->pi', matrices[frame], centered) + centroid
+        return np.split(result, np.cumsum(counts)[:-1])
+
+    def transform_all(self, point_sets):
+        """Dreht alle Punktmengen in einem Schritt in die XY-Ebene ihres jeweiligen Systems."""
+        return self._apply(point_sets, self.rotations)
+
+    def inverse_transform_all(self, point_sets):
+        """Bildet alle Punktmengen in einem Schritt aus der XY-Ebene zurück."""
+        return self._apply(point_sets, self.inverse_rotations)
+
+
 class PlaneFitter:
     def __init__(self, points):
         self.points = points
+        self.centroid = None
         self.normal = None
         self.rotation_matrix = None
 
     def fit_plane(self):
-        # Berechne die Normalenrichtung mittels PCA
-        centroid = np.mean(self.points, axis=0)
-        centered_points = self.points - centroid
-        _, _, vh = np.linalg.svd(centered_points)
-        self.normal = vh[-1]  # Die letzte Spalte entspricht der Normalenrichtung
-        
+        # Berechne Schwerpunkt und Normalenrichtung einmal und speichere beide
+        centroids, normals = fit_planes([self.points])
+        self.centroid = centroids[0]
+        self.normal = normals[0]
+
     def calculate_rotation_matrix(self):
         if self.normal is None:
             raise ValueError("Ebene wurde noch nicht berechnet. Führe fit_plane() zuerst aus.")
 
-        z_axis = np.array([0, 0, 1])
-        axis = np.cross(self.normal, z_axis)
-        axis_norm = np.linalg.norm(axis)
-        if axis_norm == 0:  # Punkte sind bereits in der XY-Ebene
-            self.rotation_matrix = np.eye(3)
-        else:
-            axis = axis / axis_norm
-            angle = np.arccos(np.dot(self.normal, z_axis))
-            K = np.array([
-                [0, -axis[2], axis[1]],
-                [axis[2], 0, -axis[0]],
-                [-axis[1], axis[0], 0]
-            ])
-            self.rotation_matrix = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * np.dot(K, K)
+        # Bei Punkten in der XY-Ebene ergibt sich die Einheitsmatrix
+        self.rotation_matrix = plane_rotations(self.normal[None, :])[0]
 
     def transform_points(self):
         if self.rotation_matrix is None:
             raise ValueError("Rotationsmatrix wurde noch nicht berechnet. Führe calculate_rotation_matrix() zuerst aus.")
 
-        centroid = np.mean(self.points, axis=0)
-        centered_points = self.points - centroid
+        centered_points = self.points - self.centroid
         transformed_points = np.dot(centered_points, self.rotation_matrix.T)
-        return transformed_points + centroid
+        return transformed_points + self.centroid
 
     def inverse_transform_points(self, transformed_points):
         if self.rotation_matrix is None:
             raise ValueError("Rotationsmatrix wurde noch nicht berechnet. Führe calculate_rotation_matrix() zuerst aus.")
 
-        centroid = np.mean(self.points, axis=0)
-        centered_points = transformed_points - centroid
-        original_points = np.dot(centered_points, np.linalg.inv(self.rotation_matrix).T)
-        return original_points + centroid
+        # Die Inverse einer Rotationsmatrix ist ihre Transponierte
+        centered_points = transformed_points - self.centroid
+        original_points = np.dot(centered_points, self.rotation_matrix)
+        return original_points + self.centroid
 
 class Visualizer:
     @staticmethod
     def plot_points(original_points, transformed_points, reconstructed_points):
+        import matplotlib.pyplot as plt
+
         fig = plt.figure()
         ax = fig.add_subplot(111, projection='3d')
 
@@ -87,7 +173,7 @@ class Visualizer:
         ax.legend()
         plt.show()
 
-if __name__ == "__main__":
+def main():
     randpunkte = Randpunkte()
     fitter = PlaneFitter(randpunkte.points)
 
@@ -98,3 +184,7 @@ if __name__ == "__main__":
     reconstructed_points = fitter.inverse_transform_points(transformed_points)
 
     Visualizer.plot_points(randpunkte.points, transformed_points, reconstructed_points)
+
+
+if __name__ == "__main__":
+    main()
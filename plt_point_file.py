@@ -1,10 +1,10 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from tkinter import Tk, filedialog
+from kurven import load_curves
 
 # Funktion zum Öffnen einer Datei und Einlesen der Kurvendaten
 def open_and_plot_file():
+    import matplotlib.pyplot as plt
+    from tkinter import Tk, filedialog
+
     # Erstelle ein verstecktes Tkinter-Fenster
     root = Tk()
     root.withdraw()  # Verstecke das Hauptfenster
@@ -20,24 +20,8 @@ def open_and_plot_file():
         return
 
     # Lese die Kurvendaten aus der Datei
-    curves = []
-    with open(file_path, 'r') as file:
-        current_curve = []
-        for line in file:
-            line = line.strip()
-            if line:
-                # Lese die Koordinaten (x, y, z) als Tupel
-                point = tuple(map(float, line.split(',')))
-                current_curve.append(point)
-            else:
-                # Wenn eine leere Zeile gefunden wird, wird die aktuelle Kurve abgeschlossen
-                if current_curve:
-                    curves.append(np.array(current_curve))
-                    current_curve = []
-
-        # Füge die letzte Kurve hinzu, falls die Datei nicht mit einer leeren Zeile endet
-        if current_curve:
-            curves.append(np.array(current_curve))
+    # Die Kurven sind durch Leerzeilen getrennt
+    curves = load_curves(file_path)
 
     # Überprüfen, ob Kurven erfolgreich eingelesen wurden
     if not curves:
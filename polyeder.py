@@ -0,0 +1,111 @@
+import numpy as np
+
+
+def quadratic_basis(num_points):
+    """
+    Basisfunktionen der Kantenkurve durch Anfangs-, Mittel- und Endpunkt, (num_points, 3).
+
+    Ein kubischer Spline mit not-a-knot-Randbedingung durch drei Punkte ist die
+    Parabel durch diese Punkte (wie create_spline_curve in tetraeder.py), in
+    Lagrange-Form bei t = 0, 0.5, 1: 2t²-3t+1, 4t-4t², 2t²-t.
+    """
+    t = np.linspace(0, 1, num_points)
+    return np.column_stack((2 * t**2 - 3 * t + 1, 4 * t - 4 * t**2, 2 * t**2 - t))
+
+
+def _cycle_edges(faces):
+    """Start- und Endvertex aller Seiten der Flächen sowie die Flächengrenzen im flachen Array."""
+    sizes = np.array([len(face) for face in faces])
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    start = np.concatenate([np.asarray(face, dtype=np.int64) for face in faces])
+    # Nachfolger innerhalb des eigenen Zyklus: eins weiter, am Zyklusende zurück zum Anfang
+    successor = np.arange(1, len(start) + 1)
+    successor[offsets[1:] - 1] = offsets[:-1]
+    return start, start[successor], offsets
+
+
+class PolyhedronFrame:
+    """
+    Gewölbter Kantenrahmen eines beliebigen Polyeders.
+
+    vertices (V, 3), faces als Liste von Vertexzyklen (beliebige Polygone),
+    edges (E, 2) optional (sonst aus den Flächen bestimmt). bulge ist ein
+    Bauchfaktor für alle Kanten oder ein Array (E,): der Kantenmittelpunkt wird um
+    bulge * (Mitte - Zentrum) nach außen verschoben. Alle Kantenkurven werden in
+    einem Schritt als (E, num_points, 3)-Array ausgewertet.
+    """
+
+    def __init__(self, vertices, faces, edges=None, bulge=0.2, num_points=300, center=None):
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.faces = [np.asarray(face) for face in faces]
+        self.num_points = num_points
+        self.center = self.vertices.mean(axis=0) if center is None else np.asarray(center, dtype=float)
+
+        num_vertices = len(self.vertices)
+        start, end, self.face_offsets = _cycle_edges(self.faces)
+        face_keys = np.minimum(start, end) * num_vertices + np.maximum(start, end)
+        if edges is None:
+            keys = np.unique(face_keys)
+            self.edges = np.column_stack((keys // num_vertices, keys % num_vertices))
+        else:
+            self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+            keys = np.minimum(self.edges[:, 0], self.edges[:, 1]) * num_vertices + self.edges.max(axis=1)
+
+        # Jede Flächenseite ihrer Kante zuordnen und merken, ob sie gegen die Kantenrichtung läuft
+        order = np.argsort(keys, kind='stable')
+        position = np.minimum(np.searchsorted(keys, face_keys, sorter=order), len(keys) - 1)
+        self.face_edges = order[position]
+        if not np.array_equal(keys[self.face_edges], face_keys):
+            raise ValueError("Flächen enthalten Seiten, die nicht unter den Kanten vorkommen.")
+        self.face_reversed = start != self.edges[self.face_edges, 0]
+
+        self.bulge = np.broadcast_to(np.asarray(bulge, dtype=float), (len(self.edges),))
+        self._curves = None
+
+    @property
+    def midpoints(self):
+        """Nach außen verschobene Kantenmittelpunkte (E, 3)."""
+        middle = self.vertices[self.edges].mean(axis=1)
+        return middle + (middle - self.center) * self.bulge[:, None]
+
+    @property
+    def curves(self):
+        """Kantenkurven (E, num_points, 3) in Kantenrichtung, einmal für alle Kanten berechnet."""
+        if self._curves is None:
+            control = np.stack((self.vertices[self.edges[:, 0]], self.midpoints, self.vertices[self.edges[:, 1]]), axis=1)
+            self._curves = np.einsum('nk,ekd->end', quadratic_basis(self.num_points), control)
+        return self._curves
+
+    def face_curves(self):
+        """Randkurven jeder Fläche in Kantenrichtung und in der Reihenfolge ihres Vertexzyklus."""
+        curves = self.curves[self.face_edges]
+        return np.split(curves, self.face_offsets[1:-1])
+
+    def face_loops(self):
+        """
+        Geschlossene Randschleife jeder Fläche als (K, 3)-Array.
+
+        Die Kurven werden entlang des Vertexzyklus ausgerichtet, der jeweils doppelte
+        Endpunkt entfällt, sodass sich die Schleifen direkt für Rand oder
+        kurven.resample_loop eignen.
+        """
+        curves = self.curves[self.face_edges]
+        curves = np.where(self.face_reversed[:, None, None], curves[:, ::-1], curves)[:, :-1]
+        return [loop.reshape(-1, 3) for loop in np.split(curves, self.face_offsets[1:-1])]
+
+    def save(self, prefix='', names=None):
+        """Speichert die Randkurven jeder Fläche im Kurvenformat, Dateinamen aus names oder 'flaeche_<i>'."""
+        from kurven import save_curves
+
+        names = names or [f'flaeche_{i}' for i in range(len(self.faces))]
+        for name, curves in zip(names, self.face_curves()):
+            save_curves(prefix + name + '.txt', curves)
+
+
+# Beispielaufruf: gewölbter Würfelrahmen mit 12 Kanten und 6 Seitenflächen
+if __name__ == "__main__":
+    corners = np.array([[x, y, z] for z in (0, 1) for y in (0, 1) for x in (0, 1)], dtype=float)
+    cube_faces = [[0, 2, 3, 1], [4, 5, 7, 6], [0, 1, 5, 4], [2, 6, 7, 3], [0, 4, 6, 2], [1, 3, 7, 5]]
+    frame = PolyhedronFrame(corners, cube_faces, bulge=0.15, num_points=100)
+    loops = frame.face_loops()
+    print(f"{len(frame.edges)} Kanten, {len(loops)} Flächen mit je {len(loops[0])} Randpunkten")
@@ -1,4 +1,3 @@
-from scipy.interpolate import interp1d, CubicSpline
 import numpy as np
 
 class Rand:
@@ -24,30 +23,81 @@ class Rand:
         self.r_points_sorted = self.r_points_sorted[unique_indices]
         self.z_points_sorted = self.z_points_sorted[unique_indices]
 
-        # Wähle den Interpolationstyp
+        # Die Interpolation wird erst bei der ersten Verwendung aufgebaut (SciPy wird dann importiert)
         self.interpolation_type = interpolation_type.lower()
+        self._radius_interp = None
+        self._z_interp = None
+        self._index = None
+
+    @classmethod
+    def from_curves(cls, curves, num_points=None, mode='arc', interpolation_type='cubic', tol=None):
+        """
+        Erzeugt den Rand aus einzelnen Randkurven, z.B. aus kurven.load_curves.
+
+        Die Kurven werden zu einer Schleife verkettet, die doppelten Eckpunkte
+        verschweißt und mit num_points Punkten nach Bogenlänge ('arc') oder
+        Krümmung ('curvature') neu abgetastet. num_points legt damit die Zahl der
+        Winkel im Netz von SurfaceEvolverInput fest.
+        """
+        from kurven import prepare_boundary
+
+        return cls(prepare_boundary(curves, num_points, mode=mode, tol=tol), interpolation_type=interpolation_type)
+
+    @property
+    def radius_interp(self):
+        """Interpolation des Radius als Funktion des Winkels."""
+        if self._radius_interp is None:
+            self._build_interpolation()
+        return self._radius_interp
+
+    @property
+    def z_interp(self):
+        """Interpolation der Z-Koordinate als Funktion des Winkels."""
+        if self._z_interp is None:
+            self._build_interpolation()
+        return self._z_interp
+
+    @property
+    def index(self):
+        """Räumlicher Index über die (x, y)-Koordinaten der Randpunkte, wird bei Bedarf aufgebaut."""
+        if self._index is None:
+            from raumindex import SpatialIndex
+            self._index = SpatialIndex(np.column_stack((self.x_points, self.y_points)))
+        return self._index
+
+    def nearestZ(self, x, y):
+        """
+        Gibt die Z-Koordinate des in der XY-Ebene nächstgelegenen Randpunkts zurück.
+        """
+        _, indices = self.index.nearest(np.stack(np.broadcast_arrays(x, y), axis=-1))
+        return self.z_points[indices]
+
+    def _build_interpolation(self):
+        from scipy.interpolate import interp1d, CubicSpline
+
+        # Wähle den Interpolationstyp
         try:
             if self.interpolation_type == 'cubic':
                 # Kubische Interpolation des Radius und der Z-Koordinate als Funktion des Winkels
-                self.radius_interp = CubicSpline(
+                self._radius_interp = CubicSpline(
                     self.phi_points_sorted, 
                     self.r_points_sorted, 
                     extrapolate=True
                 )
-                self.z_interp = CubicSpline(
+                self._z_interp = CubicSpline(
                     self.phi_points_sorted, 
                     self.z_points_sorted, 
                     extrapolate=True
                 )
             elif self.interpolation_type == 'linear':
                 # Lineare Interpolation des Radius und der Z-Koordinate als Funktion des Winkels
-                self.radius_interp = interp1d(
+                self._radius_interp = interp1d(
                     self.phi_points_sorted, 
                     self.r_points_sorted, 
                     kind='linear', 
                     fill_value="extrapolate"
                 )
-                self.z_interp = interp1d(
+                self._z_interp = interp1d(
                     self.phi_points_sorted, 
                     self.z_points_sorted, 
                     kind='linear', 
@@ -58,13 +108,13 @@ class Rand:
         except ValueError as e:
             print(f"Fehler bei der Interpolation: {e}. Verwende lineare Interpolation.")
             # Fallback auf lineare Interpolation
-            self.radius_interp = interp1d(
+            self._radius_interp = interp1d(
                 self.phi_points_sorted, 
                 self.r_points_sorted, 
                 kind='linear', 
                 fill_value="extrapolate"
             )
-            self.z_interp = interp1d(
+            self._z_interp = interp1d(
                 self.phi_points_sorted, 
                 self.z_points_sorted, 
                 kind='linear', 
@@ -105,7 +155,7 @@ class Rand:
         return self.radius_interp(phi)
 
 # Test der Rand-Klasse
-if __name__ == "__main__":
+def main():
     # Beispielpunkte
     from minimal_surface import read_file
     points, file_path = read_file()
@@ -125,4 +175,8 @@ if __name__ == "__main__":
 
     # Test: Hole den Radius für einen gegebenen Winkel
     radius = rand.getRadius(phi)
-    print(f"Interpolierter Radius bei phi={phi}: {radius}")
\ No newline at end of file
+    print(f"Interpolierter Radius bei phi={phi}: {radius}")
+
+
+if __name__ == "__main__":
+    main()
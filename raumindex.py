@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class SpatialIndex:
+    """
+    Räumlicher Index (KD-Baum) über einer festen Punktmenge.
+
+    Der Baum wird einmal aufgebaut, danach beantworten nearest und within ganze
+    Abfragefelder in einem Aufruf in O(n log m). Abfragepunkte dürfen beliebig
+    geformt sein, solange die letzte Achse die Koordinaten enthält; die
+    Ergebnisse haben dieselbe vordere Form.
+    """
+
+    def __init__(self, points, leafsize=16):
+        from scipy.spatial import cKDTree
+
+        self.points = np.asarray(points, dtype=float)
+        if self.points.ndim != 2:
+            raise ValueError("Die Punkte müssen als (N, D)-Array übergeben werden.")
+        self.tree = cKDTree(self.points, leafsize=leafsize)
+
+    @classmethod
+    def from_mesh(cls, vertices, faces=None):
+        """Index über die Vertices eines Netzes oder, mit faces, über die Dreiecksschwerpunkte."""
+        vertices = np.asarray(vertices, dtype=float)
+        if faces is None:
+            return cls(vertices)
+        return cls(vertices[np.asarray(faces)].mean(axis=1))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _query_points(self, query):
+        query = np.asarray(query, dtype=float)
+        if query.shape[-1] != self.points.shape[1]:
+            raise ValueError(f"Abfragepunkte haben {query.shape[-1]} statt {self.points.shape[1]} Koordinaten.")
+        return query.reshape(-1, self.points.shape[1]), query.shape[:-1]
+
+    def nearest(self, query, k=1, max_distance=np.inf, workers=1):
+        """
+        Die k nächsten Punkte zu jedem Abfragepunkt.
+
+        Rückgabe: Abstände und Indizes mit der Form der Abfrage (bei k > 1 mit
+        zusätzlicher letzter Achse k). Ohne Treffer innerhalb von max_distance ist
+        der Abstand inf und der Index len(self).
+        """
+        flat, shape = self._query_points(query)
+        distances, indices = self.tree.query(flat, k=k, distance_upper_bound=max_distance, workers=workers)
+        tail = () if k == 1 else (k,)
+        return distances.reshape(shape + tail), indices.reshape(shape + tail)
+
+    def within(self, query, radius, workers=1):
+        """
+        Alle Punkte im Umkreis radius um jeden Abfragepunkt.
+
+        Rückgabe: Objekt-Array in der Form der Abfrage mit je einem Indexarray.
+        """
+        flat, shape = self._query_points(query)
+        neighbors = self.tree.query_ball_point(flat, radius, workers=workers)
+        result = np.empty(len(flat), dtype=object)
+        for i, indices in enumerate(neighbors):
+            result[i] = np.asarray(indices, dtype=int)
+        return result.reshape(shape)
+
+    def count_within(self, query, radius, workers=1):
+        """Anzahl der Punkte im Umkreis radius um jeden Abfragepunkt."""
+        flat, shape = self._query_points(query)
+        counts = self.tree.query_ball_point(flat, radius, workers=workers, return_length=True)
+        return np.asarray(counts).reshape(shape)
+
+    def pairs(self, radius):
+        """Alle Punktpaare (i, j) mit i < j und Abstand höchstens radius als (P, 2)-Array."""
+        return self.tree.query_pairs(radius, output_type='ndarray')
+
+
+# Beispielaufruf: nächster Randpunkt für ein Gitter
+if __name__ == "__main__":
+    angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    boundary = np.column_stack((np.cos(angles), np.sin(angles)))
+    index = SpatialIndex(boundary)
+
+    X, Y = np.meshgrid(np.linspace(-1, 1, 200), np.linspace(-1, 1, 200))
+    distances, indices = index.nearest(np.stack((X, Y), axis=-1))
+    print(f"Größter Abstand zum Rand: {distances.max():.4f}, Gitterform {indices.shape}")
@@ -0,0 +1,225 @@
+import numpy as np
+
+# Zielwerte, für die FrameSensitivity Ableitungen liefert
+ZIELWERTE = ('area', 'side_force_coefficient')
+
+
+def _scatter_area_gradient(vertices, faces, area_gradient):
+    """
+    Verteilt die Ableitung nach den Flächenvektoren a (M, 3) auf die Vertices.
+
+    Mit a = 1/2 (p1 - p0) x (p2 - p0) gilt d(g·a)/dp0 = 1/2 (p1 - p2) x g und zyklisch.
+    """
+    p = vertices[faces]
+    corner = 0.5 * np.cross(np.roll(p, -1, axis=1) - np.roll(p, -2, axis=1), area_gradient[:, None, :])
+    return np.column_stack([np.bincount(faces.ravel(), weights=corner[:, :, k].ravel(), minlength=len(vertices))
+                            for k in range(3)])
+
+
+def objective_gradients(vertices, faces, wind_direction=(0.0, 1.0, 0.0)):
+    """
+    Fläche und Seitenkraftbeiwert einer offenen Fläche samt Ableitungen nach den Vertices.
+
+    Die Werte entsprechen flaechenanalyse.total_area und side_force_coefficient
+    mit closed=False: C = sum(2 |a·w|³ / |a|²) / sum(|a·w|).
+    Rückgabe: Dictionary Name -> (Wert, Gradient (N, 3)).
+    """
+    from flaechenanalyse import area_vectors
+
+    wind = np.array(wind_direction, dtype=float)
+    wind /= np.linalg.norm(wind)
+    a = area_vectors(vertices, faces)
+    areas = np.linalg.norm(a, axis=1)
+    safe_areas = np.where(areas > 0, areas, 1.0)[:, None]
+    area = areas.sum()
+
+    along = a @ wind
+    force = np.sum(2 * np.abs(along)**3 / safe_areas[:, 0]**2)
+    reference = np.abs(along).sum()
+    coefficient = force / reference if reference > 0 else 0.0
+    d_force = (6 * along * np.abs(along) / safe_areas[:, 0]**2)[:, None] * wind \
+        - (4 * np.abs(along)**3 / safe_areas[:, 0]**4)[:, None] * a
+    d_reference = np.sign(along)[:, None] * wind
+    d_coefficient = (d_force - coefficient * d_reference) / reference if reference > 0 else np.zeros_like(a)
+
+    return {
+        'area': (area, _scatter_area_gradient(vertices, faces, a / safe_areas)),
+        'side_force_coefficient': (coefficient, _scatter_area_gradient(vertices, faces, d_coefficient)),
+    }
+
+
+class FrameSensitivity:
+    """
+    Ableitungen der Kennwerte aus parameter_studie.run_variant nach den Rahmenparametern.
+
+    Der Rahmen einer Variante wird einmal vernetzt und mit der Kraftdichtemethode
+    gelöst. Die Netztopologie bleibt danach fest; nur die Randknoten folgen den
+    Parametern, indem sie dieselben Punkte der neu abgetasteten Randschleife
+    bleiben (deshalb ist num_angles nötig). Die Ableitung der Randknoten nach den
+    Parametern wird mit zentralen Differenzen über den billigen Randgenerator
+    bestimmt, die Ableitung durch das Gleichgewicht adjungiert
+    (ForceDensitySolver.adjoint_gradient), also mit einem Lösen je Fläche für
+    beliebig viele Parameter.
+
+    Die Zielwerte sind wie in run_variant über alle Seitenflächen summiert
+    (Fläche) bzw. flächengewichtet gemittelt (Seitenkraftbeiwert).
+    """
+
+    def __init__(self, params, names, num_r=10, num_angles=60, wind_direction=(0.0, 1.0, 0.0), step=1e-5):
+        from tetraeder import generate_frame
+        from kraftdichte import ForceDensitySolver
+        from parameter_studie import _frame_arguments, mesh_faces
+        from raumindex import SpatialIndex
+
+        self.params = dict(params)
+        self.names = list(names)
+        self.num_angles = num_angles
+        self.wind_direction = wind_direction
+        self.step = step
+
+        frame = generate_frame(**_frame_arguments(self.params))
+        meshes = mesh_faces(list(frame['seiten'].values()), num_r=num_r, num_angles=num_angles)
+        self.faces, self.solvers, self.loop_index = [], [], []
+        for (vertices, faces, fixed), boundary in zip(meshes, self.boundaries(self.params)):
+            solver = ForceDensitySolver.from_mesh(vertices, faces, fixed)
+            solver.solve()
+            # Jeder Randknoten ist ein Punkt der abgetasteten Randschleife
+            _, index = SpatialIndex(boundary).nearest(vertices[fixed])
+            self.faces.append(faces)
+            self.solvers.append(solver)
+            self.loop_index.append(index)
+
+    def boundaries(self, params):
+        """Abgetastete Randschleifen aller Seitenflächen für die Parameter, ohne Vernetzung."""
+        from tetraeder import generate_frame
+        from parameter_studie import _frame_arguments
+        from kurven import prepare_boundary
+
+        frame = generate_frame(**_frame_arguments(params))
+        return [prepare_boundary(curves, num_points=self.num_angles) for curves in frame['seiten'].values()]
+
+    def boundary_positions(self, params):
+        """Lage der Randknoten jeder Fläche (K, 3) für die Parameter."""
+        return [boundary[index] for boundary, index in zip(self.boundaries(params), self.loop_index)]
+
+    def boundary_jacobian(self):
+        """Ableitung der Randknoten nach den Parametern je Fläche (K, 3, P), zentrale Differenzen."""
+        columns = []
+        for name in self.names:
+            forward, backward = dict(self.params), dict(self.params)
+            forward[name] = self.params[name] + self.step
+            backward[name] = self.params[name] - self.step
+            columns.append([(f - b) / (2 * self.step)
+                            for f, b in zip(self.boundary_positions(forward), self.boundary_positions(backward))])
+        return [np.stack(face_columns, axis=-1) for face_columns in zip(*columns)]
+
+    def _combine(self, values, objective):
+        """Setzt den Gesamtwert und seine Ableitungen je Fläche aus den Flächenwerten zusammen."""
+        if objective not in ZIELWERTE:
+            raise ValueError(f"Unbekannter Zielwert '{objective}'. Wähle {', '.join(ZIELWERTE)}.")
+        if objective == 'area':
+            return sum(value['area'][0] for value in values), [value['area'][1] for value in values]
+        # Flächengewichtetes Mittel: J = sum(A_i C_i) / sum(A_i)
+        total_area = sum(value['area'][0] for value in values)
+        mean = sum(value['area'][0] * value[objective][0] for value in values) / total_area
+        gradients = [(value[objective][0] - mean) * value['area'][1] / total_area
+                     + value['area'][0] * value[objective][1] / total_area for value in values]
+        return mean, gradients
+
+    def evaluate(self, objective='area'):
+        """Zielwert der aktuellen Gleichgewichtslagen und seine Ableitung nach allen Knoten je Fläche."""
+        values = [objective_gradients(solver.vertices, faces, self.wind_direction)
+                  for solver, faces in zip(self.solvers, self.faces)]
+        return self._combine(values, objective)
+
+    def gradient(self, objective='area'):
+        """
+        Zielwert und Gradient nach den Parametern, adjungiert durch das Gleichgewicht.
+
+        Rückgabe: (Wert, Gradient (P,)).
+        """
+        value, vertex_gradients = self.evaluate(objective)
+        gradient = np.zeros(len(self.names))
+        for solver, vertex_gradient, jacobian in zip(self.solvers, vertex_gradients, self.boundary_jacobian()):
+            gradient += np.einsum('kd,kdp->p', solver.adjoint_gradient(vertex_gradient), jacobian)
+        return value, gradient
+
+    def finite_difference_gradient(self, objective='area', step=None):
+        """
+        Gradient mit zentralen Differenzen über die ganze Kette bei fester Netztopologie.
+
+        Je Parameter werden nur die Randknoten verschoben und das Gleichgewicht neu
+        gelöst; die Kraftdichten ändern sich nicht, daher wird die Faktorisierung
+        jeder Fläche wiederverwendet. Dient vor allem zur Kontrolle von gradient.
+        """
+        step = self.step if step is None else step
+        base = [solver.vertices.copy() for solver in self.solvers]
+        gradient = np.zeros(len(self.names))
+        for p, name in enumerate(self.names):
+            results = []
+            for sign in (1, -1):
+                shifted = dict(self.params)
+                shifted[name] = self.params[name] + sign * step
+                for solver, positions in zip(self.solvers, self.boundary_positions(shifted)):
+                    solver.vertices[solver.fixed] = positions
+                    solver.solve()
+                results.append(self.evaluate(objective)[0])
+            gradient[p] = (results[0] - results[1]) / (2 * step)
+        for solver, vertices in zip(self.solvers, base):
+            solver.vertices[:] = vertices
+        return self.evaluate(objective)[0], gradient
+
+
+def optimize_frame(params, names, bounds=None, objective='area', maximize=False, num_r=10, num_angles=60,
+                   wind_direction=(0.0, 1.0, 0.0), max_iterations=20, callback=None):
+    """
+    Sucht die Rahmenparameter names mit L-BFGS-B und adjungierten Gradienten.
+
+    Jede Auswertung vernetzt den Rahmen neu und braucht ein Gleichgewicht plus
+    ein adjungiertes Lösen je Fläche. bounds: Liste von (untere, obere Grenze)
+    je Parameter. callback(Nummer der Auswertung, Parameter, Wert) wird nach
+    jeder Auswertung aufgerufen.
+    Rückgabe: (beste Parameter, Verlauf als Liste von (Parameter, Wert)).
+    """
+    from scipy.optimize import minimize
+
+    sign = -1.0 if maximize else 1.0
+    history = []
+
+    def evaluate(x):
+        current = dict(params)
+        current.update(zip(names, map(float, x)))
+        value, gradient = FrameSensitivity(current, names, num_r, num_angles, wind_direction).gradient(objective)
+        history.append((current, value))
+        if callback is not None:
+            callback(len(history), current, value)
+        return sign * value, sign * gradient
+
+    result = minimize(evaluate, [params[name] for name in names], jac=True, method='L-BFGS-B', bounds=bounds,
+                      options={'maxiter': max_iterations})
+    best = dict(params)
+    best.update(zip(names, map(float, result.x)))
+    return best, history
+
+
+def _format(params, names):
+    return ", ".join(f"{name}={params[name]:.4g}" for name in names)
+
+
+# Beispielaufruf: Gradient prüfen und Seitenkraftbeiwert über zwei Bauchfaktoren minimieren
+if __name__ == "__main__":
+    params = {'bauchfaktor': 0.2, 'faktor_12': -0.1, 'num_points': 60}
+    names = ['bauchfaktor', 'faktor_12']
+
+    sensitivity = FrameSensitivity(params, names)
+    for objective in ZIELWERTE:
+        value, adjoint = sensitivity.gradient(objective)
+        _, differences = sensitivity.finite_difference_gradient(objective)
+        print(f"{objective} = {value:.6g}: adjungiert {adjoint}, Differenzen {differences}")
+
+    def report(evaluation, current, value):
+        print(f"Auswertung {evaluation}: side_force_coefficient = {value:.6g}, {_format(current, names)}")
+
+    best, history = optimize_frame(params, names, bounds=[(0.0, 0.4), (-0.2, 0.2)],
+                                   objective='side_force_coefficient', callback=report)
+    print(f"Bestes Ergebnis nach {len(history)} Auswertungen: {_format(best, names)}")
@@ -1,27 +1,106 @@
 import subprocess
 import os
+import re
 import time
 import threading
-import tkinter as tk
-from tkinter import scrolledtext
 import logging
+from collections import deque
+from logging.handlers import RotatingFileHandler
 
-# Konfiguriere Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 evolver_executable_path = r'C:\Evolver\evolver.exe'
 
+# Einstellungen der GUI-Ausgabe
+output_log_path = 'evolver_output.log'  # Vollständige Ausgabe, rotierend
+output_log_max_bytes = 5 * 1024 * 1024
+output_log_backup_count = 3
+gui_flush_interval_ms = 100  # Die GUI übernimmt die gesammelten Zeilen in diesem Takt
+gui_buffer_lines = 2000  # Größe des Ringpuffers zwischen Evolver und GUI
+gui_max_lines = 5000  # Zeilen, die im Textfeld stehen bleiben
+
+# Iterationszeile des Evolvers, z.B. " 12. area:  3.14159265 energy:  3.14159265  scale: 0.231"
+_energy_pattern = re.compile(
+    r'^\s*(?:(\d+)\.\s+)?area:\s*(\S+)\s+energy:\s*(\S+)(?:\s+scale:\s*(\S+))?'
+)
+
+
+def parse_energy(line):
+    """Liest Iteration, Fläche, Energie und Skalierung aus einer Iterationszeile oder gibt None zurück."""
+    match = _energy_pattern.match(line)
+    if not match:
+        return None
+    iteration, area, energy, scale = match.groups()
+    try:
+        return {
+            'iteration': int(iteration) if iteration else None,
+            'area': float(area),
+            'energy': float(energy),
+            'scale': float(scale) if scale else None,
+        }
+    except ValueError:
+        return None
+
+
+def output_logger(path=output_log_path):
+    """Logger, der die komplette Evolver-Ausgabe in eine rotierende Logdatei schreibt."""
+    output_log = logging.getLogger(f"{__name__}.output")
+    if not output_log.handlers:
+        handler = RotatingFileHandler(path, maxBytes=output_log_max_bytes,
+                                      backupCount=output_log_backup_count, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        output_log.addHandler(handler)
+        output_log.setLevel(logging.INFO)
+        output_log.propagate = False
+    return output_log
+
+
+class OutputBuffer:
+    """
+    Begrenzter, threadsicherer Ringpuffer zwischen den Lesethreads und der GUI.
+
+    Läuft der Puffer über, fallen die ältesten Zeilen heraus und werden gezählt;
+    sie stehen weiterhin in der Logdatei. Iterationszeilen werden nicht als Text
+    gepuffert, sondern nur als letzter Energiewert gemerkt.
+    """
+
+    def __init__(self, maxlen=gui_buffer_lines):
+        self.lines = deque(maxlen=maxlen)
+        self.lock = threading.Lock()
+        self.dropped = 0
+        self.energy = None
+
+    def push(self, text):
+        energy = parse_energy(text)
+        with self.lock:
+            if energy is not None:
+                self.energy = energy
+                return
+            if len(self.lines) == self.lines.maxlen:
+                self.dropped += 1
+            self.lines.append(text)
+
+    def drain(self):
+        """Gibt alle gepufferten Zeilen, die Zahl der übersprungenen Zeilen und die letzte Energie zurück."""
+        with self.lock:
+            lines = list(self.lines)
+            self.lines.clear()
+            dropped, self.dropped = self.dropped, 0
+            return lines, dropped, self.energy
+
 
 class SurfaceEvolverAutomation:
-    def __init__(self, input_file_path, output_format='OFF', gui=None):
-        """Initialisiere mit Eingabedatei, gewünschtem Ausgabeformat und GUI-Referenz."""
+    def __init__(self, input_file_path, output_format='OFF', gui=None, publisher=None):
+        """
+        Initialisiere mit Eingabedatei, gewünschtem Ausgabeformat und GUI-Referenz.
+
+        publisher (netzstrom.MeshPublisher) erhält Iteration und Energie jeder
+        Iterationszeile, damit andere Prozesse den Verlauf ohne GUI verfolgen können.
+        """
         self.input_file_path = os.path.abspath(input_file_path)
         self.output_format = output_format.lower()
         self.gui = gui
+        self.publisher = publisher
         self.process = None
         self.optimization_running = False
         logger.info(f"Initialized for file: {self.input_file_path}, format: {output_format}")
@@ -49,18 +128,32 @@ class SurfaceEvolverAutomation:
         return self.process
 
     def forward_output_to_gui(self):
-        """Leite Ausgaben des Evolvers an die GUI weiter."""
+        """Leite Ausgaben des Evolvers an die GUI weiter, stderr in einem eigenen Thread."""
+        threading.Thread(target=self.forward_errors_to_gui, daemon=True).start()
         try:
-            while self.process.poll() is None:
-                output = self.process.stdout.readline()
+            # Blockierendes Lesen bis zum Dateiende, damit die Pipe nie vollläuft
+            for output in self.process.stdout:
                 if output.strip():
                     self.gui.append_output(output.strip())
-                error = self.process.stderr.readline()
+                    self.publish_energy(output)
+        except Exception as e:
+            logger.error(f"Error forwarding output: {e}")
+
+    def forward_errors_to_gui(self):
+        """Leite die Fehlerausgabe des Evolvers an die GUI weiter."""
+        try:
+            for error in self.process.stderr:
                 if error.strip():
                     self.gui.append_output(f"ERROR: {error.strip()}")
-                time.sleep(0.1)
         except Exception as e:
-            logger.error(f"Error forwarding output: {e}")
+            logger.error(f"Error forwarding errors: {e}")
+
+    def publish_energy(self, line):
+        """Gibt Iteration und Energie einer Iterationszeile an den publisher weiter."""
+        energy = parse_energy(line) if self.publisher is not None else None
+        if energy is not None:
+            iteration = energy['iteration'] if energy['iteration'] is not None else -1
+            self.publisher.publish_status(iteration, energy=energy['energy'])
 
     def send_command(self, command):
         """Sende einen Befehl an den Surface Evolver, ohne auf Feedback zu warten."""
@@ -99,6 +192,7 @@ class SurfaceEvolverAutomation:
                     received_feedback += 1
                     if self.gui:
                         self.gui.append_output(output.strip())
+                    self.publish_energy(output)
         except Exception as e:
             logger.error(f"Failed to send command '{command}' or wait for response: {e}")
             raise
@@ -126,6 +220,48 @@ class SurfaceEvolverAutomation:
         finally:
             self.gui.append_output("Optimization stopped.")
 
+    def evolve(self, output_file, rounds=5, timeout=None, stop_event=None, log_file=None):
+        """
+        Entwickelt die Fläche ohne GUI und speichert das Ergebnis als OFF-Datei.
+
+        Alle Befehle (rounds-mal die Folge aus optimize, danach der Export wie in
+        save_output) werden auf einmal an den Evolver übergeben. Die Ausgabe geht
+        in log_file statt in eine Pipe, damit der Prozess nie auf einen vollen Puffer
+        wartet. Mit timeout (Sekunden) oder gesetztem stop_event wird der Prozess
+        beendet. Rückgabe: Pfad der OFF-Datei.
+        """
+        commands = []
+        for _ in range(rounds):
+            commands += ["V"] * 10 + ["u"] * 10 + ["g 50"]
+        commands += ["P", "6", os.path.abspath(output_file), "q"]
+        log_file = log_file or os.path.splitext(output_file)[0] + '.log'
+
+        with open(log_file, 'w') as log:
+            self.process = subprocess.Popen([evolver_executable_path, self.input_file_path], stdin=subprocess.PIPE,
+                                            stdout=log, stderr=subprocess.STDOUT, universal_newlines=True)
+            logger.info(f"Evolver started without GUI for file: {self.input_file_path}")
+            try:
+                self.process.stdin.write("\n".join(commands) + "\n")
+                self.process.stdin.close()
+                start_time = time.time()
+                while True:
+                    try:
+                        self.process.wait(timeout=1.0)
+                        break
+                    except subprocess.TimeoutExpired:
+                        if stop_event is not None and stop_event.is_set():
+                            raise RuntimeError(f"Evolver run stopped: {self.input_file_path}")
+                        if timeout is not None and time.time() - start_time > timeout:
+                            raise TimeoutError(f"Evolver did not finish within {timeout} s: {self.input_file_path}")
+            finally:
+                if self.process.poll() is None:
+                    self.process.kill()
+                    self.process.wait()
+
+        if not os.path.exists(output_file):
+            raise RuntimeError(f"Evolver wrote no output (exit code {self.process.returncode}), see {log_file}")
+        return output_file
+
     def save_output(self):
         """Speichert die optimierte Datei."""
         timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -140,6 +276,9 @@ class SurfaceEvolverAutomation:
 
 class EvolverGUI:
     def __init__(self, root):
+        import tkinter as tk
+        from tkinter import scrolledtext
+
         self.root = root
         self.root.title("Surface Evolver GUI")
 
@@ -163,15 +302,42 @@ class EvolverGUI:
         self.save_button = tk.Button(self.control_frame, text="Save Output", command=self.save_output)
         self.save_button.pack(side=tk.LEFT, padx=5)
 
+        # Laufende Anzeige der Energie statt der Iterationszeilen
+        self.energy_var = tk.StringVar(value="Energy: -")
+        self.energy_label = tk.Label(root, textvariable=self.energy_var, font=('Courier', 10))
+        self.energy_label.pack(pady=5)
+
         self.evolver = None
+        self.buffer = OutputBuffer()
+        self.output_log = output_logger()
+        self._shown_energy = None
+        self.root.after(gui_flush_interval_ms, self.flush_output)
 
     def append_output(self, text):
-        """Fügt Text in das Ausgabefeld ein."""
-        def safe_insert():
-            self.output_text.insert(tk.END, f"{text}\n")
-            self.output_text.see(tk.END)
-
-        self.root.after(0, safe_insert)
+        """Übergibt eine Zeile an Logdatei und Ringpuffer; threadsicher, die GUI übernimmt sie beim nächsten Flush."""
+        self.output_log.info(text)
+        self.buffer.push(text)
+
+    def flush_output(self):
+        """Übernimmt alle gesammelten Zeilen in einem Schritt in das Textfeld und kürzt es."""
+        lines, dropped, energy = self.buffer.drain()
+        if dropped:
+            lines.insert(0, f"... {dropped} lines skipped, see {output_log_path}")
+        if lines:
+            self.output_text.insert('end', "\n".join(lines) + "\n")
+            excess = int(self.output_text.index('end-1c').split('.')[0]) - 1 - gui_max_lines
+            if excess > 0:
+                self.output_text.delete('1.0', f"{excess + 1}.0")
+            self.output_text.see('end')
+        if energy is not None and energy != self._shown_energy:
+            self._shown_energy = energy
+            text = f"Energy: {energy['energy']:.10g}   Area: {energy['area']:.10g}"
+            if energy['scale'] is not None:
+                text += f"   Scale: {energy['scale']:.4g}"
+            if energy['iteration'] is not None:
+                text += f"   Step: {energy['iteration']}"
+            self.energy_var.set(text)
+        self.root.after(gui_flush_interval_ms, self.flush_output)
 
     def start_evolver(self, file_path):
         """Startet den Evolver-Prozess."""
@@ -207,8 +373,19 @@ class EvolverGUI:
             self.evolver.save_output()
 
 
-if __name__ == "__main__":
+def main():
+    import tkinter as tk
+
+    # Konfiguriere Logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     root = tk.Tk()
     gui = EvolverGUI(root)
     threading.Thread(target=lambda: gui.start_evolver("surface_evolver_input.fe"), daemon=True).start()
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,196 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from flaechenanalyse import enclosed_volume, total_area
+
+
+class VolumeConstrainedSurface:
+    """
+    Minimalfläche mit Volumenvorgabe oder Innendruck für aufgeblasene Kissen.
+
+    Mit volume wird die Fläche unter der Nebenbedingung V(x) = volume minimiert,
+    der Lagrange-Multiplikator der Nebenbedingung ist der Innendruck (bezogen auf
+    die Flächenspannung 1). Mit pressure wird stattdessen A(x) - pressure * V(x)
+    minimiert. Ohne beides bleibt das Anfangsvolumen erhalten, wie bei einem
+    Evolver-Körper ohne Angabe.
+
+    Die Gradienten von Fläche und Volumen werden je Dreieckecke berechnet und mit
+    einer einmal aufgebauten dünnbesetzten Summationsmatrix auf die Vertices
+    verteilt. Das Volumen ist nach flaechenanalyse.enclosed_volume definiert;
+    offene Flächen brauchen daher einen festen Rand.
+    """
+
+    def __init__(self, vertices, faces, fixed=None, volume=None, pressure=None):
+        if volume is not None and pressure is not None:
+            raise ValueError("Entweder ein Volumen oder einen Druck vorgeben, nicht beides.")
+        self.vertices = np.array(vertices, dtype=float)
+        self.faces = np.asarray(faces, dtype=int)
+        num_vertices = len(self.vertices)
+        self.fixed = np.zeros(num_vertices, dtype=bool) if fixed is None else np.asarray(fixed, dtype=bool)
+        self.pressure = pressure
+        if pressure is None and volume is None:
+            volume = enclosed_volume(self.vertices, self.faces)
+        self.target_volume = volume
+        self.multiplier = 0.0 if pressure is None else pressure
+
+        # Summationsmatrix Vertices x Dreieckecken, gilt für jede Lage des Netzes
+        corners = 3 * len(self.faces)
+        self._assembly = csr_matrix((np.ones(corners), (self.faces.ravel(), np.arange(corners))),
+                                    shape=(num_vertices, corners))
+
+    @classmethod
+    def from_fe(cls, file_path, volume=None, pressure=None):
+        """Lädt Netz und feste Vertices aus einer .fe-Datei."""
+        from abwicklung_evolver import parse_fe
+
+        vertices, faces, fixed = parse_fe(file_path)
+        return cls(vertices, faces, fixed, volume=volume, pressure=pressure)
+
+    def area(self, x=None):
+        return total_area(self.vertices if x is None else x, self.faces)
+
+    def volume(self, x=None):
+        return enclosed_volume(self.vertices if x is None else x, self.faces)
+
+    def energy(self, x=None):
+        """Fläche, bei vorgegebenem Druck abzüglich pressure * Volumen."""
+        if self.pressure is None:
+            return self.area(x)
+        return self.area(x) - self.pressure * self.volume(x)
+
+    def gradients(self, x=None):
+        """
+        Gradienten von Fläche und Volumen nach den Vertexkoordinaten, je (N, 3).
+
+        dA/dp_i = 1/2 n x (p_k - p_j) mit der Einheitsnormalen n, dV/dp_i = (p_j x p_k) / 6
+        für jede Ecke i mit den im Umlaufsinn folgenden Ecken j, k.
+        """
+        x = self.vertices if x is None else x
+        p = x[self.faces]
+        following, opposite = np.roll(p, -1, axis=1), np.roll(p, -2, axis=1)
+        normal = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+        length = np.linalg.norm(normal, axis=1)
+        normal /= np.where(length > 0, length, 1.0)[:, None]
+        area_corner = 0.5 * np.cross(normal[:, None, :], opposite - following)
+        volume_corner = np.cross(following, opposite) / 6.0
+        return self._assembly @ area_corner.reshape(-1, 3), self._assembly @ volume_corner.reshape(-1, 3)
+
+    def vertex_areas(self, x=None):
+        """Ein Drittel der angrenzenden Dreiecksflächen je Vertex (konzentrierte Masse)."""
+        x = self.vertices if x is None else x
+        p = x[self.faces]
+        areas = 0.5 * np.linalg.norm(np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]), axis=1)
+        return self._assembly @ np.repeat(areas / 3.0, 3)
+
+    def project_volume(self, x, iterations=5, tol=1e-12):
+        """Verschiebt die freien Vertices entlang des Volumengradienten, bis das Zielvolumen erreicht ist."""
+        for _ in range(iterations):
+            error = self.target_volume - self.volume(x)
+            if abs(error) <= tol * max(abs(self.target_volume), 1e-300):
+                break
+            _, volume_gradient = self.gradients(x)
+            volume_gradient[self.fixed] = 0.0
+            x = x + volume_gradient * (error / np.sum(volume_gradient**2))
+        return x
+
+    def preconditioner(self, x=None):
+        """
+        Faktorisierte Steifigkeit der Flächenenergie auf den freien Vertices.
+
+        Kotangens-Laplace-Matrix (dA = L x, wie bei Pinkall-Polthier), negative
+        Kotangenswerte stumpfer Winkel auf null gesetzt, damit die Matrix positiv
+        definit bleibt, plus ein kleiner Massenanteil für Netze ohne feste Vertices.
+        """
+        from scipy.sparse import diags
+        from scipy.sparse.linalg import splu
+
+        x = self.vertices if x is None else x
+        p = x[self.faces]
+        following, opposite = np.roll(p, -1, axis=1) - p, np.roll(p, -2, axis=1) - p
+        cross = np.linalg.norm(np.cross(following, opposite), axis=2)
+        cot = np.einsum('tkd,tkd->tk', following, opposite) / np.where(cross > 0, cross, 1.0)
+        weight = np.maximum(0.5 * cot, 0.0).ravel()
+
+        # Die Kante gegenüber Ecke k verbindet die beiden anderen Ecken
+        i = np.roll(self.faces, -1, axis=1).ravel()
+        j = np.roll(self.faces, -2, axis=1).ravel()
+        num_vertices = len(x)
+        laplace = csr_matrix((np.concatenate((-weight, -weight, weight, weight)),
+                              (np.concatenate((i, j, i, j)), np.concatenate((j, i, i, j)))),
+                             shape=(num_vertices, num_vertices))
+        masses = self.vertex_areas(x)
+        stiffness = laplace + diags(masses / masses.sum())
+        free = ~self.fixed
+        return splu(stiffness[free][:, free].tocsc())
+
+    def solve(self, max_steps=200, tol=1e-3, callback=None):
+        """
+        Vorkonditioniertes Abstiegsverfahren mit Lagrange-Multiplikator.
+
+        Die Richtung d löst K d = λ dV - dA mit der Matrix aus preconditioner; bei
+        Volumenvorgabe wird λ so gewählt, dass d den linearisierten Volumenfehler
+        behebt. Danach wird das Volumen exakt wiederhergestellt und die Schrittweite
+        halbiert, bis die Energie sinkt. Abbruch, wenn der Normalanteil der
+        Restkraft dA - λ dV relativ zu |dA| kleiner als tol ist.
+        Rückgabe: (konvergiert, Anzahl Schritte, relative Restkraft)
+        """
+        x = self.vertices
+        if self.pressure is None:
+            x = self.project_volume(x)
+        free = ~self.fixed
+        energy = self.energy(x)
+        residual = np.inf
+
+        for iteration in range(1, max_steps + 1):
+            area_gradient, volume_gradient = self.gradients(x)
+            area_gradient, volume_gradient = area_gradient[free], volume_gradient[free]
+            lu = self.preconditioner(x)
+            area_direction, volume_direction = lu.solve(area_gradient), lu.solve(volume_gradient)
+            if self.pressure is None:
+                error = self.target_volume - self.volume(x)
+                self.multiplier = ((error + np.sum(volume_gradient * area_direction))
+                                   / np.sum(volume_gradient * volume_direction))
+            force = self.multiplier * volume_gradient - area_gradient
+            # Nur der Normalanteil zählt; tangentiale Kräfte verschieben die Vertices bloß in der Fläche
+            normals = volume_gradient / np.maximum(np.linalg.norm(volume_gradient, axis=1), 1e-300)[:, None]
+            normal_force = np.einsum('ij,ij->i', force, normals)
+            residual = np.linalg.norm(normal_force) / max(np.linalg.norm(area_gradient), 1e-300)
+            if residual < tol:
+                break
+
+            direction = np.zeros_like(x)
+            direction[free] = self.multiplier * volume_direction - area_direction
+            alpha = 1.0
+            while alpha > 1e-10:
+                trial = x + alpha * direction
+                if self.pressure is None:
+                    trial = self.project_volume(trial)
+                trial_energy = self.energy(trial)
+                if trial_energy <= energy:
+                    x, energy = trial, trial_energy
+                    break
+                alpha *= 0.5
+            else:
+                break
+
+            if callback is not None:
+                callback(iteration, x, residual)
+
+        self.vertices = x
+        return bool(residual < tol), iteration, residual
+
+
+# Beispielaufruf: quadratisches Kissen mit festem Rand aufblasen
+if __name__ == "__main__":
+    from flaechenanalyse import grid_mesh
+
+    X, Y = np.meshgrid(np.linspace(-1, 1, 21), np.linspace(-1, 1, 21))
+    vertices, faces = grid_mesh(X, Y, np.zeros_like(X))
+    fixed = (np.abs(vertices[:, 0]) == 1) | (np.abs(vertices[:, 1]) == 1)
+    # Leicht gewölbte Startform, damit der Volumengradient nicht verschwindet
+    vertices[:, 2] = 0.1 * (1 - vertices[:, 0]**2) * (1 - vertices[:, 1]**2)
+
+    cushion = VolumeConstrainedSurface(vertices, faces, fixed, volume=1.0)
+    converged, steps, residual = cushion.solve()
+    print(f"Konvergiert: {converged} nach {steps} Schritten, Restkraft {residual:.2e}")
+    print(f"Fläche {cushion.area():.5f}, Volumen {cushion.volume():.5f}, Innendruck {cushion.multiplier:.5f}")
@@ -0,0 +1,228 @@
+import numpy as np
+
+# Standardansicht wie bei matplotlib 3D: Elevation und Azimut in Grad
+STANDARD_ANSICHT = (30.0, -60.0)
+
+
+def _figure(size, dpi):
+    """Figure mit Agg-Canvas, unabhängig von pyplot und ohne Anzeige."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def view_basis(view=STANDARD_ANSICHT):
+    """
+    Orthonormalbasis der Ansicht: rechts, oben und Blickrichtung zum Betrachter.
+
+    view: (Elevation, Azimut) in Grad wie bei matplotlib.
+    """
+    elevation, azimuth = np.radians(view)
+    towards_eye = np.array([np.cos(elevation) * np.cos(azimuth), np.cos(elevation) * np.sin(azimuth), np.sin(elevation)])
+    right = np.array([-np.sin(azimuth), np.cos(azimuth), 0.0])
+    up = np.cross(towards_eye, right)
+    return right, up, towards_eye
+
+
+def cluster_vertices(vertices, faces, max_faces):
+    """
+    Vereinfacht ein Netz für die Vorschau durch Vertex-Clustering auf einem Raster.
+
+    Alle Vertices einer Rasterzelle werden zu ihrem Mittelpunkt zusammengelegt,
+    entartete und doppelte Dreiecke entfallen. Das Raster wird so lange vergröbert,
+    bis höchstens max_faces Dreiecke übrig sind. Schnell, aber nicht formtreu wie
+    dezimierung.decimate; für die Anzeige genügt das.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces)
+    if len(faces) <= max_faces:
+        return vertices, faces
+
+    lower = vertices.min(axis=0)
+    extent = np.ptp(vertices, axis=0).max()
+    cells = max(int(np.sqrt(max_faces / 2)), 2)
+    while True:
+        keys = np.floor((vertices - lower) / (extent / cells)).astype(np.int64)
+        _, cluster, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+        cluster = cluster.ravel()
+        positions = np.column_stack([np.bincount(cluster, weights=vertices[:, k]) for k in range(3)]) / counts[:, None]
+
+        clustered = cluster[faces]
+        valid = ((clustered[:, 0] != clustered[:, 1]) & (clustered[:, 1] != clustered[:, 2])
+                 & (clustered[:, 2] != clustered[:, 0]))
+        clustered = clustered[valid]
+        _, first = np.unique(np.sort(clustered, axis=1), axis=0, return_index=True)
+        clustered = clustered[np.sort(first)]
+        if len(clustered) <= max_faces or cells <= 2:
+            return positions, clustered
+        cells = max(int(cells * 0.7), 2)
+
+
+def project_faces(vertices, faces, view=STANDARD_ANSICHT, cull=False, values=None, color='tab:blue',
+                  cmap='viridis', ambient=0.35):
+    """
+    Projiziert ein Netz orthographisch in die Bildebene und schattiert die Dreiecke.
+
+    Die Dreiecke werden von hinten nach vorn sortiert (Maleralgorithmus). Mit
+    cull=True entfallen vom Betrachter abgewandte Dreiecke, was nur bei
+    geschlossenen, nach außen orientierten Netzen sinnvoll ist. values färbt die
+    Dreiecke nach einem Kennwert je Dreieck (z.B. Dehnung) statt einheitlich.
+    Rückgabe: Polygone (M, 3, 2) und RGBA-Farben (M, 4).
+    """
+    from matplotlib import colormaps
+    from matplotlib.colors import Normalize, to_rgba
+
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces)
+    right, up, towards_eye = view_basis(view)
+    screen = np.column_stack((vertices @ right, vertices @ up))
+    depth = vertices @ towards_eye
+
+    p = vertices[faces]
+    normal = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    length = np.linalg.norm(normal, axis=1)
+    normal /= np.where(length > 0, length, 1.0)[:, None]
+    facing = normal @ towards_eye
+
+    polygons = screen[faces]
+    # Dreiecke ohne projizierte Fläche (von der Kante gesehen) tragen nichts zum Bild bei
+    edge1, edge2 = polygons[:, 1] - polygons[:, 0], polygons[:, 2] - polygons[:, 0]
+    projected_area = np.abs(edge1[:, 0] * edge2[:, 1] - edge1[:, 1] * edge2[:, 0])
+    visible = projected_area > 1e-12 * max(np.ptp(screen, axis=0).max(), 1e-300)**2
+    if cull:
+        visible &= facing > 0
+
+    if values is None:
+        base = np.tile(to_rgba(color), (len(faces), 1))
+    else:
+        values = np.asarray(values, dtype=float)
+        base = colormaps[cmap](Normalize(np.nanmin(values), np.nanmax(values))(values))
+
+    # Lambert-Beleuchtung, beidseitig für offene Flächen
+    light = towards_eye + 0.5 * up + 0.3 * right
+    light /= np.linalg.norm(light)
+    brightness = ambient + (1 - ambient) * np.abs(normal @ light)
+    colors = base.copy()
+    colors[:, :3] *= brightness[:, None]
+
+    order = np.argsort(depth[faces].mean(axis=1)[visible], kind='stable')
+    ids = np.flatnonzero(visible)[order]
+    return polygons[ids], colors[ids]
+
+
+def project_curves(curves, view=STANDARD_ANSICHT):
+    """Projiziert Kurven (Liste von (K, 3)-Arrays) in die Bildebene."""
+    right, up, _ = view_basis(view)
+    return [np.column_stack((np.asarray(curve) @ right, np.asarray(curve) @ up)) for curve in curves]
+
+
+def _finish(fig, ax, file_path):
+    ax.set_aspect('equal')
+    ax.autoscale_view()
+    ax.set_axis_off()
+    if file_path is not None:
+        fig.savefig(file_path, bbox_inches='tight')
+    return fig
+
+
+def render_mesh(vertices, faces, file_path=None, view=STANDARD_ANSICHT, max_faces=20000, cull=False,
+                values=None, cmap='viridis', color='tab:blue', curves=None, title=None, size=(6, 6), dpi=100):
+    """
+    Rendert ein Netz ohne Bildschirm als PNG/SVG (Format nach Dateiendung).
+
+    Netze mit mehr als max_faces Dreiecken werden vorher per Vertex-Clustering
+    vereinfacht (nicht bei values, die je Dreieck gelten). curves zeichnet
+    zusätzlich Randkurven. Rückgabe: die matplotlib-Figure.
+    """
+    from matplotlib.collections import LineCollection, PolyCollection
+
+    if values is None:
+        vertices, faces = cluster_vertices(vertices, faces, max_faces)
+    polygons, colors = project_faces(vertices, faces, view, cull, values, color, cmap)
+
+    fig = _figure(size, dpi)
+    ax = fig.add_subplot(111)
+    # Bei dichten Netzen die Kanten in Flächenfarbe zeichnen, das schließt die Antialiasing-Fugen
+    edge_colors = (0, 0, 0, 0.3) if len(polygons) < 3000 else colors
+    ax.add_collection(PolyCollection(polygons, facecolors=colors, edgecolors=edge_colors, linewidths=0.3))
+    if curves is not None:
+        ax.add_collection(LineCollection(project_curves(curves, view), colors='red', linewidths=1.0))
+    if title:
+        ax.set_title(title)
+    return _finish(fig, ax, file_path)
+
+
+def render_curves(curves, file_path=None, view=STANDARD_ANSICHT, title=None, size=(6, 6), dpi=100):
+    """Rendert Randkurven ohne Bildschirm als PNG/SVG."""
+    from matplotlib.collections import LineCollection
+
+    fig = _figure(size, dpi)
+    ax = fig.add_subplot(111)
+    ax.add_collection(LineCollection(project_curves(curves, view), colors='tab:blue', linewidths=1.0))
+    if title:
+        ax.set_title(title)
+    return _finish(fig, ax, file_path)
+
+
+def contact_sheet(items, file_path, columns=None, view=STANDARD_ANSICHT, max_faces=3000, cull=False,
+                  color='tab:blue', thumb_size=2.0, dpi=100):
+    """
+    Stellt viele Netze als Übersichtsbild nebeneinander dar.
+
+    items: Liste von (Titel, vertices, faces). Jedes Netz wird vereinfacht,
+    projiziert, auf seine Zelle skaliert und alle Dreiecke werden gemeinsam in
+    einer einzigen PolyCollection gezeichnet, daher bleibt auch ein Bogen mit
+    hunderten Varianten schnell. Rückgabe: die matplotlib-Figure.
+    """
+    from matplotlib.collections import PolyCollection
+
+    if not items:
+        raise ValueError("Keine Netze für das Übersichtsbild vorhanden.")
+    columns = columns or int(np.ceil(np.sqrt(len(items))))
+    rows = int(np.ceil(len(items) / columns))
+
+    all_polygons, all_colors = [], []
+    fig = _figure((columns * thumb_size, rows * thumb_size), dpi)
+    ax = fig.add_axes((0, 0, 1, 1))
+    for number, (title, vertices, faces) in enumerate(items):
+        row, column = divmod(number, columns)
+        origin = np.array([column, rows - 1 - row], dtype=float)
+        ax.text(origin[0] + 0.5, origin[1] + 0.97, title, ha='center', va='top', fontsize=6)
+        if vertices is None or len(faces) == 0:
+            continue
+        polygons, colors = project_faces(*cluster_vertices(vertices, faces, max_faces), view, cull, color=color)
+        if len(polygons) == 0:
+            continue
+        lower = polygons.reshape(-1, 2).min(axis=0)
+        extent = np.ptp(polygons.reshape(-1, 2), axis=0)
+        scale = 0.8 / max(extent.max(), 1e-300)
+        offset = origin + 0.5 - 0.5 * scale * extent - np.array([0.0, 0.05])
+        all_polygons.append((polygons - lower) * scale + offset)
+        all_colors.append(colors)
+
+    if all_polygons:
+        all_colors = np.concatenate(all_colors)
+        ax.add_collection(PolyCollection(np.concatenate(all_polygons), facecolors=all_colors,
+                                         edgecolors=all_colors, linewidths=0.2))
+    ax.set_xlim(0, columns)
+    ax.set_ylim(0, rows)
+    ax.set_aspect('equal')
+    ax.set_axis_off()
+    fig.savefig(file_path)
+    return fig
+
+
+# Beispielaufruf: Vorschau eines OFF-Netzes ohne Bildschirm
+if __name__ == "__main__":
+    import sys
+    import os
+    from abwicklung_evolver import parse_off
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else 'symm_aussen.off'
+    vertices, faces = parse_off(file_path)
+    output_file_path = os.path.splitext(file_path)[0] + '_vorschau.png'
+    render_mesh(vertices, faces, output_file_path, title=os.path.basename(file_path))
+    print(f"Vorschau gespeichert: {output_file_path}")
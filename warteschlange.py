@@ -0,0 +1,326 @@
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+
+# Unterverzeichnisse der Warteschlange; ein Auftrag liegt immer in genau einem davon
+ZUSTAENDE = ('pending', 'running', 'done', 'failed')
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def _write_json(path, data):
+    """Schreibt über eine temporäre Datei und os.replace, Leser sehen nie eine halbe Datei."""
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=1, default=float)
+    os.replace(temporary, path)
+
+
+class Lease:
+    """Ein beanspruchter Auftrag; path ist die Datei in running, deren Änderungszeit der Herzschlag ist."""
+
+    def __init__(self, job, path):
+        self.job = job
+        self.path = path
+        self.lost = threading.Event()
+
+
+class JobQueue:
+    """
+    Auftragswarteschlange in einem gemeinsamen Verzeichnis (lokal oder NFS/SMB).
+
+    Jeder Auftrag ist eine JSON-Datei, sein Zustand das Unterverzeichnis, in dem
+    sie liegt. Alle Übergänge sind os.rename innerhalb eines Dateisystems und damit
+    atomar: Wer die Umbenennung gewinnt, besitzt den Auftrag, alle anderen erhalten
+    FileNotFoundError und versuchen den nächsten. Ein laufender Auftrag heißt
+    running/<id>~<token>.json; der Token gehört zur Beanspruchung, sodass ein
+    Arbeiter, dessen Lease abgelaufen ist, einen inzwischen neu vergebenen Auftrag
+    nicht versehentlich abschließt.
+
+    Der Arbeiter erneuert die Lease, indem er die Änderungszeit der Datei setzt.
+    Ist sie älter als lease_timeout, gilt der Arbeiter als tot: reap legt den
+    Auftrag zurück nach pending oder nach max_attempts Versuchen nach failed.
+    Die Uhren der Knoten müssen dafür grob (deutlich genauer als lease_timeout)
+    übereinstimmen. Geänderte Aufträge werden zuerst nach tmp umbenannt, dort
+    beschrieben und dann weitergereicht, damit nie zwei Kopien sichtbar sind.
+    Stirbt ein Prozess dazwischen, holt reap den Auftrag nach lease_timeout
+    auch aus tmp zurück.
+    """
+
+    def __init__(self, directory, lease_timeout=120.0, max_attempts=3):
+        self.directory = os.path.abspath(directory)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        for state in ZUSTAENDE + ('tmp', 'results'):
+            os.makedirs(os.path.join(self.directory, state), exist_ok=True)
+
+    def _path(self, state, name):
+        return os.path.join(self.directory, state, name)
+
+    def submit(self, job_type, max_attempts=None, **args):
+        """Legt einen Auftrag an. Rückgabe: Auftragsnummer (nach Einstellzeit sortierbar)."""
+        job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        job = {
+            'id': job_id,
+            'type': job_type,
+            'args': args,
+            'attempts': 0,
+            'max_attempts': self.max_attempts if max_attempts is None else max_attempts,
+            'submitted': time.time(),
+            'history': [],
+        }
+        # In tmp schreiben und erst vollständig nach pending verschieben
+        temporary = self._path('tmp', f"{job_id}.json")
+        _write_json(temporary, job)
+        os.rename(temporary, self._path('pending', f"{job_id}.json"))
+        return job_id
+
+    def claim(self, worker):
+        """Beansprucht den ältesten wartenden Auftrag. Rückgabe: Lease oder None."""
+        self.reap()
+        for name in sorted(os.listdir(os.path.join(self.directory, 'pending'))):
+            if not name.endswith('.json'):
+                continue
+            job_id = name[:-len('.json')]
+            path = self._path('running', f"{job_id}~{uuid.uuid4().hex}.json")
+            try:
+                # Die Umbenennung behält die Änderungszeit, also zuerst auffrischen,
+                # sonst gälte die neue Lease sofort als abgelaufen
+                os.utime(self._path('pending', name))
+                os.rename(self._path('pending', name), path)
+            except FileNotFoundError:
+                continue  # Ein anderer Arbeiter war schneller
+            job = _read_json(path)
+            job['attempts'] += 1
+            job['history'].append({'worker': worker, 'start': time.time()})
+            _write_json(path, job)
+            return Lease(job, path)
+        return None
+
+    def heartbeat(self, lease):
+        """Erneuert die Lease. Rückgabe: False, wenn sie bereits abgelaufen und vergeben ist."""
+        try:
+            os.utime(lease.path)
+            return True
+        except FileNotFoundError:
+            lease.lost.set()
+            return False
+
+    def _move(self, source, job_id, update, target_state):
+        """Übernimmt source durch Umbenennen nach tmp, ändert den Auftrag und legt ihn in target_state ab."""
+        # Eigener Token, damit auch das Übernehmen aus tmp eine echte Umbenennung ist
+        staging = self._path('tmp', f"{job_id}~{uuid.uuid4().hex}.json")
+        try:
+            os.rename(source, staging)
+        except FileNotFoundError:
+            return False
+        job = _read_json(staging)
+        update(job)
+        _write_json(staging, job)
+        os.rename(staging, self._path(target_state, f"{job_id}.json"))
+        return True
+
+    def _retry_state(self, job):
+        return 'pending' if job['attempts'] < job['max_attempts'] else 'failed'
+
+    def complete(self, lease, result):
+        """Schließt den Auftrag mit result ab. Rückgabe: False, wenn die Lease verloren war."""
+        def update(job):
+            job['history'][-1]['end'] = time.time()
+            job['result'] = result
+
+        return self._move(lease.path, lease.job['id'], update, 'done')
+
+    def fail(self, lease, error):
+        """Meldet einen Fehlschlag; der Auftrag wird wiederholt oder nach max_attempts aufgegeben."""
+        state = self._retry_state(lease.job)
+
+        def update(job):
+            job['history'][-1].update({'end': time.time(), 'error': error})
+
+        return self._move(lease.path, lease.job['id'], update, state)
+
+    def reap(self):
+        """
+        Gibt Aufträge mit abgelaufener Lease frei. Rückgabe: Anzahl freigegebener Aufträge.
+
+        Dazu gehören auch Aufträge, die länger als lease_timeout in tmp liegen: dort
+        ist ein Prozess beim Einstellen oder zwischen zwei Umbenennungen gestorben.
+        Ein Auftrag mit Ergebnis kommt nach done, alle anderen werden wie beim
+        Ablauf der Lease wiederholt oder aufgegeben.
+        """
+        reaped = 0
+        now = time.time()
+        for state in ('running', 'tmp'):
+            directory = os.path.join(self.directory, state)
+            for name in os.listdir(directory):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    if now - os.path.getmtime(path) <= self.lease_timeout:
+                        continue
+                    job = _read_json(path)
+                except (FileNotFoundError, ValueError):
+                    continue  # Gerade abgeschlossen oder noch nicht vollständig geschrieben
+
+                def update(record):
+                    if record['history'] and 'end' not in record['history'][-1]:
+                        record['history'][-1].update({'end': now, 'error': 'Lease abgelaufen'})
+
+                target = 'done' if 'result' in job else self._retry_state(job)
+                reaped += self._move(path, job['id'], update, target)
+        return reaped
+
+    def result_directory(self, job_id):
+        """Verzeichnis für Ausgabedateien eines Auftrags."""
+        path = os.path.join(self.directory, 'results', job_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def status(self):
+        """Anzahl der Aufträge je Zustand."""
+        return {state: sum(name.endswith('.json') for name in os.listdir(os.path.join(self.directory, state)))
+                for state in ZUSTAENDE}
+
+    def jobs(self, state='done'):
+        """Alle Aufträge eines Zustands, nach Einstellzeit sortiert."""
+        directory = os.path.join(self.directory, state)
+        return [_read_json(os.path.join(directory, name))
+                for name in sorted(os.listdir(directory)) if name.endswith('.json')]
+
+
+def run_fe_job(args, work_dir, stop_event):
+    """Entwickelt eine vorhandene .fe-Datei mit dem Surface Evolver."""
+    from surface_evolver_automation import SurfaceEvolverAutomation
+
+    output_file = os.path.join(work_dir, os.path.splitext(os.path.basename(args['input']))[0] + '.off')
+    automation = SurfaceEvolverAutomation(args['input'])
+    automation.diagnose_issues()
+    automation.evolve(output_file, rounds=args.get('rounds', 5), timeout=args.get('timeout'), stop_event=stop_event)
+    return {'output': output_file}
+
+
+def run_boundary_job(args, work_dir, stop_event):
+    """Erzeugt aus einer Randkurvendatei das Startnetz als .fe-Datei und entwickelt es."""
+    from kurven import load_curves, prepare_boundary
+    from rand import Rand
+    from SrfaceEvolver import SurfaceEvolverInput
+
+    points = prepare_boundary(load_curves(args['input'], cache=False), num_points=args.get('num_points'))
+    surface_input = SurfaceEvolverInput(Rand(points, interpolation_type='linear'), num_r=args.get('num_r', 20))
+    fe_file = os.path.join(work_dir, os.path.splitext(os.path.basename(args['input']))[0] + '.fe')
+    with open(fe_file, 'w') as file:
+        file.write(surface_input.generate_surface_evolver_input(boundary=args.get('boundary', 'fixed')))
+    return run_fe_job(dict(args, input=fe_file), work_dir, stop_event)
+
+
+def run_variant_job(args, work_dir, stop_event):
+    """Rechnet eine Variante der Parameterstudie (parameter_studie.run_variant)."""
+    from parameter_studie import run_variant
+
+    row = run_variant(args['params'], num_r=args.get('num_r', 10), num_angles=args.get('num_angles'))
+    if row['fehler']:
+        # run_variant fängt alle Ausnahmen; als Fehlschlag melden, damit der Auftrag wiederholt wird
+        raise RuntimeError(row['fehler'])
+    return row
+
+
+# Auftragsarten: Name -> Funktion(args, Ergebnisverzeichnis, stop_event) -> JSON-fähiges Ergebnis
+JOB_TYPES = {
+    'fe': run_fe_job,
+    'boundary': run_boundary_job,
+    'variant': run_variant_job,
+}
+
+
+def _heartbeat(queue, lease, interval, stop):
+    while not stop.wait(interval):
+        if not queue.heartbeat(lease):
+            break
+
+
+def run_worker(directory, worker=None, max_idle=None, poll_interval=2.0, lease_timeout=120.0):
+    """
+    Arbeiter: holt Aufträge aus der Warteschlange, bis max_idle Sekunden lang keiner kam.
+
+    Während ein Auftrag läuft, erneuert ein Thread die Lease im Abstand von einem
+    Drittel der Lease-Zeit. Geht sie verloren, wird stop_event des Auftrags gesetzt
+    (der Evolver-Prozess wird beendet) und das Ergebnis verworfen. Ausnahmen im
+    Auftrag führen zu einem neuen Versuch auf einem beliebigen Knoten.
+    Rückgabe: Anzahl bearbeiteter Aufträge.
+    """
+    queue = JobQueue(directory, lease_timeout=lease_timeout)
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    processed, idle_since = 0, time.time()
+    while max_idle is None or time.time() - idle_since < max_idle:
+        lease = queue.claim(worker)
+        if lease is None:
+            time.sleep(poll_interval)
+            continue
+
+        job = lease.job
+        print(f"[{worker}] Auftrag {job['id']} ({job['type']}), Versuch {job['attempts']}/{job['max_attempts']}")
+        stop = threading.Event()
+        threading.Thread(target=_heartbeat, args=(queue, lease, lease_timeout / 3, stop), daemon=True).start()
+        try:
+            if job['type'] not in JOB_TYPES:
+                raise ValueError(f"Unbekannte Auftragsart '{job['type']}'. Wähle {', '.join(JOB_TYPES)}.")
+            result = JOB_TYPES[job['type']](job['args'], queue.result_directory(job['id']), lease.lost)
+            kept = not lease.lost.is_set() and queue.complete(lease, result)
+        except Exception as e:
+            print(f"[{worker}] Auftrag {job['id']} fehlgeschlagen: {type(e).__name__}: {e}")
+            kept = not lease.lost.is_set() and queue.fail(lease, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+        finally:
+            stop.set()
+        if not kept:
+            print(f"[{worker}] Lease für {job['id']} verloren, Ergebnis verworfen")
+        processed += 1
+        idle_since = time.time()
+    return processed
+
+
+def _print_status(queue):
+    print(", ".join(f"{state}: {count}" for state, count in queue.status().items()))
+
+
+# Beispielaufruf:
+#   python warteschlange.py worker <verzeichnis>            Arbeiter auf einem Knoten starten
+#   python warteschlange.py submit <verzeichnis> a.fe ...   .fe-Dateien einstellen
+#   python warteschlange.py status <verzeichnis>
+#   python warteschlange.py                                 Parameterstudie mit 4 lokalen Arbeitern
+if __name__ == "__main__":
+    import sys
+    import subprocess
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'demo'
+    directory = sys.argv[2] if len(sys.argv) > 2 else 'warteschlange'
+
+    if command == 'worker':
+        run_worker(directory, max_idle=float(sys.argv[3]) if len(sys.argv) > 3 else None)
+    elif command == 'submit':
+        queue = JobQueue(directory)
+        for file_path in sys.argv[3:]:
+            job_type = 'fe' if file_path.endswith('.fe') else 'boundary'
+            print(f"{queue.submit(job_type, input=os.path.abspath(file_path))}: {file_path}")
+    elif command == 'status':
+        _print_status(JobQueue(directory))
+    else:
+        from parameter_studie import grid_parameters
+
+        queue = JobQueue(directory)
+        for params in grid_parameters({'bauchfaktor': [0.1, 0.2, 0.3], 'faktor_12': [-0.1, 0.0], 'num_points': [60]}):
+            queue.submit('variant', params=params)
+        workers = [subprocess.Popen([sys.executable, __file__, 'worker', directory, '5']) for _ in range(4)]
+        for process in workers:
+            process.wait()
+        _print_status(queue)
+        for job in queue.jobs('done'):
+            print(f"{job['id']}: area {job['result'].get('area', float('nan')):.5f} ({job['history'][-1]['worker']})")
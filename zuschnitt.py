@@ -0,0 +1,186 @@
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from scipy.sparse.linalg import splu
+
+from kurven import save_curves
+from netz import Mesh, triangle_gradients
+
+
+def lscm(vertices, faces, pinned=None):
+    """
+    Konforme Abwicklung (Least Squares Conformal Maps) als dünnbesetztes Ausgleichsproblem.
+
+    Zwei Vertices werden festgehalten, standardmäßig ein Randpunkt und der von
+    ihm am weitesten entfernte Punkt derselben Randschleife.
+    Rückgabe: 2D-Koordinaten (N, 2).
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces)
+    num_vertices, num_faces = len(vertices), len(faces)
+    grad, area, _ = triangle_gradients(vertices, faces)
+
+    if pinned is None:
+        loops = Mesh(vertices, faces).boundary_loops()
+        if not loops:
+            raise ValueError("Ein geschlossenes Netz ohne Rand kann nicht abgewickelt werden.")
+        loop = np.array(max(loops, key=len))
+        farthest = loop[np.argmax(np.linalg.norm(vertices[loop] - vertices[loop[0]], axis=1))]
+        pinned = (loop[0], farthest)
+    pinned = np.asarray(pinned)
+    pinned_uv = np.array([[0.0, 0.0], [np.linalg.norm(vertices[pinned[1]] - vertices[pinned[0]]), 0.0]])
+
+    # Cauchy-Riemann je Dreieck: u_x - v_y = 0 und u_y + v_x = 0, gewichtet mit sqrt(Fläche)
+    weight = np.sqrt(area)[:, None]
+    g1, g2 = grad[:, :, 0] * weight, grad[:, :, 1] * weight
+    rows = np.repeat(np.arange(2 * num_faces), 6)
+    cols = np.concatenate((faces, faces + num_vertices), axis=1)  # Spalten u_a, v_a
+    values_r1 = np.concatenate((g1, -g2), axis=1)
+    values_r2 = np.concatenate((g2, g1), axis=1)
+    cols = np.stack((cols, cols), axis=1).reshape(-1)
+    values = np.stack((values_r1, values_r2), axis=1).reshape(-1)
+    M = csr_matrix((values, (rows, cols)), shape=(2 * num_faces, 2 * num_vertices))
+
+    pinned_columns = np.concatenate((pinned, pinned + num_vertices))
+    free = np.ones(2 * num_vertices, dtype=bool)
+    free[pinned_columns] = False
+    M_free = M[:, free].tocsc()
+    rhs = -M[:, pinned_columns] @ np.concatenate((pinned_uv[:, 0], pinned_uv[:, 1]))
+
+    solution = np.zeros(2 * num_vertices)
+    solution[pinned_columns] = np.concatenate((pinned_uv[:, 0], pinned_uv[:, 1]))
+    solution[free] = splu((M_free.T @ M_free).tocsc()).solve(M_free.T @ rhs)
+    return np.column_stack((solution[:num_vertices], solution[num_vertices:]))
+
+
+class ArapFlattening:
+    """
+    Längentreue Abwicklung (As-Rigid-As-Possible) mit lokalen und globalen Schritten.
+
+    Der globale Schritt ist ein Poisson-Problem mit fester Systemmatrix
+    (Kotangens-Laplace), die einmal faktorisiert und in allen Iterationen
+    wiederverwendet wird. Der lokale Schritt bestimmt je Dreieck die nächste
+    Rotation über eine 2x2-SVD.
+    """
+
+    def __init__(self, vertices, faces, uv=None):
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.faces = np.asarray(faces)
+        num_vertices, num_faces = len(self.vertices), len(self.faces)
+        self.grad, self.area, _ = triangle_gradients(self.vertices, self.faces)
+        self.uv = lscm(self.vertices, self.faces) if uv is None else np.array(uv, dtype=float)
+
+        # Gradientenoperator G (2M x N) und gewichtete Laplace-Matrix L = G^T A G
+        rows = (2 * np.arange(num_faces)[:, None] + np.arange(2)[None, :])[:, None, :].repeat(3, axis=1)
+        cols = self.faces[:, :, None].repeat(2, axis=2)
+        self.G = csr_matrix((self.grad.ravel(), (rows.ravel(), cols.ravel())), shape=(2 * num_faces, num_vertices))
+        self.GtA = self.G.T @ diags(np.repeat(self.area, 2))
+        laplace = (self.GtA @ self.G).tocsc()
+
+        # Ein Vertex wird festgehalten, um die Translation zu fixieren
+        self.anchor = 0
+        self.free = np.arange(num_vertices) != self.anchor
+        self._lu = splu(laplace[self.free][:, self.free].tocsc(), permc_spec='MMD_AT_PLUS_A')
+        self._laplace_anchor = laplace[self.free][:, [self.anchor]]
+
+    def jacobians(self, uv=None):
+        """Jacobi-Matrizen (M, 2, 2) der Abbildung vom lokalen Dreieckssystem in die Ebene."""
+        uv = self.uv if uv is None else uv
+        return np.einsum('tac,taj->tcj', uv[self.faces], self.grad)
+
+    def local_step(self):
+        """Nächste Rotation je Dreieck (ohne Spiegelung)."""
+        U, _, Vt = np.linalg.svd(self.jacobians())
+        R = U @ Vt
+        flip = np.linalg.det(R) < 0
+        U[flip, :, 1] *= -1
+        R[flip] = U[flip] @ Vt[flip]
+        return R
+
+    def global_step(self, R):
+        """Löst das Poisson-Problem mit der vorfaktorisierten Laplace-Matrix."""
+        anchor_uv = self.uv[self.anchor]
+        for c in range(2):
+            rhs = self.GtA @ R[:, c, :].ravel()
+            rhs = rhs[self.free] - self._laplace_anchor @ [anchor_uv[c]]
+            self.uv[self.free, c] = self._lu.solve(rhs)
+        return self.uv
+
+    def energy(self):
+        """ARAP-Energie: flächengewichtete Abweichung der Jacobi-Matrizen von Rotationen."""
+        J = self.jacobians()
+        sigma = np.linalg.svd(J, compute_uv=False)
+        return np.sum(self.area * np.sum((sigma - 1)**2, axis=1))
+
+    def run(self, iterations=50, tol=1e-8):
+        """Führt lokale/globale Iterationen aus, bis sich die Energie kaum noch ändert."""
+        previous = np.inf
+        for iteration in range(iterations):
+            self.global_step(self.local_step())
+            current = self.energy()
+            if previous - current < tol * max(current, 1e-30):
+                break
+            previous = current
+        return self.uv
+
+    def strain(self):
+        """
+        Dehnungen je Dreieck aus den Singulärwerten der Jacobi-Matrix.
+
+        Rückgabe: (M, 2) mit maximaler und minimaler Hauptdehnung (sigma - 1).
+        Für den Zuschnitt bedeutet eine negative Dehnung, dass der Stoff in der
+        Ebene kürzer ist als auf der Fläche.
+        """
+        return np.linalg.svd(self.jacobians(), compute_uv=False) - 1.0
+
+    def outlines(self):
+        """Gibt die Randkonturen der Abwicklung als Liste von (K, 2)-Arrays zurück."""
+        return [self.uv[loop] for loop in Mesh(self.uv, self.faces).boundary_loops()]
+
+
+def save_outlines_txt(file_path, outlines):
+    """Speichert die Konturen im Kurvenformat (x, y je Zeile, Leerzeile zwischen den Kurven)."""
+    save_curves(file_path, outlines, closed=True)
+
+
+def save_outlines_dxf(file_path, outlines):
+    """Speichert die Konturen als geschlossene Polylinien in einer DXF-Datei (R12)."""
+    lines = ["0", "SECTION", "2", "ENTITIES"]
+    for outline in outlines:
+        lines += ["0", "POLYLINE", "8", "ZUSCHNITT", "66", "1", "70", "1"]
+        for x, y in outline:
+            lines += ["0", "VERTEX", "8", "ZUSCHNITT", "10", f"{x}", "20", f"{y}", "30", "0.0"]
+        lines += ["0", "SEQEND"]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    with open(file_path, 'w') as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def flatten_off(file_path, iterations=50):
+    """
+    Wickelt ein OFF-Netz ab und speichert Konturen als .txt und .dxf neben der Eingabedatei.
+
+    Rückgabe: das ArapFlattening-Objekt mit Abwicklung und Dehnungen.
+    """
+    from abwicklung_evolver import parse_off
+
+    vertices, faces = parse_off(file_path)
+    flattening = ArapFlattening(vertices, faces)
+    flattening.run(iterations=iterations)
+
+    base = os.path.splitext(file_path)[0]
+    outlines = flattening.outlines()
+    save_outlines_txt(base + "_zuschnitt.txt", outlines)
+    save_outlines_dxf(base + "_zuschnitt.dxf", outlines)
+    return flattening
+
+
+# Beispielaufruf: Abwicklung einer evolvierten Fläche
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else 'symm_aussen.off'
+    flattening = flatten_off(file_path)
+    strain = flattening.strain()
+    print(f"Abwicklung gespeichert. Dehnung: max {strain.max():.4%}, min {strain.min():.4%}")